@@ -0,0 +1,205 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Measures every checker on a synthetic corpus and compares the results with a baseline.
+
+For each corpus file the checks run --repeat times without memory tracing for the
+latency percentiles, and once more with tracemalloc for the peak memory. Issue counts
+are compared exactly. Latencies are compared by their minimum over the repetitions,
+which varies less between runs on a busy machine than the percentiles.
+
+Usage: python -m benchmarks.checkers [--sizes 1000,10000] [--update_baseline]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from typing import Any, Dict, List
+
+from qc_baselib import Configuration
+
+from benchmarks import corpus
+from qc_openmaterial3d import constants, metrics
+from qc_openmaterial3d.checks import reference_graph, uri_resolver
+from qc_openmaterial3d.main import check_input_file
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+# Latency differences below this many seconds are noise
+NOISE_FLOOR = 0.005
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def get_stage_name(name: str) -> str:
+    # "check_asam.net:xom:1.0.0:general.valid_schema" -> "valid_schema"
+    return name.rsplit(".", 1)[-1]
+
+
+def measure_file(file_path: str, repeat: int) -> Dict[str, Any]:
+    """Checks a file repeat times plus once with memory tracing.
+
+    Returns:
+        Size, throughput and per-stage latencies, peak memory and issue counts of the file.
+    """
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=file_path)
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+    wall_times: Dict[str, List[float]] = {}
+    totals = []
+    for trace_memory in [False] * repeat + [True]:
+        # Every run reads the linked files again, like a new process would
+        reference_graph.GRAPH.clear()
+        uri_resolver.RESOLVER.clear()
+
+        run_metrics = metrics.RunMetrics(file_path, trace_memory=trace_memory)
+        try:
+            check_input_file(config, run_metrics=run_metrics)
+        finally:
+            run_metrics.close()
+
+        if trace_memory:
+            traced_stages = run_metrics.stages
+            continue
+        totals.append(sum(stage.wall_time for stage in run_metrics.stages))
+        for stage in run_metrics.stages:
+            wall_times.setdefault(stage.name, []).append(stage.wall_time)
+
+    size = os.path.getsize(file_path)
+    return {
+        "size": size,
+        "throughput": size / percentile(totals, 0.5),
+        "stages": {
+            get_stage_name(stage.name): {
+                "min": min(wall_times[stage.name]),
+                "p50": percentile(wall_times[stage.name], 0.5),
+                "p95": percentile(wall_times[stage.name], 0.95),
+                "peak_memory": stage.peak_memory,
+                "issues": stage.issues,
+            }
+            for stage in traced_stages
+        },
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Lists the differences of results to baseline that count as regression.
+
+    A stage without baseline counts as regression too, so that new checkers are not
+    skipped silently until the baseline is updated.
+    """
+    regressions = []
+    for case, result in results.items():
+        for name, stage in result["stages"].items():
+            baseline_stage = baseline.get(case, {}).get("stages", {}).get(name)
+            if baseline_stage is None:
+                regressions.append(
+                    f"{case} {name}: no baseline, run with --update_baseline"
+                )
+                continue
+            if stage["issues"] != baseline_stage["issues"]:
+                regressions.append(
+                    f"{case} {name}: {stage['issues']} issue(s) "
+                    f"instead of {baseline_stage['issues']}"
+                )
+            if (
+                stage["min"] > baseline_stage["min"] * (1 + tolerance)
+                and stage["min"] - baseline_stage["min"] > NOISE_FLOOR
+            ):
+                regressions.append(
+                    f"{case} {name}: {stage['min'] * 1000:.1f} ms instead of "
+                    f"{baseline_stage['min'] * 1000:.1f} ms"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    columns = ["min ms", "p50 ms", "p95 ms", "base ms", "peak MiB"]
+    print(
+        f"{'case':24} {'stage':22} {' '.join(f'{c:>9}' for c in columns)} {'issues':>7}"
+    )
+    for case, result in results.items():
+        print(
+            f"{case:24} {result['size'] / result['throughput'] * 1000:.1f} ms in total, "
+            f"{result['throughput'] / 2**20:.1f} MiB/s, {result['size']} bytes"
+        )
+        for name, stage in result["stages"].items():
+            baseline_stage = baseline.get(case, {}).get("stages", {}).get(name)
+            baseline_min = (
+                f"{baseline_stage['min'] * 1000:9.1f}"
+                if baseline_stage
+                else f"{'-':>9}"
+            )
+            print(
+                f"{'':24} {name:22} {stage['min'] * 1000:9.1f} {stage['p50'] * 1000:9.1f} "
+                f"{stage['p95'] * 1000:9.1f} {baseline_min} {stage['peak_memory'] / 2**20:9.1f} "
+                f"{stage['issues']:7}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=corpus.parse_sizes, default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--corpus_dir",
+        help="Directory of the generated corpus, a temporary directory if not set.",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.0,
+        help="Allowed relative slowdown of the minimum latency, loose enough for shared machines.",
+    )
+    parser.add_argument("--update_baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cases = corpus.generate_corpus(args.corpus_dir or temp_dir, args.sizes)
+        results = {
+            case: measure_file(file_path, args.repeat)
+            for case, file_path in cases.items()
+        }
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Generates deterministic OpenMATERIAL 3D files for each schema of version 1.0.0.
+
+Lookup tables cover a full, sorted measurement grid and are written row by row, so
+that tables with millions of rows do not have to fit in memory. Error-dense variants
+break every ERROR_INTERVAL-th row, texture assignment or mapping entry.
+
+Usage: python -m benchmarks.corpus OUTPUT_DIR [--sizes 1000,10000]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import struct
+import uuid
+import zlib
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+OPEN_MATERIAL_VERSION = "1.0.0"
+
+# Every ERROR_INTERVAL-th entry of an error-dense file is invalid
+ERROR_INTERVAL = 10
+
+# Lambertian BRDF with an albedo of 0.5, which is reciprocal and conserves energy
+LAMBERTIAN_BRDF = 0.159155
+
+WAVELENGTHS = [9.05e-07, 1.55e-06, 3.9e-03, 1.2e-02]
+
+# Assignment textures shared by the assets, each of TEXTURE_SIZE x TEXTURE_SIZE pixels
+TEXTURE_COUNT = 10
+TEXTURE_SIZE = 64
+
+# Placeholder replaced by the rows of the lookup table when writing a file
+ROWS_PLACEHOLDER = "__ROWS__"
+
+
+@dataclass
+class LookupTableSpec:
+    """Layout of a lookup table file.
+
+    Attributes:
+        suffix: File name suffix selecting the schema, e.g. "_brdf.xompt".
+        table_path: Properties holding the table, the first one is the top-level object.
+        key_ranges: Inclusive range of each grid column after the wavelength.
+        values: Measured values appended to each row.
+        invalid_value: Measured value violating the schema, used by error-dense variants.
+        has_wavelengths: Whether the file lists its wavelengths next to the table.
+    """
+
+    suffix: str
+    table_path: Sequence[str]
+    key_ranges: Sequence[Sequence[float]]
+    values: Sequence[float]
+    invalid_value: float
+    has_wavelengths: bool
+
+
+LOOKUP_TABLES = {
+    "brdf": LookupTableSpec(
+        suffix="_brdf.xompt",
+        table_path=("brdf", "lookupTable"),
+        key_ranges=((0.0, 1.570796), (0.0, 1.570796), (0.0, 6.283185)),
+        values=(LAMBERTIAN_BRDF,),
+        invalid_value=-1.0,
+        has_wavelengths=True,
+    ),
+    "reflCoeff": LookupTableSpec(
+        suffix="_reflCoeff.xompt",
+        table_path=("reflectionCoefficient", "lookupTable"),
+        key_ranges=((0.0, 1.570796), (0.0, 1.570796), (0.0, 6.283185), (0.0, 3.141593)),
+        values=(0.5, 0.0),
+        invalid_value=2.0,
+        has_wavelengths=True,
+    ),
+    "emp": LookupTableSpec(
+        suffix="_emp.xompt",
+        table_path=("electromagneticProperties",),
+        key_ranges=((200.0, 400.0), (0.0, 100.0)),
+        values=(4.0, 0.1, 0.0, 1.0),
+        invalid_value=0.5,
+        has_wavelengths=False,
+    ),
+    "optical": LookupTableSpec(
+        suffix="_optical.xompt",
+        table_path=("opticalProperties",),
+        key_ranges=((200.0, 400.0),),
+        values=(1.5, 0.01),
+        invalid_value=-1.0,
+        has_wavelengths=False,
+    ),
+}
+
+
+def create_uuid(name: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"qc_openmaterial3d/benchmarks/{name}"))
+
+
+def create_metadata(name: str, **properties) -> dict:
+    """Metadata with the fields shared by all schemas, extended by properties."""
+    return {
+        "name": name,
+        "description": f"Synthetic benchmark file {name}.",
+        "uuid": create_uuid(name),
+        "openMaterial3dVersion": OPEN_MATERIAL_VERSION,
+        "copyrights": ["(C) 2024 Example Company"],
+        "license": "MPL-2.0",
+        "authors": ["john.doe@asam.net"],
+        "creationDate": "20240703T101728Z",
+        **properties,
+    }
+
+
+def write_document(
+    file_path: str, document: dict, rows: Optional[Iterable[List[float]]] = None
+) -> None:
+    """Writes a document, streaming rows into the place of ROWS_PLACEHOLDER."""
+    text = json.dumps(document, indent=4)
+    with open(file_path, "w", encoding="utf-8") as file:
+        if rows is None:
+            file.write(text)
+            return
+
+        prefix, suffix = text.split(json.dumps(ROWS_PLACEHOLDER))
+        line = prefix[prefix.rfind("\n") + 1 :]
+        indent = line[: len(line) - len(line.lstrip())]
+        file.write(prefix)
+        file.write("[")
+        for index, row in enumerate(rows):
+            file.write(",\n" if index else "\n")
+            file.write(f"{indent}    [{', '.join(repr(value) for value in row)}]")
+        file.write(f"\n{indent}]")
+        file.write(suffix)
+
+
+def get_grid_sizes(row_count: int, dimensions: int) -> List[int]:
+    """Splits a row count into axis sizes whose product is close to it."""
+    size = max(2, round(row_count ** (1 / dimensions)))
+    sizes = [size] * dimensions
+    sizes[-1] = max(2, math.ceil(row_count / size ** (dimensions - 1)))
+    return sizes
+
+
+def get_axis(value_range: Sequence[float], size: int) -> List[float]:
+    start, stop = value_range
+    return [
+        round(start + (stop - start) * index / (size - 1), 6) for index in range(size)
+    ]
+
+
+def iter_lookup_table_rows(
+    spec: LookupTableSpec, wavelengths: List[float], row_count: int, errors: bool
+) -> Iterable[List[float]]:
+    """Rows of a full grid sorted by their columns, about row_count in total."""
+    sizes = get_grid_sizes(max(1, row_count // len(wavelengths)), len(spec.key_ranges))
+    axes = [wavelengths] + [
+        get_axis(value_range, size) for value_range, size in zip(spec.key_ranges, sizes)
+    ]
+    for index, keys in enumerate(itertools.product(*axes)):
+        values = list(spec.values)
+        if errors and index % ERROR_INTERVAL == ERROR_INTERVAL - 1:
+            values[0] = spec.invalid_value
+        yield list(keys) + values
+
+
+def write_lookup_table(
+    output_dir: str, name: str, kind: str, row_count: int, errors: bool = False
+) -> str:
+    """Writes a lookup table file of kind "brdf", "reflCoeff", "emp" or "optical".
+
+    Returns:
+        Path of the written file.
+    """
+    spec = LOOKUP_TABLES[kind]
+    wavelengths = WAVELENGTHS[:2]
+
+    table: dict = {}
+    if spec.has_wavelengths:
+        table["wavelengths"] = wavelengths
+    table[spec.table_path[-1]] = ROWS_PLACEHOLDER
+
+    document = {
+        "metadata": create_metadata(
+            name, materialVersion="1.0.0", sources="Synthetic benchmark data"
+        ),
+    }
+    if len(spec.table_path) == 2:
+        document[spec.table_path[0]] = table
+    else:
+        document.update(table)
+
+    file_path = os.path.join(output_dir, name + spec.suffix)
+    rows = iter_lookup_table_rows(spec, wavelengths, row_count, errors)
+    write_document(file_path, document, rows)
+    return file_path
+
+
+def write_material(
+    output_dir: str, name: str, brdf_files: Sequence[str] = (), errors: bool = False
+) -> str:
+    """Writes a material file linking the given BRDF files."""
+    document = {
+        "metadata": create_metadata(name, materialVersion="1.0.0"),
+        "materialProperties": {
+            "surfaceRoughness": {
+                "surfaceHeightRms": 0.8,
+                "surfaceCorrelationLength": 1.0,
+                "sources": "estimate",
+            },
+            "densityData": {
+                # Above the maximum of 25000 in error-dense materials
+                "density": 30000.0 if errors else 2699.0,
+                "sources": "estimate",
+            },
+            "brdfUris": [os.path.basename(brdf_file) for brdf_file in brdf_files],
+        },
+    }
+    file_path = os.path.join(output_dir, name + ".xomp")
+    write_document(file_path, document)
+    return file_path
+
+
+def get_texture_colors(index: int) -> List[Tuple[int, int, int]]:
+    """Colors of the left and the right half of an assignment texture."""
+    return [(25 * index, 0, 0), (0, 25 * index, 255)]
+
+
+def write_texture(file_path: str, colors: Sequence[Tuple[int, int, int]]) -> None:
+    """Writes an 8-bit RGB PNG whose columns are split evenly between the colors."""
+    columns = [
+        colors[column * len(colors) // TEXTURE_SIZE] for column in range(TEXTURE_SIZE)
+    ]
+    row = b"\x00" + bytes(channel for color in columns for channel in color)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    header = struct.pack(">IIBBBBB", TEXTURE_SIZE, TEXTURE_SIZE, 8, 2, 0, 0, 0)
+    with open(file_path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", header))
+        file.write(chunk(b"IDAT", zlib.compress(row * TEXTURE_SIZE)))
+        file.write(chunk(b"IEND", b""))
+
+
+def write_textures(output_dir: str) -> None:
+    """Writes the TEXTURE_COUNT assignment textures to the textures directory."""
+    os.makedirs(os.path.join(output_dir, "textures"), exist_ok=True)
+    for index in range(TEXTURE_COUNT):
+        write_texture(
+            os.path.join(output_dir, "textures", f"texture_{index}.png"),
+            get_texture_colors(index),
+        )
+
+
+def write_mapping(
+    output_dir: str,
+    name: str,
+    material_files: Sequence[str],
+    row_count: int,
+    errors: bool = False,
+) -> str:
+    """Writes a material mapping with row_count rows cycling through material_files.
+
+    The colors of the assignment textures are mapped to the materials as well.
+    """
+    rows = []
+    for index in range(row_count):
+        material_uri = os.path.basename(material_files[index % len(material_files)])
+        if errors and index % ERROR_INTERVAL == ERROR_INTERVAL - 1:
+            material_uri = f"missing_material_{index}.xomp"
+        rows.append(
+            [
+                f"Material_{index}",
+                material_uri,
+                f"material {index % len(material_files)}",
+            ]
+        )
+    for index in range(TEXTURE_COUNT):
+        for red, green, blue in get_texture_colors(index):
+            material_uri = os.path.basename(material_files[index % len(material_files)])
+            rows.append([f"rgb:{red};{green};{blue}", material_uri, f"texture {index}"])
+
+    document = {
+        "metadata": create_metadata(name, mappingVersion="1.0.0"),
+        "materialMapping": rows,
+    }
+    file_path = os.path.join(output_dir, name + ".xomm")
+    write_document(file_path, document)
+    return file_path
+
+
+def write_asset(
+    output_dir: str,
+    name: str,
+    mapping_file: str,
+    texture_count: int,
+    errors: bool = False,
+) -> str:
+    """Writes an asset with texture_count texture assignments, linking mapping_file.
+
+    The assignments cycle through the TEXTURE_COUNT shared textures.
+    """
+    assignments = []
+    for index in range(texture_count):
+        # Error-dense assets use texture formats the schema does not allow
+        extension = (
+            "bmp" if errors and index % ERROR_INTERVAL == ERROR_INTERVAL - 1 else "png"
+        )
+        assignments.append(
+            [
+                f"Material_{index}",
+                f"textures/texture_{index % TEXTURE_COUNT}.{extension}",
+            ]
+        )
+
+    document = {
+        "metadata": create_metadata(
+            name,
+            assetVersion="1.0.0",
+            assetType="object",
+            objectClass="other",
+            animated=False,
+            pbrMaterialWorkflow="metallic",
+            triangleCount=12 * texture_count,
+            meshCount=texture_count,
+            textureResolutions=["1K"],
+            normalMapFormat="OpenGL",
+            boundingBox={"x": [-1, 1], "y": [-1, 1], "z": [0.0, 3]},
+        ),
+        "materialMappingUri": os.path.basename(mapping_file),
+        "materialTextureAssignment": assignments,
+    }
+    file_path = os.path.join(output_dir, name + ".xoma")
+    write_document(file_path, document)
+    return file_path
+
+
+def write_library(output_dir: str, size: int, errors: bool = False) -> str:
+    """Writes an asset with size texture assignments, linking a mapping with size rows.
+
+    The mapping rows cycle through 10 materials sharing a small BRDF table.
+
+    Returns:
+        Path of the asset.
+    """
+    suffix = "_errors" if errors else ""
+    write_textures(output_dir)
+    brdf_file = write_lookup_table(
+        output_dir, f"library_{size}{suffix}_camera", "brdf", 100
+    )
+    material_files = [
+        write_material(
+            output_dir, f"library_{size}{suffix}_material_{index}", [brdf_file]
+        )
+        for index in range(10)
+    ]
+    mapping_file = write_mapping(
+        output_dir, f"library_{size}{suffix}_mapping", material_files, size, errors
+    )
+    return write_asset(
+        output_dir, f"library_{size}{suffix}", mapping_file, size, errors
+    )
+
+
+def generate_corpus(output_dir: str, sizes: Sequence[int]) -> Dict[str, str]:
+    """Writes one file per schema, size and error density.
+
+    Args:
+        output_dir: Directory receiving the files.
+        sizes: Row counts of the lookup tables and mappings, and texture counts of the assets.
+
+    Returns:
+        Paths of the checked files by case name, e.g. "brdf_1000" or "brdf_1000_errors".
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    cases = {}
+    for size in sizes:
+        for errors in (False, True):
+            suffix = "_errors" if errors else ""
+            cases[f"asset_{size}{suffix}"] = write_library(output_dir, size, errors)
+            for kind in LOOKUP_TABLES:
+                name = f"{kind}_{size}{suffix}"
+                cases[name] = write_lookup_table(output_dir, name, kind, size, errors)
+
+    # Materials have no parts that grow
+    cases["material"] = write_material(output_dir, "material", [])
+    cases["material_errors"] = write_material(
+        output_dir, "material_errors", [], errors=True
+    )
+    return cases
+
+
+def parse_sizes(text: str) -> List[int]:
+    return [int(size) for size in text.split(",") if size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--sizes", type=parse_sizes, default=[1000, 10000])
+    args = parser.parse_args()
+
+    for case, file_path in generate_corpus(args.output_dir, args.sizes).items():
+        print(f"{case:30} {os.path.getsize(file_path):>14} bytes  {file_path}")
+
+
+if __name__ == "__main__":
+    main()
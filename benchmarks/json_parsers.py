@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Compares the installed JSON parser backends on the lookup tables of the synthetic corpus.
+
+Every backend parses the raw bytes of each file --repeat times, the minimum is reported
+with its throughput and its speedup over the json module. Results that differ from those
+of the json module are flagged.
+
+Usage: python -m benchmarks.json_parsers [--sizes 1000,10000,100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from typing import Dict, List
+
+from benchmarks import corpus
+from qc_openmaterial3d.checks import json_parser
+
+
+def measure(raw: bytes, backend: str, repeat: int) -> float:
+    """Minimum time in seconds of parsing raw with backend."""
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        json_parser.loads(raw, backend)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def compare_backends(cases: Dict[str, str], backends: List[str], repeat: int) -> None:
+    print(
+        f"{'case':24} {'MiB':>8} " + " ".join(f"{backend:>22}" for backend in backends)
+    )
+    for case, file_path in cases.items():
+        with open(file_path, "rb") as file:
+            raw = file.read()
+        expected = json.loads(raw)
+
+        cells = []
+        for backend in backends:
+            elapsed = measure(raw, backend, repeat)
+            speedup = (
+                measure(raw, "json", repeat) / elapsed if backend != "json" else 1.0
+            )
+            mark = "" if json_parser.loads(raw, backend) == expected else " DIFFERS"
+            cells.append(
+                f"{len(raw) / elapsed / 2**20:8.1f} MiB/s {speedup:5.2f}x{mark}"
+            )
+
+        print(
+            f"{case:24} {len(raw) / 2**20:8.2f} "
+            + " ".join(f"{cell:>22}" for cell in cells)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=corpus.parse_sizes, default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--corpus_dir",
+        help="Directory of the generated corpus, a temporary directory if not set.",
+    )
+    args = parser.parse_args()
+
+    backends = [
+        backend for backend in json_parser.BACKENDS if json_parser.is_available(backend)
+    ]
+    print(
+        f"Installed backends: {', '.join(backends)}, default {json_parser.get_backend()}"
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = args.corpus_dir or temp_dir
+        os.makedirs(output_dir, exist_ok=True)
+        cases = {
+            f"{kind}_{size}": corpus.write_lookup_table(
+                output_dir, f"{kind}_{size}", kind, size
+            )
+            for size in args.sizes
+            for kind in corpus.LOOKUP_TABLES
+        }
+        compare_backends(cases, backends, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Compares jsonschema and vectorized validation of a BRDF lookup table.
+
+Usage: python -m benchmarks.lookup_table_validation [--rows 1000000]
+"""
+
+import argparse
+import time
+
+from qc_openmaterial3d.checks import lookup_table
+from qc_openmaterial3d.schemas import validator_registry
+
+SCHEMA_KEY = "1.0.0:brdf.xompt"
+TABLE_PATH = ("brdf", "lookupTable")
+
+
+def create_rows(row_count: int) -> list:
+    rows = [
+        [9.05e-07, 0.001 * (i % 1000), 0.001 * (i // 1000 % 1000), 0.0, 0.1]
+        for i in range(row_count)
+    ]
+    # A few violations, so that both paths report issues
+    for index in range(0, row_count, max(1, row_count // 10)):
+        rows[index][4] = -1.0
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = create_rows(args.rows)
+    data = {"brdf": {"lookupTable": rows}}
+    validator = validator_registry.VALIDATORS.get_validator(SCHEMA_KEY)
+    row_validator = validator_registry.VALIDATORS.get_row_validator(
+        SCHEMA_KEY, TABLE_PATH
+    )
+    table_validator = type(validator)(validator.schema["properties"]["brdf"])
+
+    start_time = time.perf_counter()
+    reference_errors = list(table_validator.iter_errors(data["brdf"]))
+    reference_time = time.perf_counter() - start_time
+    # The benchmark document has no wavelengths, which is not a table error
+    reference_errors = [e for e in reference_errors if e.path]
+
+    start_time = time.perf_counter()
+    errors = list(lookup_table.iter_row_errors(rows, row_validator, TABLE_PATH))
+    vectorized_time = time.perf_counter() - start_time
+
+    assert [e.message for e in reference_errors] == [e.message for _, e in errors]
+
+    print(f"{args.rows} rows, {len(errors)} errors")
+    print(f"jsonschema: {reference_time:8.3f} s")
+    print(
+        f"vectorized: {vectorized_time:8.3f} s ({reference_time / vectorized_time:.0f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
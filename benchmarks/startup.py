@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Measures the cold-start import time of the entry points with python -X importtime.
+
+Usage: python -m benchmarks.startup [--repeat 5] [--top 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from typing import Dict, List, Tuple
+
+MODULES = [
+    # Parses the command line and forwards runs to a check server
+    "qc_openmaterial3d.cli",
+    # Runs the checks, imports qc_baselib and all checkers
+    "qc_openmaterial3d.main",
+]
+
+
+def measure(module: str) -> Dict[str, int]:
+    """Imports module in a fresh interpreter.
+
+    Returns:
+        Cumulative import time in microseconds of each imported module.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in process.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def get_slowest(times: Dict[str, int], top: int) -> List[Tuple[str, int]]:
+    """Slowest imports of top-level packages, including their submodules."""
+    return sorted(
+        ((name, time) for name, time in times.items() if "." not in name),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        runs = [measure(module) for _ in range(args.repeat)]
+        total = statistics.median(run[module] for run in runs)
+        print(f"{module}: {total / 1000:8.1f} ms (median of {args.repeat})")
+        for name, time in get_slowest(runs[-1], args.top):
+            print(f"    {name:40} {time / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
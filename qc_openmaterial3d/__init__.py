@@ -4,6 +4,17 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import importlib
+
+from typing import Any
+
 from . import constants as constants
-from . import checks as checks
-from . import basic_preconditions as basic_preconditions
+
+# Submodules importing jsonschema, numpy and qc_baselib are imported on first access
+_LAZY_SUBMODULES = {"checks", "basic_preconditions"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
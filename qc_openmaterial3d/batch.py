@@ -0,0 +1,466 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import asyncio
+import logging
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from qc_baselib import Configuration, Result
+
+from qc_openmaterial3d import main, result_cache
+from qc_openmaterial3d.checks import models, uri_resolver, utils, uuid_index
+from qc_openmaterial3d.schemas import schema_files, validator_registry
+
+# Files waiting between two stages of the pipeline mode
+PIPELINE_QUEUE_SIZE = 4
+
+
+@dataclass
+class BatchSummary:
+    file_count: int = 0
+    files_with_issues: int = 0
+    issue_count: int = 0
+    wall_time: float = 0.0
+    check_time: float = 0.0
+    slowest_file: str = ""
+    slowest_file_time: float = 0.0
+    uri_cache_hits: int = 0
+    uri_cache_misses: int = 0
+    validator_hits: int = 0
+    validator_misses: int = 0
+    result_cache_hits: int = 0
+    result_cache_misses: int = 0
+    report_files: List[str] = field(default_factory=list)
+
+    def add_file(
+        self, input_file: str, report_file: str, issue_count: int, check_time: float
+    ) -> None:
+        self.file_count += 1
+        self.issue_count += issue_count
+        if issue_count > 0:
+            self.files_with_issues += 1
+        self.check_time += check_time
+        if check_time > self.slowest_file_time:
+            self.slowest_file = input_file
+            self.slowest_file_time = check_time
+        self.report_files.append(report_file)
+
+
+@dataclass
+class CheckedFile:
+    result: Optional[Result]
+    check_time: float
+    issue_count: int = 0
+    uri_cache_hits: int = 0
+    uri_cache_misses: int = 0
+    validator_hits: int = 0
+    validator_misses: int = 0
+    result_cache_hits: int = 0
+    result_cache_misses: int = 0
+
+
+def discover_input_files(input_dir: str) -> List[str]:
+    """Recursively finds all OpenMATERIAL 3D files in a directory.
+
+    Args:
+        input_dir: Directory to search.
+
+    Returns:
+        Sorted paths of all .xoma, .xomm, .xomp and .xompt files.
+    """
+    input_files = []
+    for dir_path, dir_names, file_names in os.walk(input_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if (
+                os.path.splitext(file_name)[1].lower()
+                in schema_files.SUPPORTED_EXTENSIONS
+            ):
+                input_files.append(os.path.join(dir_path, file_name))
+    return input_files
+
+
+def read_file_list(file_list_path: str) -> List[str]:
+    """Reads input file paths from a text file with one path per line.
+
+    Empty lines and lines starting with '#' are ignored. Relative paths are
+    resolved against the directory of the list file.
+
+    Args:
+        file_list_path: Path to the file list.
+
+    Returns:
+        The listed file paths in their original order.
+    """
+    base_dir = os.path.dirname(os.path.abspath(file_list_path))
+
+    input_files = []
+    with open(file_list_path, "r") as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                input_files.append(os.path.join(base_dir, line))
+    return input_files
+
+
+def get_report_file_paths(input_files: List[str], output_dir: str) -> List[str]:
+    """Maps input files to report files, mirroring their relative directory layout.
+
+    Args:
+        input_files: Paths of the checked files.
+        output_dir: Directory receiving the reports.
+
+    Returns:
+        One '<file name>.xqar' path inside output_dir per input file.
+    """
+    if not input_files:
+        return []
+
+    absolute_paths = [os.path.abspath(input_file) for input_file in input_files]
+    common_dir = os.path.commonpath([os.path.dirname(path) for path in absolute_paths])
+
+    return [
+        os.path.join(output_dir, os.path.relpath(path, common_dir) + ".xqar")
+        for path in absolute_paths
+    ]
+
+
+def index_input_files(config: Configuration, input_files: List[str]) -> None:
+    """Adds the input files to the open uuid index before any of them is checked.
+
+    Every file claiming a uuid then finds all others, independent of the order of the
+    files and of how they are split between workers. Files that are unchanged since
+    they were indexed are not read again.
+
+    Args:
+        config: Configuration of the run.
+        input_files: Paths of the files to check.
+    """
+    if not uuid_index.INDEX.is_open:
+        return
+
+    streaming_threshold = utils.get_streaming_threshold(config)
+    for input_file in input_files:
+        if uuid_index.INDEX.get_entry(input_file) is None:
+            uuid_index.INDEX.add(
+                utils.load_json_document(input_file, streaming_threshold)
+            )
+
+
+# Configuration and result cache of a pool worker process, set once by _init_worker
+_worker_config: Optional[Configuration] = None
+_worker_cache: Optional[result_cache.ResultCache] = None
+
+
+def _init_worker(
+    config: Configuration,
+    cache: Optional[result_cache.ResultCache],
+    index_path: Optional[str],
+) -> None:
+    global _worker_config, _worker_cache
+    _worker_config = config
+    _worker_cache = cache
+
+    # Workers add their files to the uuid index of the batch through a connection of their own
+    if index_path is not None:
+        uuid_index.INDEX.open(index_path)
+
+    # Compile the validators once per worker instead of once per file
+    validator_registry.VALIDATORS.warm_up()
+
+
+def _check_file_in_worker(
+    input_file: str, report_file: Optional[str] = None
+) -> CheckedFile:
+    return check_file(
+        _worker_config, input_file, _worker_cache, report_file=report_file
+    )
+
+
+def check_file(
+    config: Configuration,
+    input_file: str,
+    cache: Optional[result_cache.ResultCache] = None,
+    document: Optional[models.JsonDocument] = None,
+    report_file: Optional[str] = None,
+) -> CheckedFile:
+    """Checks a single file of a batch.
+
+    Args:
+        config: Configuration whose InputFile is replaced by input_file.
+        input_file: Path of the file to check.
+        cache: Result cache to replay unchanged checker results from, or None to run all checkers.
+        document: Already loaded document of input_file, or None to load it.
+        report_file: Path to stream the report to while checking, see main.stream_input_file,
+            or None to return the filled result.
+
+    Returns:
+        The filled result, or None if the report was streamed, the issue count, the time spent
+        checking in seconds and the URI, validator and result cache lookups of the file.
+    """
+    resolver = uri_resolver.RESOLVER
+    validators = validator_registry.VALIDATORS
+    hits, misses = resolver.hits, resolver.misses
+    validator_hits, validator_misses = validators.hits, validators.misses
+    cache_hits, cache_misses = (
+        (cache.hits, cache.misses) if cache is not None else (0, 0)
+    )
+    start_time = time.perf_counter()
+
+    config.set_config_param(name="InputFile", value=input_file)
+    if report_file is None:
+        result = main.check_input_file(config, cache, document)
+        issue_count = result.get_issue_count()
+    else:
+        result = None
+        issue_count = main.stream_input_file(config, report_file, cache, document)
+
+    checked = CheckedFile(
+        result=result,
+        check_time=time.perf_counter() - start_time,
+        issue_count=issue_count,
+        uri_cache_hits=resolver.hits - hits,
+        uri_cache_misses=resolver.misses - misses,
+        validator_hits=validators.hits - validator_hits,
+        validator_misses=validators.misses - validator_misses,
+    )
+    if cache is not None:
+        checked.result_cache_hits = cache.hits - cache_hits
+        checked.result_cache_misses = cache.misses - cache_misses
+    return checked
+
+
+def iter_results(
+    config: Configuration,
+    input_files: List[str],
+    jobs: int = 1,
+    cache: Optional[result_cache.ResultCache] = None,
+    report_files: Optional[List[str]] = None,
+) -> Iterator[CheckedFile]:
+    """Checks files sequentially or in a process pool and yields results in input order.
+
+    Args:
+        config: Configuration shared by all files.
+        input_files: Paths of the files to check.
+        jobs: Number of worker processes. 1 checks all files in the current process.
+        cache: Result cache shared by all files, or None to run all checkers.
+        report_files: Report path of each input file to stream the reports to while
+            checking, or None to yield the filled results.
+
+    Yields:
+        The checked input files, in the order of input_files.
+    """
+    if jobs <= 1 or len(input_files) <= 1:
+        validator_registry.VALIDATORS.warm_up()
+        for input_file, report_file in zip(
+            input_files, report_files or [None] * len(input_files)
+        ):
+            yield check_file(config, input_file, cache, report_file=report_file)
+        return
+
+    # Hand out several files per task to amortize inter-process communication,
+    # while keeping enough tasks per worker to balance uneven file sizes.
+    chunk_size = max(1, min(64, len(input_files) // (jobs * 8)))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(config, cache, uuid_index.INDEX.path),
+    ) as executor:
+        # map yields in submission order, so reports do not depend on worker scheduling
+        if report_files is None:
+            yield from executor.map(
+                _check_file_in_worker, input_files, chunksize=chunk_size
+            )
+        else:
+            # Workers write the reports, only the counts are sent back
+            yield from executor.map(
+                _check_file_in_worker, input_files, report_files, chunksize=chunk_size
+            )
+
+
+def write_report(
+    summary: BatchSummary, input_file: str, report_file: str, checked: CheckedFile
+) -> None:
+    """Writes the report of a checked file, unless it was streamed, and adds the file to the summary."""
+    if checked.result is not None:
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        checked.result.write_to_file(report_file, generate_summary=True)
+
+    summary.add_file(input_file, report_file, checked.issue_count, checked.check_time)
+    summary.uri_cache_hits += checked.uri_cache_hits
+    summary.uri_cache_misses += checked.uri_cache_misses
+    summary.validator_hits += checked.validator_hits
+    summary.validator_misses += checked.validator_misses
+    summary.result_cache_hits += checked.result_cache_hits
+    summary.result_cache_misses += checked.result_cache_misses
+
+
+async def run_pipeline(
+    config: Configuration,
+    input_files: List[str],
+    report_files: List[str],
+    summary: BatchSummary,
+    cache: Optional[result_cache.ResultCache] = None,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+    stream_results: bool = False,
+) -> None:
+    """Checks files in read, parse, check and report stages that run concurrently.
+
+    Each stage is a single task working in a thread, so reading the next files and
+    writing the previous reports overlap with checking the current file. Bounded
+    queues between the stages block a stage that runs ahead, which caps the number of
+    files held in memory. Every stage handles the files in input order, so the reports
+    are the same as in a sequential run.
+
+    Args:
+        config: Configuration whose InputFile is replaced by each input file in turn.
+        input_files: Paths of the files to check.
+        report_files: Report path of each input file.
+        summary: Receives each checked file.
+        cache: Result cache to replay unchanged checker results from, or None to run all checkers.
+        queue_size: Maximum number of files waiting between two stages.
+        stream_results: Whether the check stage streams the reports, see check_file.
+    """
+    streaming_threshold = utils.get_streaming_threshold(config)
+    parse_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    check_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    report_queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    async def read() -> None:
+        for input_file in input_files:
+            document = await asyncio.to_thread(
+                utils.read_json_document, input_file, streaming_threshold
+            )
+            await parse_queue.put(document)
+        await parse_queue.put(None)
+
+    async def parse() -> None:
+        while (document := await parse_queue.get()) is not None:
+            await check_queue.put(
+                await asyncio.to_thread(utils.parse_json_document, document)
+            )
+        await check_queue.put(None)
+
+    async def check() -> None:
+        stream_files = iter(report_files)
+        while (document := await check_queue.get()) is not None:
+            report_file = next(stream_files) if stream_results else None
+            checked = await asyncio.to_thread(
+                check_file, config, document.file_path, cache, document, report_file
+            )
+            await report_queue.put(checked)
+        await report_queue.put(None)
+
+    async def report() -> None:
+        for input_file, report_file in zip(input_files, report_files):
+            checked = await report_queue.get()
+            await asyncio.to_thread(
+                write_report, summary, input_file, report_file, checked
+            )
+
+    tasks = [asyncio.create_task(stage()) for stage in (read, parse, check, report)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # Stop the other stages if one failed
+        for task in tasks:
+            task.cancel()
+
+
+def run_batch(
+    config: Configuration,
+    input_files: List[str],
+    output_dir: str,
+    jobs: int = 1,
+    cache: Optional[result_cache.ResultCache] = None,
+    pipeline: bool = False,
+    stream_results: bool = False,
+) -> BatchSummary:
+    """Checks many files in one run and writes one report per file.
+
+    The configuration, loaded modules and compiled schema validators are shared
+    by all files of a process, so interpreter startup and schema loading are paid
+    once per process instead of once per file.
+
+    Args:
+        config: Configuration whose InputFile is replaced by each input file in turn.
+        input_files: Paths of the files to check.
+        output_dir: Directory receiving the reports.
+        jobs: Number of worker processes.
+        cache: Result cache to replay unchanged checker results from, or None to run all checkers.
+        pipeline: Whether to overlap reading and report writing with checking in a single
+            process, see run_pipeline. Ignored if jobs is larger than 1.
+        stream_results: Whether to write each report while its file is checked instead of
+            collecting the issues in a Result first, see main.stream_input_file.
+
+    Returns:
+        Summary of the run with cumulative timings.
+    """
+    summary = BatchSummary()
+    start_time = time.perf_counter()
+
+    report_files = get_report_file_paths(input_files, output_dir)
+    index_input_files(config, input_files)
+
+    if pipeline and jobs <= 1:
+        validator_registry.VALIDATORS.warm_up()
+        asyncio.run(
+            run_pipeline(
+                config,
+                input_files,
+                report_files,
+                summary,
+                cache,
+                stream_results=stream_results,
+            )
+        )
+    else:
+        results = iter_results(
+            config, input_files, jobs, cache, report_files if stream_results else None
+        )
+        for input_file, report_file, checked in zip(input_files, report_files, results):
+            write_report(summary, input_file, report_file, checked)
+
+    summary.wall_time = time.perf_counter() - start_time
+
+    log_summary(summary)
+
+    return summary
+
+
+def log_summary(summary: BatchSummary) -> None:
+    logging.info(
+        f"Checked {summary.file_count} file(s) in {summary.wall_time:.3f} s "
+        f"({summary.check_time:.3f} s cumulative checking time, "
+        f"{summary.check_time / max(summary.file_count, 1) * 1000:.1f} ms per file). "
+        f"{summary.issue_count} issue(s) found in {summary.files_with_issues} file(s)."
+    )
+    if summary.slowest_file:
+        logging.info(
+            f"Slowest file: {summary.slowest_file} ({summary.slowest_file_time:.3f} s)"
+        )
+    # Counted per file, so that the lookups of pool workers are included
+    logging.info(
+        f"Schema validators: {summary.validator_hits} hit(s), "
+        f"{summary.validator_misses} miss(es)"
+    )
+    lookups = summary.uri_cache_hits + summary.uri_cache_misses
+    logging.info(
+        f"URI existence cache: {summary.uri_cache_hits} hit(s), {summary.uri_cache_misses} miss(es)"
+        + (f", {summary.uri_cache_hits / lookups:.1%} hit rate" if lookups else "")
+    )
+    lookups = summary.result_cache_hits + summary.result_cache_misses
+    if lookups:
+        logging.info(
+            f"Result cache: {summary.result_cache_hits} hit(s), {summary.result_cache_misses} miss(es), "
+            f"{summary.result_cache_hits / lookups:.1%} hit rate"
+        )
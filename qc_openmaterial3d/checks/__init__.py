@@ -4,6 +4,29 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from . import xom_general_checker as xom_general_checker
-from . import models as models
-from . import utils as utils
+import importlib
+
+from typing import Any
+
+# Submodules are imported on first access
+_LAZY_SUBMODULES = {
+    "xom_general_checker",
+    "models",
+    "utils",
+    "json_index",
+    "json_parser",
+    "json_stream",
+    "lookup_table",
+    "table_sidecar",
+    "texture_colors",
+    "uri_resolver",
+    "uuid_index",
+    "reference_graph",
+    "registry",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
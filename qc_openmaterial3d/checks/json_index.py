@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import bisect
+import json
+import re
+
+from array import array
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(r"[^ \t\n\r,:\]\}]+")
+_FLAT_CONTAINER = re.compile(r'\[[^\[\]{}"]*\]|\{[^\[\]{}"]*\}')
+
+# Object members map key -> (key offset, value offset), array elements are value offsets
+ObjectChildren = Dict[str, Tuple[int, int]]
+ArrayChildren = array
+JsonPath = Sequence[Union[str, int]]
+
+
+class JsonLocationIndex:
+    """Maps JSON paths of a valid JSON document to their line and column.
+
+    Containers are tokenized lazily the first time a path descends into them and
+    each container is scanned at most once, so looking up N paths costs one pass
+    over the visited containers instead of N passes over the whole file. Flat
+    containers such as lookup table rows are only indexed when a path enters them.
+    The index is filled by the lookups, so they must not run at the same time.
+
+    Args:
+        raw: Raw bytes of a valid JSON document.
+    """
+
+    def __init__(self, raw: bytes) -> None:
+        self._text = raw.decode(json.detect_encoding(raw))
+        self._root = _WHITESPACE.match(self._text).end()
+        self._containers: Dict[
+            int, Tuple[Union[ObjectChildren, ArrayChildren], int]
+        ] = {}
+        # Known (offset, line) pairs, so consecutive lookups only count the newlines in between
+        self._checkpoint_offsets = [0]
+        self._checkpoint_lines = [1]
+
+    def get_offset(self, path: JsonPath) -> Optional[int]:
+        """Returns the character offset of the element addressed by path.
+
+        Object members are located at their key, array elements at their value.
+
+        Args:
+            path: Property names and array indices, e.g. ['brdf', 'lookupTable', 3, 4].
+
+        Returns:
+            The offset, or None if the path does not exist in the document.
+        """
+        location = self._root
+        value_offset = self._root
+
+        for step in path:
+            children = self._get_children(value_offset)
+            if isinstance(step, str) and isinstance(children, dict):
+                if step not in children:
+                    return None
+                location, value_offset = children[step]
+            elif isinstance(step, int) and isinstance(children, array):
+                if not 0 <= step < len(children):
+                    return None
+                location = value_offset = children[step]
+            else:
+                return None
+
+        return location
+
+    def get_location(self, path: JsonPath) -> Optional[Tuple[int, int]]:
+        """Returns the 1-based (line, column) of the element addressed by path.
+
+        Args:
+            path: Property names and array indices, e.g. ['brdf', 'lookupTable', 3, 4].
+
+        Returns:
+            The line and column, or None if the path does not exist in the document.
+        """
+        offset = self.get_offset(path)
+        if offset is None:
+            return None
+
+        return self.offset_to_location(offset)
+
+    def offset_to_location(self, offset: int) -> Tuple[int, int]:
+        text = self._text
+
+        checkpoint = bisect.bisect_right(self._checkpoint_offsets, offset) - 1
+        checkpoint_offset = self._checkpoint_offsets[checkpoint]
+        line = self._checkpoint_lines[checkpoint] + text.count(
+            "\n", checkpoint_offset, offset
+        )
+        if checkpoint_offset != offset:
+            self._checkpoint_offsets.insert(checkpoint + 1, offset)
+            self._checkpoint_lines.insert(checkpoint + 1, line)
+
+        return line, offset - text.rfind("\n", 0, offset)
+
+    def _get_children(self, offset: int) -> Union[ObjectChildren, ArrayChildren, None]:
+        if self._text[offset : offset + 1] not in ("{", "["):
+            return None
+        return self._scan_container(offset)[0]
+
+    def _scan_container(
+        self, offset: int
+    ) -> Tuple[Union[ObjectChildren, ArrayChildren], int]:
+        container = self._containers.get(offset)
+        if container is None:
+            if self._text[offset] == "{":
+                container = self._scan_object(offset)
+            else:
+                container = self._scan_array(offset)
+            self._containers[offset] = container
+        return container
+
+    def _scan_object(self, offset: int) -> Tuple[ObjectChildren, int]:
+        text = self._text
+        children = {}
+
+        position = _WHITESPACE.match(text, offset + 1).end()
+        while text[position] != "}":
+            key_match = _STRING.match(text, position)
+            key = json.loads(key_match.group())
+            position = _WHITESPACE.match(text, key_match.end()).end() + 1  # ':'
+            value_offset = _WHITESPACE.match(text, position).end()
+            # Repeated keys resolve to the last occurrence, as in json.loads
+            children[key] = (key_match.start(), value_offset)
+            position = self._skip_value(value_offset)
+            position = _WHITESPACE.match(text, position).end()
+            if text[position] == ",":
+                position = _WHITESPACE.match(text, position + 1).end()
+
+        return children, position + 1
+
+    def _scan_array(self, offset: int) -> Tuple[ArrayChildren, int]:
+        text = self._text
+        children = array("q")
+        skip_value = self._skip_value
+
+        position = _WHITESPACE.match(text, offset + 1).end()
+        while text[position] != "]":
+            children.append(position)
+            position = _WHITESPACE.match(text, skip_value(position)).end()
+            if text[position] == ",":
+                position = _WHITESPACE.match(text, position + 1).end()
+
+        return children, position + 1
+
+    def _skip_value(self, offset: int) -> int:
+        """Returns the offset right after the value starting at offset."""
+        text = self._text
+        opening = text[offset]
+
+        if opening == '"':
+            return _STRING.match(text, offset).end()
+        if opening not in "[{":
+            return _SCALAR.match(text, offset).end()
+
+        # Rows of lookup tables are flat containers and skipped with a single match
+        flat_match = _FLAT_CONTAINER.match(text, offset)
+        if flat_match is not None:
+            return flat_match.end()
+
+        # Nested containers are indexed while skipping them, so they are never scanned twice
+        return self._scan_container(offset)[1]
@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import functools
+import importlib
+import json
+import logging
+import os
+
+from typing import Any, Callable, Optional
+
+# Environment variable selecting a backend, the fastest installed one if not set
+BACKEND_ENVIRONMENT_VARIABLE = "QC_OPENMATERIAL3D_JSON_PARSER"
+
+# Backends by preference, each one a module with a loads(bytes) function
+BACKENDS = ["orjson", "simdjson", "json"]
+
+# Errors of the optional backends for input they do not parse
+_BACKEND_ERRORS = (ValueError, RuntimeError)
+
+# Maps digits to "d" and all other bytes but the point to a space, so that an integer
+# literal of 19 or more digits, which may not fit into 64 bits, becomes a space followed
+# by _LONG_DIGITS. The optional backends do not return such integers as int.
+_DIGIT_TABLE = bytes(
+    ord("d") if byte in b"0123456789" else byte if byte == ord(".") else ord(" ")
+    for byte in range(256)
+)
+_LONG_DIGITS = b"d" * 19
+
+
+@functools.lru_cache(maxsize=None)
+def get_loads(backend: str) -> Callable[[bytes], Any]:
+    """Returns the loads function of a backend.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend is not installed.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown JSON parser {backend}, expected one of {', '.join(BACKENDS)}"
+        )
+    return importlib.import_module(backend).loads
+
+
+def is_available(backend: str) -> bool:
+    try:
+        get_loads(backend)
+        return True
+    except ImportError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend() -> str:
+    """Returns the backend used by loads, chosen once per process.
+
+    The backend named by BACKEND_ENVIRONMENT_VARIABLE is used if it is installed,
+    otherwise the first installed backend of BACKENDS.
+    """
+    requested = os.environ.get(BACKEND_ENVIRONMENT_VARIABLE)
+    if requested:
+        try:
+            get_loads(requested)
+            return requested
+        except (ImportError, ValueError) as e:
+            logging.warning(
+                f"Cannot use JSON parser {requested}, choosing another one: {e}"
+            )
+
+    return next(backend for backend in BACKENDS if is_available(backend))
+
+
+def _has_long_integers(raw: bytes) -> bool:
+    """Tells whether raw may hold an integer beyond 64 bits, also true for some strings."""
+    digits = raw.translate(_DIGIT_TABLE)
+    return _LONG_DIGITS in digits and (
+        digits.startswith(_LONG_DIGITS) or b" " + _LONG_DIGITS in digits
+    )
+
+
+def loads(raw: bytes, backend: Optional[str] = None) -> Any:
+    """Parses a JSON document with a fast backend, falling back to the json module.
+
+    Input the backend rejects is parsed again with json.loads, so documents that the
+    json module accepts, e.g. with a byte order mark or NaN, still parse, and errors are
+    the json.JSONDecodeError with line and column of the json module. Documents with
+    integers of 19 or more digits, which may not fit into 64 bits, are parsed with
+    json.loads right away, so such integers stay exact.
+
+    Args:
+        raw: Raw bytes of the document.
+        backend: Name of one of BACKENDS, get_backend() if None.
+
+    Returns:
+        The parsed tree.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+        UnicodeDecodeError: If the document is not valid UTF-8, UTF-16 or UTF-32.
+    """
+    backend = get_backend() if backend is None else backend
+    if backend != "json" and not _has_long_integers(raw):
+        try:
+            return get_loads(backend)(raw)
+        except _BACKEND_ERRORS:
+            pass
+    return json.loads(raw)
@@ -0,0 +1,349 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import re
+
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Decoding errors this close to the end of the buffer may be caused by a value that
+# continues in the next chunk, e.g. a literal or an escape sequence cut in half
+TRUNCATION_MARGIN = 16
+
+TablePath = Tuple[str, ...]
+Location = Tuple[int, int]
+# Events of the streaming parser: (table path, row index, row, location of the row)
+RowEvent = Tuple[TablePath, int, Any, Location]
+
+
+@dataclass
+class StreamedTable:
+    """A lookup table that was left out of the parsed tree of a streamed document.
+
+    Attributes:
+        path: JSON path of the table array.
+        row_count: Number of rows of the table.
+        skeleton_offset: Offset of the emptied table in the skeleton text.
+        removed_lines: Number of line breaks removed from the skeleton text with the rows.
+    """
+
+    path: TablePath
+    row_count: int
+    skeleton_offset: int
+    removed_lines: int
+
+
+@dataclass
+class StreamedDocument:
+    """Result of a streaming parse.
+
+    Attributes:
+        data: Parsed tree, where each streamed table is replaced by an empty list.
+        skeleton: The file text with the rows of all streamed tables removed.
+        tables: Streamed tables by JSON path.
+    """
+
+    data: Any
+    skeleton: str
+    tables: Dict[TablePath, StreamedTable]
+
+
+class _TextStream:
+    """Forward-only reader over a text file with a sliding buffer.
+
+    Tracks the line and column of the read position and optionally records the
+    consumed text, so that selected parts of the file can be left out of it.
+    """
+
+    def __init__(self, file, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._eof = False
+        self.buffer = ""
+        self.pos = 0
+        # Absolute offset of buffer[0], line number and absolute start offset of the line at _counted
+        self._buffer_offset = 0
+        self._counted = 0
+        self._line = 1
+        self._line_start = 0
+        # Recorded text, and buffer index where the current recording span starts
+        self._recorded: List[str] = []
+        self._record_from: Optional[int] = 0
+
+    @property
+    def offset(self) -> int:
+        return self._buffer_offset + self.pos
+
+    @property
+    def recorded_length(self) -> int:
+        return sum(map(len, self._recorded)) + (
+            self.pos - self._record_from if self._record_from is not None else 0
+        )
+
+    def location(self, pos: Optional[int] = None) -> Location:
+        """Returns the 1-based (line, column) of a buffer index, the read position by default."""
+        pos = self.pos if pos is None else pos
+        self._count_lines(pos)
+        return self._line, self._buffer_offset + pos - self._line_start + 1
+
+    def line(self) -> int:
+        return self.location()[0]
+
+    def get_recorded(self) -> str:
+        if self._record_from is not None:
+            self._recorded.append(self.buffer[self._record_from : self.pos])
+            self._record_from = self.pos
+        return "".join(self._recorded)
+
+    def pause_recording(self) -> None:
+        self._recorded.append(self.buffer[self._record_from : self.pos])
+        self._record_from = None
+
+    def resume_recording(self) -> None:
+        self._record_from = self.pos
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, or '' at the end of the file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                return ""
+
+    def expect(self, char: str, message: str) -> None:
+        if self.peek() != char:
+            raise self.error(message)
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """Decodes the JSON value at the read position, reading ahead as far as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Other errors are in the text already read, the rest of the file is not needed
+                may_be_truncated = (
+                    e.pos >= len(self.buffer) - TRUNCATION_MARGIN
+                    or e.msg == "Unterminated string starting at"
+                )
+                if may_be_truncated and self._read():
+                    continue
+                raise self.error(e.msg, e.pos)
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._read():
+                continue
+
+            self.pos = end
+            return value
+
+    def error(self, message: str, pos: Optional[int] = None) -> json.JSONDecodeError:
+        """Builds a JSONDecodeError whose position refers to the whole file."""
+        pos = self.pos if pos is None else pos
+        line, column = self.location(pos)
+        offset = self._buffer_offset + pos
+
+        error = json.JSONDecodeError(message, "", 0)
+        error.pos, error.lineno, error.colno = offset, line, column
+        error.args = (f"{message}: line {line} column {column} (char {offset})",)
+        return error
+
+    def _count_lines(self, end: int) -> None:
+        if end <= self._counted:
+            return
+        newlines = self.buffer.count("\n", self._counted, end)
+        if newlines:
+            self._line += newlines
+            self._line_start = (
+                self._buffer_offset + self.buffer.rfind("\n", self._counted, end) + 1
+            )
+        self._counted = end
+
+    def _read(self) -> bool:
+        """Appends the next chunk to the buffer and drops the consumed text. Returns False at EOF."""
+        if self._eof:
+            return False
+
+        # Grow the chunk size while a single value does not fit, so that
+        # re-decoding a long value costs at most twice its size.
+        chunk_size = max(self._chunk_size, len(self.buffer) - self.pos)
+        chunk = self._file.read(chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._count_lines(self.pos)
+        if self._record_from is not None:
+            self._recorded.append(self.buffer[self._record_from : self.pos])
+            self._record_from = 0
+
+        self.buffer = self.buffer[self.pos :] + chunk
+        self._buffer_offset += self.pos
+        self._counted -= self.pos
+        self.pos = 0
+        return True
+
+
+def _parse_value(
+    stream: _TextStream,
+    path: TablePath,
+    table_paths: Iterable[TablePath],
+    tables: Dict[TablePath, StreamedTable],
+) -> Generator[RowEvent, None, Any]:
+    char = stream.peek()
+
+    if char == "[" and path in table_paths:
+        return (yield from _parse_table(stream, path, tables))
+
+    if char == "{" and any(
+        len(table_path) > len(path) and table_path[: len(path)] == path
+        for table_path in table_paths
+    ):
+        return (yield from _parse_object(stream, path, table_paths, tables))
+
+    return stream.decode_value()
+
+
+def _parse_object(
+    stream: _TextStream,
+    path: TablePath,
+    table_paths: Iterable[TablePath],
+    tables: Dict[TablePath, StreamedTable],
+) -> Generator[RowEvent, None, dict]:
+    stream.pos += 1  # '{'
+    data = {}
+
+    if stream.peek() == "}":
+        stream.pos += 1
+        return data
+
+    while True:
+        if stream.peek() != '"':
+            raise stream.error("Expecting property name enclosed in double quotes")
+        key = stream.decode_value()
+        stream.expect(":", "Expecting ':' delimiter")
+
+        data[key] = yield from _parse_value(stream, path + (key,), table_paths, tables)
+
+        char = stream.peek()
+        stream.pos += 1
+        if char == "}":
+            return data
+        if char != ",":
+            stream.pos -= 1
+            raise stream.error("Expecting ',' delimiter")
+
+
+def _parse_table(
+    stream: _TextStream, path: TablePath, tables: Dict[TablePath, StreamedTable]
+) -> Generator[RowEvent, None, list]:
+    stream.pos += 1  # '['
+    stream.pause_recording()
+    skeleton_offset = stream.recorded_length
+    start_line = stream.line()
+
+    row_count = 0
+    if stream.peek() == "]":
+        stream.pos += 1
+    else:
+        while True:
+            stream.peek()
+            location = stream.location()
+            row = stream.decode_value()
+            yield path, row_count, row, location
+            row_count += 1
+
+            char = stream.peek()
+            if char == "]":
+                stream.pos += 1
+                break
+            if char != ",":
+                raise stream.error("Expecting ',' delimiter")
+            stream.pos += 1
+
+    # Keep the closing bracket, so that the skeleton text holds an empty list
+    stream.pos -= 1
+    removed_lines = stream.line() - start_line
+    stream.resume_recording()
+    stream.pos += 1
+
+    tables[path] = StreamedTable(path, row_count, skeleton_offset, removed_lines)
+    return []
+
+
+def _parse_document(
+    stream: _TextStream, table_paths: Iterable[TablePath]
+) -> Generator[RowEvent, None, StreamedDocument]:
+    tables: Dict[TablePath, StreamedTable] = {}
+
+    if stream.peek() == "":
+        raise stream.error("Expecting value")
+
+    data = yield from _parse_value(stream, (), list(table_paths), tables)
+
+    if stream.peek() != "":
+        raise stream.error("Extra data")
+
+    return StreamedDocument(data=data, skeleton=stream.get_recorded(), tables=tables)
+
+
+def parse_streamed(
+    file_path: str,
+    table_paths: Iterable[TablePath],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> StreamedDocument:
+    """Parses a JSON file in constant memory with respect to the size of its lookup tables.
+
+    The rows of the arrays at table_paths are decoded one at a time to check the
+    syntax of the file, but they are not kept in the returned tree.
+
+    Args:
+        file_path: Path to the JSON file.
+        table_paths: JSON paths of the arrays to stream, e.g. [('brdf', 'lookupTable')].
+        chunk_size: Number of characters read at once.
+
+    Returns:
+        The parsed tree without the streamed rows.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+        parser = _parse_document(_TextStream(file, chunk_size), table_paths)
+        while True:
+            try:
+                next(parser)
+            except StopIteration as stop:
+                return stop.value
+
+
+def iter_table_rows(
+    file_path: str, table_path: TablePath, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[int, Any, Location]]:
+    """Iterates over the rows of a lookup table without loading the whole file.
+
+    Args:
+        file_path: Path to a valid JSON file.
+        table_path: JSON path of the table array.
+        chunk_size: Number of characters read at once.
+
+    Yields:
+        Row index, decoded row and 1-based (line, column) of the row.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+        for path, index, row, location in _parse_document(
+            _TextStream(file, chunk_size), [table_path]
+        ):
+            yield index, row, location
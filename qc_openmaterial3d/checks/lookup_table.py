@@ -0,0 +1,572 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import itertools
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from jsonschema import Draft7Validator, ValidationError
+
+from qc_openmaterial3d.checks import json_stream, models
+
+TablePath = Tuple[str, ...]
+Location = Tuple[int, int]
+
+# Rows of a streamed lookup table converted to an array at once
+STREAMED_ROWS_PER_CHUNK = 65536
+
+# JSON types of decoded table cells that a "number" or "null" column accepts
+_CELL_TYPES = {"number": {int, float}, "null": {type(None)}}
+_COLUMN_KEYWORDS = {
+    "type",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "description",
+}
+_ROW_KEYWORDS = {"type", "items", "minItems", "maxItems", "description"}
+
+
+@dataclass
+class TableConstraints:
+    """Numeric constraints of a lookup table row schema, one entry per column.
+
+    Attributes:
+        column_count: Number of cells of each row.
+        cell_types: Python types of decoded cells accepted by every column.
+        nullable: Whether each column accepts null.
+        minimum, maximum: Inclusive bounds, -inf and inf if unbounded.
+        exclusive_minimum, exclusive_maximum: Exclusive bounds, -inf and inf if unbounded.
+    """
+
+    column_count: int
+    cell_types: frozenset
+    nullable: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    exclusive_minimum: np.ndarray
+    exclusive_maximum: np.ndarray
+
+    @classmethod
+    def from_row_schema(cls, schema: Dict[str, Any]) -> Optional["TableConstraints"]:
+        """Extracts the constraints of a row schema.
+
+        Args:
+            schema: The "items" schema of a lookup table.
+
+        Returns:
+            The constraints, or None if the schema uses keywords the vectorized checks do not cover.
+        """
+        columns = schema.get("items")
+        if (
+            not set(schema) <= _ROW_KEYWORDS
+            or schema.get("type") != "array"
+            or not isinstance(columns, list)
+            or schema.get("minItems") != len(columns)
+            or schema.get("maxItems") != len(columns)
+        ):
+            return None
+
+        column_types = []
+        for column in columns:
+            types = column.get("type")
+            types = [types] if isinstance(types, str) else types
+            if (
+                not set(column) <= _COLUMN_KEYWORDS
+                or not types
+                or not set(types) <= set(_CELL_TYPES)
+            ):
+                return None
+            column_types.append(set(types))
+
+        cell_types = frozenset().union(
+            *(_CELL_TYPES[t] for types in column_types for t in types)
+        )
+
+        def bounds(keyword: str, default: float) -> np.ndarray:
+            return np.array(
+                [column.get(keyword, default) for column in columns], dtype=np.float64
+            )
+
+        return cls(
+            column_count=len(columns),
+            cell_types=cell_types,
+            nullable=np.array(["null" in types for types in column_types]),
+            minimum=bounds("minimum", -np.inf),
+            maximum=bounds("maximum", np.inf),
+            exclusive_minimum=bounds("exclusiveMinimum", -np.inf),
+            exclusive_maximum=bounds("exclusiveMaximum", np.inf),
+        )
+
+
+def find_invalid_rows(rows: Sequence[Any], constraints: TableConstraints) -> np.ndarray:
+    """Finds the rows of a lookup table that may violate its row schema.
+
+    Types and arity are checked with C-level iteration over the rows, values are
+    checked as one float64 array. Every row that violates the schema is returned,
+    while a returned row may still be valid, e.g. an integer too large for float64.
+
+    Args:
+        rows: Decoded table rows.
+        constraints: Constraints of the row schema.
+
+    Returns:
+        Sorted indices of the suspicious rows.
+    """
+    column_count = constraints.column_count
+    suspicious = np.zeros(len(rows), dtype=bool)
+
+    cells_ok = set(map(type, rows)) == {list} and set(map(len, rows)) == {column_count}
+    if cells_ok:
+        cell_types = set(map(type, itertools.chain.from_iterable(rows)))
+        cells_ok = cell_types <= constraints.cell_types
+
+    if not cells_ok:
+        # Rare case of malformed rows, find them one by one and leave them out
+        for index, row in enumerate(rows):
+            if (
+                type(row) is not list
+                or len(row) != column_count
+                or not set(map(type, row)) <= constraints.cell_types
+            ):
+                suspicious[index] = True
+        rows = [row for row, bad in zip(rows, suspicious) if not bad]
+        cell_types = constraints.cell_types
+
+    if not rows:
+        return np.flatnonzero(suspicious)
+
+    try:
+        if type(None) in cell_types:
+            # None converts to NaN
+            values = np.array(rows, dtype=np.float64)
+        else:
+            values = np.fromiter(
+                itertools.chain.from_iterable(rows),
+                dtype=np.float64,
+                count=len(rows) * column_count,
+            ).reshape(len(rows), column_count)
+    except OverflowError:
+        return np.arange(len(suspicious))
+
+    violations = find_violating_values(values, constraints)
+    suspicious[np.flatnonzero(~suspicious)[violations]] = True
+    return np.flatnonzero(suspicious)
+
+
+def find_violating_values(
+    values: np.ndarray, constraints: TableConstraints
+) -> np.ndarray:
+    """Checks the bounds of each column of a table, with NaN standing for null.
+
+    Args:
+        values: Table cells, shape (rows, columns).
+        constraints: Constraints of the row schema.
+
+    Returns:
+        Whether each row has a cell out of bounds or a null cell in a non-nullable column.
+    """
+    nulls = np.isnan(values)
+    # Comparisons with NaN are False, so null cells only fail in non-nullable columns
+    return (
+        (values < constraints.minimum)
+        | (values > constraints.maximum)
+        | (values <= constraints.exclusive_minimum)
+        | (values >= constraints.exclusive_maximum)
+        | (nulls & ~constraints.nullable)
+    ).any(axis=1)
+
+
+def iter_row_errors(
+    rows: Sequence[Any],
+    row_validator: Draft7Validator,
+    table_path: TablePath,
+    first_index: int = 0,
+) -> Iterator[Tuple[int, ValidationError]]:
+    """Validates the rows of a lookup table, vectorized where the row schema allows it.
+
+    Suspicious rows are validated again with row_validator, so the errors, their
+    paths and schema paths are the same as those of a jsonschema validation of the
+    whole document.
+
+    Args:
+        rows: Decoded table rows.
+        row_validator: Validator of the "items" schema of the table.
+        table_path: JSON path of the table, prefixed to the error paths.
+        first_index: Index of rows[0] in the table.
+
+    Yields:
+        Position of the row in rows and the schema violation, with a path and a schema path relative
+        to the document root.
+    """
+    constraints = TableConstraints.from_row_schema(row_validator.schema)
+    if constraints is None:
+        indices = range(len(rows))
+    else:
+        indices = find_invalid_rows(rows, constraints).tolist()
+
+    for position in indices:
+        index = first_index + position
+        for error in _iter_table_row_errors(
+            rows[position], row_validator, table_path, index
+        ):
+            yield position, error
+
+
+def iter_array_row_errors(
+    table: np.ndarray,
+    row_validator: Draft7Validator,
+    table_path: TablePath,
+    chunk_size: int = STREAMED_ROWS_PER_CHUNK,
+) -> Iterator[Tuple[int, ValidationError]]:
+    """Validates the rows of a lookup table stored as float64 array, e.g. a memory-mapped sidecar.
+
+    The bounds are checked chunk by chunk on the array itself. Rows out of bounds are
+    converted back to lists, with NaN as null, and validated with row_validator. Their
+    numbers are reported as floats, also if the JSON source wrote them as integers.
+
+    Args:
+        table: Table cells, shape (rows, columns).
+        row_validator: Validator of the "items" schema of the table.
+        table_path: JSON path of the table, prefixed to the error paths.
+        chunk_size: Number of rows checked at once.
+
+    Yields:
+        Row index and the schema violation, with a path and a schema path relative to the document root.
+    """
+    constraints = TableConstraints.from_row_schema(row_validator.schema)
+    vectorized = (
+        constraints is not None
+        and constraints.column_count == table.shape[1]
+        and float in constraints.cell_types
+    )
+
+    for start in range(0, len(table), chunk_size):
+        chunk = table[start : start + chunk_size]
+        if vectorized:
+            positions = np.flatnonzero(
+                find_violating_values(chunk, constraints)
+            ).tolist()
+        else:
+            positions = range(len(chunk))
+
+        for position in positions:
+            row = [
+                None if np.isnan(value) else value for value in chunk[position].tolist()
+            ]
+            for error in _iter_table_row_errors(
+                row, row_validator, table_path, start + position
+            ):
+                yield start + position, error
+
+
+def _iter_table_row_errors(
+    row: Any, row_validator: Draft7Validator, table_path: TablePath, index: int
+) -> Iterator[ValidationError]:
+    schema_prefix = tuple(
+        itertools.chain.from_iterable(("properties", key) for key in table_path)
+    )
+    for error in row_validator.iter_errors(row):
+        error.path.extendleft(reversed(table_path + (index,)))
+        error.schema_path.extendleft(reversed(schema_prefix + ("items",)))
+        yield error
+
+
+def split_tables(
+    data: Any, table_paths: List[TablePath]
+) -> Tuple[Any, Dict[TablePath, list]]:
+    """Separates the lookup tables of a parsed document from the rest of its tree.
+
+    Only the objects on the way to a table are copied, the document itself is not modified.
+
+    Args:
+        data: Parsed document.
+        table_paths: JSON paths of the tables.
+
+    Returns:
+        The tree with every table replaced by an empty list, and the tables by path.
+    """
+    tables = {}
+    for table_path in table_paths:
+        parents = [data]
+        for key in table_path:
+            if not isinstance(parents[-1], dict) or key not in parents[-1]:
+                break
+            parents.append(parents[-1][key])
+        else:
+            if not isinstance(parents[-1], list):
+                continue
+
+            tables[table_path] = parents[-1]
+            replacement = []
+            for parent, key in zip(reversed(parents[:-1]), reversed(table_path)):
+                replacement = {**parent, key: replacement}
+            data = replacement
+
+    return data, tables
+
+
+def get_table_rows(data: Any, table_path: TablePath) -> Optional[list]:
+    """Returns the lookup table at table_path of a parsed document, or None if there is none."""
+    for key in table_path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data if isinstance(data, list) else None
+
+
+def iter_row_chunks(
+    rows: Iterator[Tuple[int, Any, Location]], chunk_size: int = STREAMED_ROWS_PER_CHUNK
+) -> Iterator[Tuple[Sequence[Any], Sequence[Location]]]:
+    """Groups the rows of json_stream.iter_table_rows into chunks of rows and their locations."""
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        _, chunk_rows, locations = zip(*chunk)
+        yield chunk_rows, locations
+
+
+def load_columns(
+    document: models.JsonDocument, table_path: TablePath, column_count: int
+) -> Optional[np.ndarray]:
+    """Loads the leading columns of a schema-valid lookup table into a float64 array.
+
+    Null cells become NaN. Streamed tables are read from the file in chunks, tables
+    of a sidecar are returned without copying.
+
+    Args:
+        document: Parsed or streamed document.
+        table_path: JSON path of the table.
+        column_count: Number of leading columns to load.
+
+    Returns:
+        An array of shape (rows, column_count), or None if the document has no such table.
+    """
+    table = document.table_arrays.get(table_path)
+    if table is not None:
+        # A view of the memory-mapped sidecar, pages are read when the checks touch them
+        return table[:, :column_count] if len(table) else np.empty((0, column_count))
+
+    if table_path in document.streamed_tables:
+        rows = json_stream.iter_table_rows(document.file_path, table_path)
+        chunks = [
+            np.array(chunk_rows, dtype=np.float64)[:, :column_count]
+            for chunk_rows, _ in iter_row_chunks(rows)
+        ]
+        if not chunks:
+            return np.empty((0, column_count))
+        return np.concatenate(chunks)
+
+    rows = get_table_rows(document.data, table_path)
+    if rows is None:
+        return None
+    if not rows:
+        return np.empty((0, column_count))
+    return np.array(rows, dtype=np.float64)[:, :column_count]
+
+
+def find_row_locations(
+    document: models.JsonDocument, table_path: TablePath, indices: Iterable[int]
+) -> Dict[int, Location]:
+    """Returns the 1-based (line, column) of selected rows of a lookup table.
+
+    Args:
+        document: Parsed or streamed document.
+        table_path: JSON path of the table.
+        indices: Row indices to locate.
+
+    Returns:
+        Locations by row index, rows that cannot be located are left out.
+    """
+    indices = set(indices)
+
+    if table_path not in document.streamed_tables:
+        locations = {}
+        for index in indices:
+            location = document.find_location(table_path + (index,))
+            if location is not None:
+                locations[index] = location
+        return locations
+
+    locations = {}
+    last_index = max(indices, default=-1)
+    for index, _, location in json_stream.iter_table_rows(
+        document.file_path, table_path
+    ):
+        if index > last_index:
+            break
+        if index in indices:
+            locations[index] = location
+    return locations
+
+
+class RowLocator:
+    """Locates rows of a streamed lookup table, reading the JSON source once across calls.
+
+    Each call may only ask for rows after those of the previous calls, e.g. for the
+    rows of errors that are reported in row order chunk by chunk.
+
+    Args:
+        document: Streamed document.
+        table_path: JSON path of the table.
+    """
+
+    def __init__(self, document: models.JsonDocument, table_path: TablePath) -> None:
+        self._rows = json_stream.iter_table_rows(document.file_path, table_path)
+        self._index = -1
+        self._location: Optional[Location] = None
+
+    def locate(self, indices: Iterable[int]) -> Dict[int, Location]:
+        """Returns the 1-based (line, column) of selected rows, rows that cannot be located are left out."""
+        locations = {}
+        for index in sorted(set(indices)):
+            while self._index < index:
+                row = next(self._rows, None)
+                if row is None:
+                    return locations
+                self._index, _, self._location = row
+            if self._index == index:
+                locations[index] = self._location
+        return locations
+
+
+def find_unsorted_rows(keys: np.ndarray) -> np.ndarray:
+    """Finds the rows that are lexicographically smaller than their predecessor.
+
+    Args:
+        keys: Table columns, shape (rows, columns). NaN compares equal to any value.
+
+    Returns:
+        Sorted indices of the rows breaking the sort order, in O(rows * columns).
+    """
+    previous, current = keys[:-1], keys[1:]
+
+    # -1 where previous < current, 1 where previous > current, decided by the first differing column
+    order = np.zeros(len(current), dtype=np.int8)
+    for column in reversed(range(keys.shape[1])):
+        order = np.where(
+            previous[:, column] < current[:, column],
+            -1,
+            np.where(previous[:, column] > current[:, column], 1, order),
+        )
+
+    return np.flatnonzero(order > 0) + 1
+
+
+def find_duplicate_rows(keys: np.ndarray) -> np.ndarray:
+    """Finds the rows that repeat the keys of an earlier row, in O(rows log rows).
+
+    Args:
+        keys: Table columns, shape (rows, columns).
+
+    Returns:
+        Sorted indices of the repeating rows.
+    """
+    if len(keys) < 2:
+        return np.empty(0, dtype=np.intp)
+
+    # lexsort is stable, so each duplicate follows its first occurrence
+    permutation = np.lexsort(keys.T[::-1])
+    repeated = np.ones(len(keys) - 1, dtype=bool)
+    for column in keys.T:
+        ordered = column[permutation]
+        repeated &= ordered[1:] == ordered[:-1]
+
+    return np.sort(permutation[1:][repeated])
+
+
+def find_missing_grid_points(
+    keys: np.ndarray, limit: int
+) -> Tuple[int, int, List[Tuple[float, ...]]]:
+    """Finds the points of the Cartesian product of the distinct column values that are not in the table.
+
+    Args:
+        keys: Table columns, shape (rows, columns).
+        limit: Maximum number of missing points to return.
+
+    Returns:
+        The number of missing points, the size of the full grid and the first missing points in
+        lexicographic order. The points are only listed if the grid size fits into an index.
+    """
+    axes, codes = [], []
+    for column in keys.T:
+        values, inverse = np.unique(column, return_inverse=True)
+        axes.append(values)
+        codes.append(inverse.reshape(-1))
+
+    grid_size = 1
+    for values in axes:
+        grid_size *= len(values)
+
+    if grid_size > np.iinfo(np.intp).max:
+        return grid_size - (len(keys) - len(find_duplicate_rows(keys))), grid_size, []
+
+    # Grid index of each row in the lexicographic order of the distinct column values
+    shape = tuple(len(values) for values in axes)
+    present = np.unique(np.ravel_multi_index(codes, shape))
+    missing_count = grid_size - len(present)
+    if missing_count == 0:
+        return 0, grid_size, []
+
+    # Missing points are the gaps between consecutive present grid indices
+    bounds = np.concatenate(([-1], present, [grid_size]))
+    gap_starts = np.flatnonzero(np.diff(bounds) > 1)
+
+    missing = []
+    for gap in gap_starts:
+        for grid_index in range(bounds[gap] + 1, bounds[gap + 1]):
+            if len(missing) == limit:
+                break
+            point = np.unravel_index(grid_index, shape)
+            missing.append(tuple(float(axes[c][i]) for c, i in enumerate(point)))
+        if len(missing) == limit:
+            break
+
+    return missing_count, grid_size, missing
+
+
+def to_grid(
+    table: np.ndarray, key_column_count: int
+) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray]:
+    """Arranges a lookup table that covers its full grid as a dense array.
+
+    Args:
+        table: Table columns, shape (rows, columns), with the grid columns first.
+        key_column_count: Number of grid columns.
+
+    Returns:
+        The sorted distinct values of each grid column, the remaining columns as an array of
+        shape (len(axis_0), ..., len(axis_k-1), columns - k), and the row index of each grid point.
+        Grid points without a row hold NaN and -1.
+    """
+    axes, codes = [], []
+    for column in table[:, :key_column_count].T:
+        values, inverse = np.unique(column, return_inverse=True)
+        axes.append(values)
+        codes.append(inverse.reshape(-1))
+
+    shape = tuple(len(values) for values in axes)
+    values = np.full(shape + (table.shape[1] - key_column_count,), np.nan)
+    values[tuple(codes)] = table[:, key_column_count:]
+    rows = np.full(shape, -1, dtype=np.intp)
+    rows[tuple(codes)] = np.arange(len(table))
+
+    return axes, values, rows
+
+
+def trapezoid_weights(x: np.ndarray) -> np.ndarray:
+    """Returns w such that w @ f(x) is the trapezoidal integral of f over [x[0], x[-1]]."""
+    weights = np.zeros(len(x))
+    if len(x) > 1:
+        steps = np.diff(x) / 2
+        weights[:-1] += steps
+        weights[1:] += steps
+    return weights
@@ -4,12 +4,104 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from dataclasses import dataclass
-from typing import Optional
+import threading
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
 from enum import Enum
 
 from qc_baselib import Configuration, Result
 
+from qc_openmaterial3d.checks.json_index import JsonLocationIndex, JsonPath
+from qc_openmaterial3d.checks.json_stream import StreamedTable, TablePath
+
+
+@dataclass
+class JsonDocument:
+    """Input file content, read and parsed once per run and shared by all checkers.
+
+    Large files with lookup tables are parsed in streaming mode: their tables are
+    replaced by empty lists in data and their rows are read again on demand with
+    json_stream.iter_table_rows. Files with a consistent table sidecar are loaded the
+    same way, their tables are additionally available as memory-mapped arrays.
+
+    Attributes:
+        file_path: Path of the input file.
+        size: Size of the file in bytes, or None if the file does not exist.
+        raw: Raw bytes of the file, or None if the file does not exist or was streamed.
+        data: Parsed JSON tree, or None if the file does not exist or is not valid JSON.
+        parse_error: Error raised while parsing, or None if parsing succeeded.
+        skeleton: Text of a streamed file without the rows of its lookup tables.
+        streamed_tables: Lookup tables left out of data, by JSON path.
+        table_arrays: Memory-mapped float64 arrays of the streamed tables read from a table
+            sidecar, by JSON path. Null cells are NaN.
+        content_hash: SHA-256 of the file, if it was computed while loading.
+        location_lookups: Number of find_location calls, reported by the run metrics.
+    """
+
+    file_path: str
+    size: Optional[int] = None
+    raw: Optional[bytes] = None
+    data: Any = None
+    parse_error: Optional[ValueError] = None
+    skeleton: Optional[str] = field(default=None, repr=False)
+    streamed_tables: Dict[TablePath, StreamedTable] = field(default_factory=dict)
+    # numpy arrays, not annotated as such so that checkers without tables do not import numpy
+    table_arrays: Dict[TablePath, Any] = field(default_factory=dict, repr=False)
+    content_hash: Optional[str] = None
+    location_index: Optional[JsonLocationIndex] = field(default=None, repr=False)
+    location_lookups: int = field(default=0, repr=False)
+    # Checkers running at the same time share the lazily built location index
+    _location_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    @property
+    def exists(self) -> bool:
+        return self.size is not None
+
+    @property
+    def is_valid_json(self) -> bool:
+        return self.exists and self.parse_error is None
+
+    @property
+    def is_streamed(self) -> bool:
+        return self.skeleton is not None
+
+    def find_location(self, path: JsonPath) -> Optional[Tuple[int, int]]:
+        """Returns the 1-based (line, column) of a property, building the location index on first use.
+
+        Rows of streamed tables are not indexed, their locations are reported by
+        json_stream.iter_table_rows. Lookups of concurrent checkers are serialized,
+        the index is not thread-safe.
+
+        Args:
+            path: Property names and array indices, e.g. ['materialProperties', 'brdfUris', 1].
+
+        Returns:
+            The line and column, or None if the document is not valid JSON or the path does not exist.
+        """
+        with self._location_lock:
+            self.location_lookups += 1
+            if not self.is_valid_json:
+                return None
+
+            if self.location_index is None:
+                raw = (
+                    self.raw if not self.is_streamed else self.skeleton.encode("utf-8")
+                )
+                self.location_index = JsonLocationIndex(raw)
+
+            offset = self.location_index.get_offset(path)
+            if offset is None:
+                return None
+
+            line, column = self.location_index.offset_to_location(offset)
+        for table in self.streamed_tables.values():
+            if table.skeleton_offset < offset:
+                line += table.removed_lines
+        return line, column
+
 
 @dataclass
 class CheckerData:
@@ -17,6 +109,9 @@ class CheckerData:
     config: Configuration
     result: Result
     schema_version: Optional[str]
+    document: Optional[JsonDocument] = None
+    # SHA-256 of the input file, computed on first use by the result cache
+    content_hash: Optional[str] = None
 
 
 class AttributeType(Enum):
@@ -0,0 +1,300 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import threading
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from qc_openmaterial3d.schemas import schema_files
+from qc_openmaterial3d.checks import models, uri_resolver, utils
+from qc_openmaterial3d.checks.json_index import JsonPath
+from qc_openmaterial3d.checks.xom_general_checker import (
+    general_uris_exist,
+    general_valid_schema,
+)
+
+# Column of the material file in the rows of a material mapping
+MATERIAL_MAPPING_KEY = "materialMapping"
+MATERIAL_MAPPING_URI_COLUMN = 1
+
+
+@dataclass
+class Reference:
+    """Link from one file to another.
+
+    Attributes:
+        json_path: Path of the property holding the URI.
+        key: Name of the property holding the URI.
+        uri: URI as written in the file.
+        target: Normalized absolute path of the linked file.
+        location: 1-based (line, column) of the URI in the referencing file, if known.
+    """
+
+    json_path: JsonPath
+    key: str
+    uri: str
+    target: str
+    location: Optional[Tuple[int, int]]
+
+    @property
+    def is_followed(self) -> bool:
+        """Whether the linked file is an OpenMATERIAL 3D file whose links are followed as well."""
+        return (
+            os.path.splitext(self.target)[1].lower()
+            in schema_files.SUPPORTED_EXTENSIONS
+        )
+
+
+@dataclass
+class ReferenceNode:
+    """Links and validity of one OpenMATERIAL 3D file, kept independent of the entry it was reached from.
+
+    Attributes:
+        path: Normalized absolute path of the file.
+        stamp: Modification time and size of the file when it was read.
+        problem: Why the file is not a valid OpenMATERIAL 3D file, or None if it is valid.
+        references: Links of the file in document order.
+    """
+
+    path: str
+    stamp: Tuple[int, int]
+    problem: Optional[str] = None
+    references: List[Reference] = field(default_factory=list)
+
+
+@dataclass
+class ReferenceClosure:
+    """Result of a walk over all files reachable from an entry file.
+
+    Attributes:
+        entry: Normalized absolute path of the entry file.
+        nodes: Reached files except the entry, in depth-first order.
+        parents: File and link through which each reached file was first reached.
+        dangling: Links to files that do not exist, with the path of the referencing file.
+        cycles: Closed chains of links, each listed from its first file back to it.
+    """
+
+    entry: str
+    nodes: List[ReferenceNode] = field(default_factory=list)
+    parents: Dict[str, Tuple[str, Reference]] = field(default_factory=dict)
+    dangling: List[Tuple[str, Reference]] = field(default_factory=list)
+    cycles: List[List[str]] = field(default_factory=list)
+
+
+def collect_references(document: models.JsonDocument) -> List[Reference]:
+    """Collects the links of a parsed document.
+
+    Links are all properties ending in 'Uri' or 'Uris' and the material files of
+    material mappings.
+
+    Args:
+        document: Parsed document.
+
+    Returns:
+        The links in document order.
+    """
+    uris = []
+    if isinstance(document.data, dict):
+        general_uris_exist.collect_uris_recursively(document.data, list(), uris)
+
+        mapping = document.data.get(MATERIAL_MAPPING_KEY)
+        for index, row in enumerate(mapping if isinstance(mapping, list) else []):
+            if (
+                isinstance(row, list)
+                and len(row) > MATERIAL_MAPPING_URI_COLUMN
+                and isinstance(row[MATERIAL_MAPPING_URI_COLUMN], str)
+            ):
+                uris.append(
+                    (
+                        [MATERIAL_MAPPING_KEY, index, MATERIAL_MAPPING_URI_COLUMN],
+                        row[MATERIAL_MAPPING_URI_COLUMN],
+                        MATERIAL_MAPPING_KEY,
+                    )
+                )
+
+    base_dir = os.path.dirname(os.path.abspath(document.file_path))
+    return [
+        Reference(
+            json_path=json_path,
+            key=key,
+            uri=uri,
+            target=os.path.normpath(os.path.join(base_dir, uri)),
+            location=document.find_location(json_path),
+        )
+        for json_path, uri, key in uris
+    ]
+
+
+def find_problem(document: models.JsonDocument) -> Optional[str]:
+    """Checks a linked document the way the basic checkers check an input file.
+
+    Args:
+        document: Parsed document.
+
+    Returns:
+        Why the document is not a valid OpenMATERIAL 3D file, or None if it is valid.
+    """
+    if document.parse_error is not None:
+        return f"is not a valid JSON document: {document.parse_error}"
+
+    try:
+        version = utils.get_open_material_version(document.data)
+    except (KeyError, TypeError):
+        return "does not define metadata.openMaterial3dVersion"
+
+    try:
+        schema_key = schema_files.get_schema_key(version, document.file_path)
+        errors = general_valid_schema.collect_schema_errors(document, schema_key)
+    except ValueError as e:
+        return f"cannot be validated: {e}"
+
+    if errors:
+        error = errors[0]
+        return (
+            f"violates its schema with {len(errors)} error(s), "
+            f"the first is in {error.json_path[2:]}: {error.message}"
+        )
+    return None
+
+
+def _get_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ReferenceGraph:
+    """Process-wide cache of the links between OpenMATERIAL 3D files.
+
+    Each linked file is parsed and validated once and kept as a small node with its
+    links and validity, so that material mappings, materials and lookup tables shared
+    by many assets are read once per library. A node is read again when the
+    modification time or size of its file changes.
+    """
+
+    def __init__(self) -> None:
+        # Normalized absolute path -> node
+        self._nodes: Dict[str, ReferenceNode] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_node(
+        self, path: str, streaming_threshold: Optional[int] = None
+    ) -> Optional[ReferenceNode]:
+        """Returns the node of a file, reading it on first use or after it changed.
+
+        Args:
+            path: Absolute path of the file.
+            streaming_threshold: Size in bytes above which files with lookup tables are streamed.
+
+        Returns:
+            The node, or None if the file does not exist.
+        """
+        path = os.path.normpath(path)
+        stamp = _get_stamp(path)
+        if stamp is None:
+            return None
+
+        with self._lock:
+            node = self._nodes.get(path)
+            if node is not None and node.stamp == stamp:
+                self.hits += 1
+                return node
+            self.misses += 1
+
+        document = utils.load_json_document(path, streaming_threshold)
+        node = ReferenceNode(path=path, stamp=stamp, problem=find_problem(document))
+        if document.is_valid_json:
+            node.references = collect_references(document)
+
+        with self._lock:
+            self._nodes[path] = node
+        return node
+
+    def walk(
+        self, entry: models.JsonDocument, streaming_threshold: Optional[int] = None
+    ) -> ReferenceClosure:
+        """Follows all links from an entry document, visiting each reachable file once.
+
+        The entry itself is taken from the already parsed document and not validated,
+        the basic checkers report its problems.
+
+        Args:
+            entry: Parsed entry document.
+            streaming_threshold: Size in bytes above which linked files with lookup tables are streamed.
+
+        Returns:
+            The files reached, the dangling links and the reference cycles.
+        """
+        entry_path = os.path.normpath(os.path.abspath(entry.file_path))
+        closure = ReferenceClosure(entry=entry_path)
+        references = {entry_path: collect_references(entry)}
+
+        # Iterative depth-first search, files on the current path are "open"
+        open_paths = [entry_path]
+        positions = [0]
+        done = set()
+        while open_paths:
+            path = open_paths[-1]
+            node_references = references[path]
+            if positions[-1] == 0:
+                self._find_dangling(path, node_references, closure)
+
+            if positions[-1] == len(node_references):
+                done.add(path)
+                open_paths.pop()
+                positions.pop()
+                continue
+
+            reference = node_references[positions[-1]]
+            positions[-1] += 1
+            target = reference.target
+            if not reference.is_followed or target in done:
+                continue
+
+            if target in open_paths:
+                closure.cycles.append(open_paths[open_paths.index(target) :] + [target])
+                continue
+
+            node = self.get_node(target, streaming_threshold)
+            if node is None:
+                continue
+
+            closure.nodes.append(node)
+            closure.parents[target] = (path, reference)
+            references[target] = node.references
+            open_paths.append(target)
+            positions.append(0)
+
+        return closure
+
+    def clear(self) -> None:
+        """Drops all cached nodes and resets the counters."""
+        with self._lock:
+            self._nodes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def _find_dangling(
+        path: str, references: List[Reference], closure: ReferenceClosure
+    ) -> None:
+        existing = uri_resolver.RESOLVER.exists_many(
+            reference.target for reference in references
+        )
+        closure.dangling.extend(
+            (path, reference)
+            for reference in references
+            if not existing[reference.target]
+        )
+
+
+GRAPH = ReferenceGraph()
@@ -0,0 +1,245 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import ast
+import functools
+import importlib
+import importlib.util
+import pkgutil
+import types
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from qc_openmaterial3d.checks import xom_general_checker
+
+# Attributes of a checker module that are read from its source without importing it
+METADATA_NAMES = (
+    "CHECKER_ID",
+    "CHECKER_DESCRIPTION",
+    "CHECKER_PRECONDITIONS",
+    "RULE_UID",
+    "REQUIRED_DEFINITION_SETTING",
+)
+
+
+class LazyChecker:
+    """A checker module that is imported on first use of an attribute besides its metadata.
+
+    Scheduling the checkers only needs their metadata, so that a run does not pay for
+    the imports of checkers it skips, e.g. the schema validation of an invalid JSON file.
+
+    Args:
+        module_name: Full name of the checker module.
+        metadata: Values of the METADATA_NAMES the module defines.
+    """
+
+    def __init__(self, module_name: str, metadata: Dict[str, Any]) -> None:
+        self.__name__ = module_name
+        self.__dict__.update(metadata)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing from the metadata, the module does not
+        # define the metadata it lacks, e.g. REQUIRED_DEFINITION_SETTING
+        if name in METADATA_NAMES or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(importlib.import_module(self.__name__), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy checker {self.__name__!r}>"
+
+
+def _read_metadata(
+    module_name: str, cache: Dict[str, Optional[Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    """Reads the metadata of a checker module from the top-level assignments of its source.
+
+    Preconditions may refer to the CHECKER_ID of checker modules imported by name.
+
+    Returns:
+        The metadata, or None if the module does not define a checker or its metadata
+        is not given as literals.
+    """
+    if module_name in cache:
+        return cache[module_name]
+    # Guards against modules referring to each other
+    cache[module_name] = None
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+    with open(spec.origin, "rb") as file:
+        tree = ast.parse(file.read(), filename=spec.origin)
+
+    imported_modules = {}
+    values: Dict[str, ast.expr] = {}
+    has_check_rule = False
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            for alias in node.names:
+                imported_modules[alias.asname or alias.name] = (
+                    f"{node.module}.{alias.name}"
+                )
+        elif (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id in METADATA_NAMES
+        ):
+            values[node.targets[0].id] = node.value
+        elif isinstance(node, ast.FunctionDef) and node.name == "check_rule":
+            has_check_rule = True
+    if "CHECKER_ID" not in values or not has_check_rule:
+        return None
+
+    def evaluate(value: ast.expr) -> Any:
+        if (
+            isinstance(value, ast.Attribute)
+            and value.attr == "CHECKER_ID"
+            and isinstance(value.value, ast.Name)
+            and value.value.id in imported_modules
+        ):
+            other = _read_metadata(imported_modules[value.value.id], cache)
+            if other is None:
+                raise ValueError(f"Unknown checker {value.value.id}")
+            return other["CHECKER_ID"]
+        if isinstance(value, ast.Set):
+            return {evaluate(element) for element in value.elts}
+        if (
+            isinstance(value, ast.Call)
+            and isinstance(value.func, ast.Name)
+            and value.func.id == "set"
+            and not value.args
+            and not value.keywords
+        ):
+            return set()
+        return ast.literal_eval(value)
+
+    try:
+        metadata = {name: evaluate(value) for name, value in values.items()}
+    except ValueError:
+        return None
+    cache[module_name] = metadata
+    return metadata
+
+
+def discover_checkers(package: types.ModuleType) -> List[Any]:
+    """Finds the modules of a package that define a checker.
+
+    A checker module defines CHECKER_ID, CHECKER_DESCRIPTION, CHECKER_PRECONDITIONS,
+    RULE_UID and check_rule(checker_data). Modules whose metadata is given as literals
+    are returned as LazyChecker without importing them, the others are imported.
+
+    Args:
+        package: Package holding the checker modules, e.g. xom_general_checker.
+
+    Returns:
+        The checker modules, sorted by module name.
+    """
+    checkers: List[Any] = []
+    cache: Dict[str, Optional[Dict[str, Any]]] = {}
+    for module_info in sorted(
+        pkgutil.iter_modules(package.__path__), key=lambda info: info.name
+    ):
+        module_name = f"{package.__name__}.{module_info.name}"
+        metadata = _read_metadata(module_name, cache)
+        if metadata is not None:
+            checkers.append(LazyChecker(module_name, metadata))
+            continue
+
+        module = importlib.import_module(module_name)
+        if hasattr(module, "CHECKER_ID") and hasattr(module, "check_rule"):
+            checkers.append(module)
+    return checkers
+
+
+def get_preconditions(checker: types.ModuleType) -> Set[str]:
+    # Some checkers define an empty dict instead of an empty set
+    return set(checker.CHECKER_PRECONDITIONS)
+
+
+def requires_definition_setting(checker: types.ModuleType) -> bool:
+    """Whether the checker is skipped for OpenMATERIAL 3D versions older than the version in its rule UID.
+
+    Checkers that determine the version of the input file set REQUIRED_DEFINITION_SETTING
+    to False.
+    """
+    return getattr(checker, "REQUIRED_DEFINITION_SETTING", True)
+
+
+class CheckerRegistry:
+    """Checkers ordered so that each checker follows its preconditions.
+
+    The preconditions of the checkers form a directed acyclic graph. A checker can
+    run as soon as all of its preconditions completed without issues, independent
+    checkers can run at the same time.
+
+    Args:
+        checkers: Checker modules.
+
+    Raises:
+        ValueError: If a precondition is not a registered checker, the preconditions form a
+            cycle, or a checker that determines the version depends on one that needs it.
+    """
+
+    def __init__(self, checkers: Iterable[types.ModuleType]) -> None:
+        self._checkers: Dict[str, types.ModuleType] = {}
+        for checker in checkers:
+            if checker.CHECKER_ID in self._checkers:
+                raise ValueError(f"Checker {checker.CHECKER_ID} is registered twice")
+            self._checkers[checker.CHECKER_ID] = checker
+
+        for checker in self._checkers.values():
+            unknown = get_preconditions(checker) - set(self._checkers)
+            if unknown:
+                raise ValueError(
+                    f"Checker {checker.CHECKER_ID} has unknown preconditions: {', '.join(sorted(unknown))}"
+                )
+            if not requires_definition_setting(checker) and any(
+                requires_definition_setting(self._checkers[precondition])
+                for precondition in get_preconditions(checker)
+            ):
+                raise ValueError(
+                    f"Checker {checker.CHECKER_ID} runs before the version is known, "
+                    "but depends on a checker that needs the version"
+                )
+
+        self.checkers = self._sort()
+
+    def get_checker(self, checker_id: str) -> types.ModuleType:
+        return self._checkers[checker_id]
+
+    def _sort(self) -> List[types.ModuleType]:
+        # Depth-first, so that each checker directly follows the preconditions it adds
+        ordered = []
+        visited = set()
+        open_ids: List[str] = []
+
+        def visit(checker_id: str) -> None:
+            if checker_id in visited:
+                return
+            if checker_id in open_ids:
+                cycle = open_ids[open_ids.index(checker_id) :] + [checker_id]
+                raise ValueError(
+                    f"Checker preconditions form a cycle: {' -> '.join(cycle)}"
+                )
+
+            open_ids.append(checker_id)
+            for precondition in sorted(get_preconditions(self._checkers[checker_id])):
+                visit(precondition)
+            open_ids.pop()
+
+            visited.add(checker_id)
+            ordered.append(self._checkers[checker_id])
+
+        for checker_id in self._checkers:
+            visit(checker_id)
+        return ordered
+
+
+@functools.lru_cache(maxsize=None)
+def get_registry() -> CheckerRegistry:
+    """Returns the registry of all checkers of the bundle, discovered on first use."""
+    return CheckerRegistry(discover_checkers(xom_general_checker))
@@ -0,0 +1,240 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import dataclasses
+import hashlib
+import itertools
+import json
+import logging
+import os
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from qc_openmaterial3d.checks import json_parser, json_stream, lookup_table, models
+from qc_openmaterial3d.schemas import schema_files
+
+SIDECAR_FORMAT_VERSION = 1
+
+# A sidecar of "x_brdf.xompt" consists of "x_brdf.xompt.table.json" and "x_brdf.xompt.table.npy"
+MANIFEST_SUFFIX = ".table.json"
+ARRAY_SUFFIX = ".table.npy"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Larger integers do not round-trip through float64
+MAX_EXACT_INTEGER = 2**53
+
+_CELL_TYPES = {int, float, type(None)}
+
+
+@dataclass
+class SidecarManifest:
+    """Describes the lookup table of a JSON source stored as .npy array next to it.
+
+    The skeleton and the table layout are those json_stream.parse_streamed returns for
+    the source, so a source whose hash matches is loaded as if it had been streamed.
+
+    Attributes:
+        format_version: SIDECAR_FORMAT_VERSION of the writer.
+        source_size: Size of the JSON source in bytes.
+        source_sha256: SHA-256 of the JSON source.
+        skeleton: Text of the source without the rows of its table.
+        table_path: JSON path of the table.
+        row_count: Number of rows of the table.
+        skeleton_offset: Offset of the emptied table in the skeleton.
+        removed_lines: Number of line breaks removed from the skeleton with the rows.
+        array_file: File name of the array, in the directory of the source.
+        array_sha256: SHA-256 of the array file.
+    """
+
+    format_version: int
+    source_size: int
+    source_sha256: str
+    skeleton: str
+    table_path: List[str]
+    row_count: int
+    skeleton_offset: int
+    removed_lines: int
+    array_file: str
+    array_sha256: str
+
+
+def get_manifest_path(json_file_path: str) -> str:
+    return json_file_path + MANIFEST_SUFFIX
+
+
+def hash_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_rows(rows: Tuple[list, ...], column_count: int, first_index: int) -> None:
+    """Raises ValueError unless all rows are lists of column_count numbers or nulls that float64 holds exactly."""
+    if set(map(type, rows)) == {list} and set(map(len, rows)) == {column_count}:
+        cells = list(itertools.chain.from_iterable(rows))
+        if set(map(type, cells)) <= _CELL_TYPES and all(
+            abs(cell) <= MAX_EXACT_INTEGER for cell in cells if type(cell) is int
+        ):
+            return
+
+    for index, row in enumerate(rows, first_index):
+        if (
+            type(row) is not list
+            or len(row) != column_count
+            or not set(map(type, row)) <= _CELL_TYPES
+            or any(type(cell) is int and abs(cell) > MAX_EXACT_INTEGER for cell in row)
+        ):
+            raise ValueError(
+                f"Row {index} is not a list of {column_count} numbers or nulls, "
+                "the table cannot be stored as array"
+            )
+
+
+def write_sidecar(json_file_path: str) -> str:
+    """Converts the lookup table of a JSON file to a sidecar next to it.
+
+    The rows are streamed from the file into a memory-mapped .npy array of shape
+    (rows, columns), with null cells stored as NaN. The table only needs a uniform
+    column count to be converted, its values are validated when the sidecar is checked.
+
+    Args:
+        json_file_path: Path of a file with a lookup table, e.g. a .xompt file.
+
+    Returns:
+        Path of the written manifest.
+
+    Raises:
+        ValueError: If the file is not valid JSON, has no lookup table or its rows are
+            not lists of numbers and nulls of equal length.
+    """
+    table_paths = schema_files.get_lookup_table_paths(json_file_path)
+    streamed = json_stream.parse_streamed(json_file_path, table_paths)
+    if len(streamed.tables) != 1:
+        raise ValueError(
+            f"{json_file_path} has {len(streamed.tables)} lookup tables instead of 1"
+        )
+    (table,) = streamed.tables.values()
+
+    rows = json_stream.iter_table_rows(json_file_path, table.path)
+    first = next(rows, None)
+    column_count = len(first[1]) if first is not None and type(first[1]) is list else 0
+
+    array_path = json_file_path + ARRAY_SUFFIX
+    array = np.lib.format.open_memmap(
+        array_path, mode="w+", dtype=np.float64, shape=(table.row_count, column_count)
+    )
+    try:
+        start = 0
+        for chunk_rows, _ in lookup_table.iter_row_chunks(
+            itertools.chain([first] if first is not None else [], rows)
+        ):
+            check_rows(chunk_rows, column_count, start)
+            array[start : start + len(chunk_rows)] = np.array(
+                chunk_rows, dtype=np.float64
+            )
+            start += len(chunk_rows)
+        array.flush()
+    except ValueError:
+        del array
+        os.remove(array_path)
+        raise
+    del array
+
+    manifest = SidecarManifest(
+        format_version=SIDECAR_FORMAT_VERSION,
+        source_size=os.path.getsize(json_file_path),
+        source_sha256=hash_file(json_file_path),
+        skeleton=streamed.skeleton,
+        table_path=list(table.path),
+        row_count=table.row_count,
+        skeleton_offset=table.skeleton_offset,
+        removed_lines=table.removed_lines,
+        array_file=os.path.basename(array_path),
+        array_sha256=hash_file(array_path),
+    )
+
+    # Written last, a manifest only exists for a complete array
+    manifest_path = get_manifest_path(json_file_path)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(dataclasses.asdict(manifest), file, indent=2)
+        file.write("\n")
+    return manifest_path
+
+
+def load_manifest(manifest_path: str) -> Optional[SidecarManifest]:
+    """Reads a manifest, returns None if it is unreadable or of another format version."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("format_version") != SIDECAR_FORMAT_VERSION:
+            return None
+        return SidecarManifest(**data)
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def read_sidecar_document(
+    json_file_path: str, size: int
+) -> Optional[models.JsonDocument]:
+    """Loads a JSON file from its table sidecar, if there is one that matches the file.
+
+    Both the file and the array are hashed and compared with the manifest, which reads
+    them at disk speed instead of parsing the rows. The array is memory-mapped read-only.
+
+    Args:
+        json_file_path: Path of the JSON source.
+        size: Size of the JSON source in bytes.
+
+    Returns:
+        The document with the table as streamed table and as array, or None if there is
+        no sidecar or it does not match the file.
+    """
+    manifest_path = get_manifest_path(json_file_path)
+    if not os.path.exists(manifest_path):
+        return None
+
+    manifest = load_manifest(manifest_path)
+    if manifest is None:
+        logging.warning(f"Ignoring unreadable table sidecar {manifest_path}")
+        return None
+
+    source_sha256 = hash_file(json_file_path) if manifest.source_size == size else None
+    if source_sha256 != manifest.source_sha256:
+        logging.warning(
+            f"Ignoring table sidecar {manifest_path}, {json_file_path} changed since"
+        )
+        return None
+
+    array_path = os.path.join(os.path.dirname(json_file_path), manifest.array_file)
+    if not os.path.exists(array_path) or hash_file(array_path) != manifest.array_sha256:
+        logging.warning(
+            f"Ignoring table sidecar {manifest_path}, its array is missing or changed"
+        )
+        return None
+
+    table_path = tuple(manifest.table_path)
+    return models.JsonDocument(
+        file_path=json_file_path,
+        size=size,
+        data=json_parser.loads(manifest.skeleton.encode("utf-8")),
+        skeleton=manifest.skeleton,
+        streamed_tables={
+            table_path: json_stream.StreamedTable(
+                table_path,
+                manifest.row_count,
+                manifest.skeleton_offset,
+                manifest.removed_lines,
+            )
+        },
+        table_arrays={table_path: np.load(array_path, mmap_mode="r")},
+        content_hash=source_sha256,
+    )
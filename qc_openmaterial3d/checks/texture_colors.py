@@ -0,0 +1,211 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import collections
+import hashlib
+import io
+import threading
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+    from PIL import Image
+
+    # Unreadable, truncated or corrupt files, and images larger than Image.MAX_IMAGE_PIXELS
+    DECODE_ERRORS: tuple = (OSError, ValueError, Image.DecompressionBombError)
+except ImportError:  # Pillow is an optional dependency
+    Image = None
+    DECODE_ERRORS = (OSError,)
+
+# Decoded textures kept by TextureColorCache, each holds one entry per distinct color
+MAX_CACHED_TEXTURES = 256
+
+# Modes whose pixel values Image.getcolors lists, other images are converted to RGB first
+LISTED_MODES = {"RGB", "RGBA", "P", "L"}
+
+# Distinct pixel values up to which Pillow counts the colors, which takes a fraction of
+# the time of reading the pixels into an array
+MAX_LISTED_COLORS = 1 << 16
+
+# Above this number of runs of equal pixels, counting all 2^24 colors directly is faster
+# than sorting the colors of the runs
+MAX_SORTED_RUNS = 1 << 22
+
+_RGB_MASK = 0xFFFFFF
+
+
+@dataclass(frozen=True)
+class TextureColors:
+    """Distinct colors of a decoded texture.
+
+    Attributes:
+        colors: Colors packed as R | G << 8 | B << 16, ascending, dtype uint32.
+        counts: Number of pixels of each color, dtype int64.
+    """
+
+    colors: np.ndarray
+    counts: np.ndarray
+
+    def as_dict(self) -> Dict[Tuple[int, int, int], int]:
+        """Pixel counts by (red, green, blue)."""
+        return {
+            unpack_color(color): int(count)
+            for color, count in zip(self.colors, self.counts)
+        }
+
+
+def is_available() -> bool:
+    """Whether Pillow is installed to decode textures."""
+    return Image is not None
+
+
+def pack_color(red: int, green: int, blue: int) -> int:
+    return red | green << 8 | blue << 16
+
+
+def unpack_color(color: int) -> Tuple[int, int, int]:
+    color = int(color)
+    return color & 0xFF, (color >> 8) & 0xFF, (color >> 16) & 0xFF
+
+
+def count_packed_colors(pixels: np.ndarray) -> TextureColors:
+    """Counts the distinct values of packed pixels.
+
+    Assignment textures consist of large areas of one color, so equal neighbouring
+    pixels are first merged into runs and only the colors of the runs are sorted.
+    Textures without such areas are counted over all colors at once instead.
+
+    Args:
+        pixels: Packed colors of all pixels, dtype uint32.
+
+    Returns:
+        The distinct colors with their pixel counts.
+    """
+    if len(pixels) == 0:
+        return TextureColors(np.empty(0, np.uint32), np.empty(0, np.int64))
+
+    starts = np.flatnonzero(pixels[1:] != pixels[:-1]) + 1
+    if len(starts) > MAX_SORTED_RUNS:
+        counts = np.bincount(pixels, minlength=_RGB_MASK + 1)
+        colors = np.flatnonzero(counts)
+        return TextureColors(colors.astype(np.uint32), counts[colors])
+
+    starts = np.concatenate(([0], starts))
+    lengths = np.diff(np.append(starts, len(pixels)))
+    colors, inverse = np.unique(pixels[starts], return_inverse=True)
+    counts = np.bincount(inverse, weights=lengths).astype(np.int64)
+    return TextureColors(colors, counts)
+
+
+def count_colors(image) -> TextureColors:
+    """Counts the distinct RGB colors of a Pillow image, ignoring the alpha channel.
+
+    Images with up to MAX_LISTED_COLORS distinct pixel values are counted by Pillow,
+    others, e.g. JPEG textures with compression artifacts, with count_packed_colors.
+
+    Args:
+        image: Opened Pillow image.
+
+    Returns:
+        The distinct colors with their pixel counts.
+    """
+    if image.mode not in LISTED_MODES:
+        image = image.convert("RGB")
+
+    listed = image.getcolors(MAX_LISTED_COLORS)
+    if listed is None:
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        # Four bytes per pixel are read as one little-endian integer without copying them
+        raw = image.tobytes("raw", "RGBA" if image.mode == "RGBA" else "RGBX")
+        return count_packed_colors(
+            np.frombuffer(raw, dtype="<u4") & np.uint32(_RGB_MASK)
+        )
+
+    counts = np.array([count for count, _ in listed], dtype=np.int64)
+    values = np.array([value for _, value in listed], dtype=np.uint32)
+    if image.mode == "P":
+        palette = np.zeros((256, 3), dtype=np.uint32)
+        entries = np.array(image.getpalette("RGB"), dtype=np.uint32).reshape(-1, 3)[
+            :256
+        ]
+        palette[: len(entries)] = entries
+        values = palette[values]
+    elif image.mode == "L":
+        values = np.repeat(values[:, np.newaxis], 3, axis=1)
+
+    packed = values[:, 0] | values[:, 1] << 8 | values[:, 2] << 16
+    # Palette entries and pixels differing in alpha only share their RGB color
+    colors, inverse = np.unique(packed, return_inverse=True)
+    return TextureColors(colors, np.bincount(inverse, weights=counts).astype(np.int64))
+
+
+def decode_colors(raw: bytes) -> TextureColors:
+    """Decodes a PNG or JPEG file and counts its colors.
+
+    Raises:
+        One of DECODE_ERRORS: If the file is not an image Pillow can decode.
+    """
+    with Image.open(io.BytesIO(raw)) as image:
+        return count_colors(image)
+
+
+class TextureColorCache:
+    """Process-wide cache of the colors of decoded textures, keyed by the hash of their content.
+
+    Textures are shared by many assets, so each distinct texture is decoded once,
+    independent of its path. The least recently used textures are dropped first.
+
+    Args:
+        max_entries: Maximum number of cached textures.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_TEXTURES) -> None:
+        self._max_entries = max_entries
+        self._cache: "collections.OrderedDict[str, TextureColors]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, texture_path: str) -> TextureColors:
+        """Returns the colors of a texture file, decoding it unless its content was seen before.
+
+        Raises:
+            One of DECODE_ERRORS: If the file cannot be read or decoded.
+        """
+        with open(texture_path, "rb") as file:
+            raw = file.read()
+        key = hashlib.sha256(raw).hexdigest()
+
+        with self._lock:
+            colors = self._cache.get(key)
+            if colors is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return colors
+            self.misses += 1
+
+        colors = decode_colors(raw)
+        with self._lock:
+            self._cache[key] = colors
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+        return colors
+
+    def clear(self) -> None:
+        """Drops all cached textures and resets the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+TEXTURES = TextureColorCache()
@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+MAX_STAT_WORKERS = 16
+
+
+def _get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class UriResolver:
+    """Process-wide cache of file existence checks for URI properties.
+
+    Paths are deduplicated per call and stat'ed concurrently in a bounded thread
+    pool, which hides the latency of network file systems. A cached result stays
+    valid as long as the modification time of its parent directory is unchanged,
+    because creating, deleting or renaming a file updates that time.
+
+    Paths are cached as given, without folding "..", which would skip the symbolic link
+    before it that the file system follows.
+
+    Args:
+        max_workers: Maximum number of concurrent stat calls.
+    """
+
+    def __init__(self, max_workers: int = MAX_STAT_WORKERS) -> None:
+        self._max_workers = max_workers
+        # Path -> (exists, mtime of the parent directory when checked)
+        self._cache: Dict[str, Tuple[bool, Optional[int]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def exists_many(self, paths: Iterable[str]) -> Dict[str, bool]:
+        """Checks which of the given files exist.
+
+        Args:
+            paths: Absolute file paths, possibly repeated.
+
+        Returns:
+            Existence by path, with one entry per distinct input path.
+        """
+        unique_paths = set(paths)
+
+        directories = {os.path.dirname(path) for path in unique_paths}
+        directory_mtimes = dict(zip(directories, self._map(_get_mtime, directories)))
+
+        results = {}
+        stale = []
+        with self._lock:
+            for path in unique_paths:
+                cached = self._cache.get(path)
+                if (
+                    cached is not None
+                    and cached[1] == directory_mtimes[os.path.dirname(path)]
+                ):
+                    results[path] = cached[0]
+                    self.hits += 1
+                else:
+                    stale.append(path)
+                    self.misses += 1
+
+        if stale:
+            existing = list(self._map(os.path.exists, stale))
+            with self._lock:
+                for path, exists in zip(stale, existing):
+                    self._cache[path] = (
+                        exists,
+                        directory_mtimes[os.path.dirname(path)],
+                    )
+                    results[path] = exists
+
+        return results
+
+    def exists(self, path: str) -> bool:
+        return self.exists_many([path])[path]
+
+    def clear(self) -> None:
+        """Drops all cached results and resets the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _map(self, function: Callable[[str], _T], paths: Iterable[str]) -> Iterable[_T]:
+        paths = list(paths)
+        if len(paths) <= 1 or self._max_workers <= 1:
+            return map(function, paths)
+
+        with ThreadPoolExecutor(
+            max_workers=min(self._max_workers, len(paths))
+        ) as executor:
+            return list(executor.map(function, paths))
+
+
+RESOLVER = UriResolver()
@@ -5,16 +5,184 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import os
 import re
 import json
 
+from typing import Optional
+
+from qc_baselib import Configuration
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import json_parser, json_stream, models
+from qc_openmaterial3d.schemas import schema_files
+
 EXPRESSION_PATTERN = re.compile(r"[$][{][ A-Za-z0-9_\+\-\*/%$\(\)\.,]*[\}]")
 PARAMETER_PATTERN = re.compile(r"[$][A-Za-z_][A-Za-z0-9_]*")
 
 
-def get_open_material_version(json_file_path: str) -> str:
-    with open(json_file_path, "r") as file:
-        data = json.load(file)
+def load_json_document(
+    json_file_path: str, streaming_threshold: Optional[int] = None
+) -> models.JsonDocument:
+    """Reads and parses a JSON file once.
+
+    Args:
+        json_file_path: Path to the JSON file.
+        streaming_threshold: Size in bytes above which files with lookup tables are
+            parsed without materializing the tables. constants.STREAMING_THRESHOLD if None.
+
+    Returns:
+        JsonDocument holding the raw bytes, the parsed tree and the parse error, if any.
+    """
+    return parse_json_document(read_json_document(json_file_path, streaming_threshold))
+
+
+def read_json_document(
+    json_file_path: str, streaming_threshold: Optional[int] = None
+) -> models.JsonDocument:
+    """Reads a JSON file without parsing it, unless it is large enough to be streamed.
+
+    Streamed files are parsed while they are read, because their tables are never
+    held in memory as a whole. Files with a table sidecar that matches their content
+    are loaded from the sidecar instead, independent of their size.
+
+    Args:
+        json_file_path: Path to the JSON file.
+        streaming_threshold: Size in bytes above which files with lookup tables are
+            parsed without materializing the tables. constants.STREAMING_THRESHOLD if None.
+
+    Returns:
+        JsonDocument holding the raw bytes, or the streamed tree and the parse error, if any.
+    """
+    document = models.JsonDocument(file_path=json_file_path)
+
+    try:
+        document.size = os.path.getsize(json_file_path)
+    except OSError:
+        return document
+
+    if streaming_threshold is None:
+        streaming_threshold = constants.STREAMING_THRESHOLD
+
+    table_paths = schema_files.get_lookup_table_paths(json_file_path)
+    if table_paths:
+        # Imports numpy, which files without lookup tables do not need
+        from qc_openmaterial3d.checks import table_sidecar
+
+        sidecar_document = table_sidecar.read_sidecar_document(
+            json_file_path, document.size
+        )
+        if sidecar_document is not None:
+            return sidecar_document
+
+    if table_paths and document.size > streaming_threshold:
+        try:
+            streamed = json_stream.parse_streamed(json_file_path, table_paths)
+        except ValueError as e:
+            document.parse_error = e
+            return document
+
+        document.data = streamed.data
+        document.skeleton = streamed.skeleton
+        document.streamed_tables = streamed.tables
+        return document
+
+    with open(json_file_path, "rb") as file:
+        document.raw = file.read()
+
+    return document
+
+
+def parse_json_document(document: models.JsonDocument) -> models.JsonDocument:
+    """Parses the raw bytes of a document read by read_json_document.
+
+    Args:
+        document: Document to parse in place.
+
+    Returns:
+        The document, holding the parsed tree or the parse error.
+    """
+    if (
+        document.raw is None
+        or document.data is not None
+        or document.parse_error is not None
+    ):
+        return document
+
+    try:
+        document.data = json_parser.loads(document.raw)
+    except ValueError as e:
+        # JSONDecodeError for syntax errors, UnicodeDecodeError for undecodable bytes
+        document.parse_error = e
+
+    return document
+
+
+def get_streaming_threshold(config: Configuration) -> Optional[int]:
+    """Returns the streamingThreshold checker bundle parameter in bytes, or None if not set."""
+    threshold = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name="streamingThreshold"
+    )
+    return None if threshold is None else int(threshold)
+
+
+def get_float_checker_param(
+    checker_data: models.CheckerData, checker_id: str, param_name: str, default: float
+) -> float:
+    """Returns a numeric checker parameter of the configuration, or default if it is not set."""
+    value = checker_data.config.get_checker_param(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=checker_id,
+        param_name=param_name,
+    )
+    return default if value is None else float(value)
+
+
+def get_bool_checker_param(
+    checker_data: models.CheckerData, checker_id: str, param_name: str, default: bool
+) -> bool:
+    """Returns a boolean checker parameter of the configuration, or default if it is not set.
+
+    "true", "yes" and non-zero numbers are True, case-insensitively.
+    """
+    value = checker_data.config.get_checker_param(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=checker_id,
+        param_name=param_name,
+    )
+    if value is None:
+        return default
+    if isinstance(value, str):
+        value = value.strip().lower()
+        return value in ("true", "yes") or (
+            value.replace(".", "", 1).isdigit() and float(value) != 0
+        )
+    return value != 0
+
+
+def get_document(checker_data: models.CheckerData) -> models.JsonDocument:
+    """Returns the parsed input file of the run, loading it on first access.
+
+    Args:
+        checker_data: Checker data object holding the document cache
+
+    Returns:
+        The cached JsonDocument of checker_data.json_file_path
+    """
+    if checker_data.document is None:
+        checker_data.document = load_json_document(checker_data.json_file_path)
+    return checker_data.document
+
+
+def get_display_path(path: str, base_dir: str) -> str:
+    """Path of a file named in an issue relative to base_dir, the path itself on another Windows drive."""
+    try:
+        return os.path.relpath(path, base_dir)
+    except ValueError:
+        return path
+
+
+def get_open_material_version(data: dict) -> str:
     return data["metadata"]["openMaterial3dVersion"]
 
 
@@ -48,52 +216,3 @@ def compare_versions(version1: str, version2: str) -> int:
         return 1
     else:
         return 0
-
-
-def recursive_search(hierarchy, lines, current_line):
-    """
-    Recursively traverses the JSON structure based on the property hierarchy.
-
-    Args:
-        hierarchy (list): The remaining parts of the property hierarchy to search for.
-        lines (list): All lines of the JSON file.
-        current_line (int): The current line number in the JSON file.
-
-    Returns:
-        int: The line number of the property if found, otherwise -1.
-    """
-    if not hierarchy:
-        return current_line
-
-    for line_num, line in enumerate(lines):
-        # Start by checking if the current line corresponds to the first property in the hierarchy
-        if f'"{hierarchy[0]}"' in line:
-            if len(hierarchy) == 1:
-                return current_line + line_num
-            else:
-                return recursive_search(hierarchy[1:], lines[line_num:], current_line + line_num)
-
-    return -1
-
-
-def find_property_line(json_file_path, property_hierarchy) -> int | None:
-    """
-    Finds the line number of a specific property in a JSON file.
-
-    Args:
-        json_file_path (str): Path to the JSON file.
-        property_hierarchy (list): List of properties (e.g., ['materialProperties', 'surfaceRoughness']).
-
-    Returns:
-        int: The line number where the property is located, or -1 if not found.
-    """
-    with open(json_file_path, "r") as file:
-        lines = file.readlines()
-
-        # Traverse the file line by line to match the hierarchical property
-        for line_num, line in enumerate(lines):
-            # Start by checking if the current line corresponds to the first property in the hierarchy
-            if f'"{property_hierarchy[0]}"' in line:
-                return recursive_search(property_hierarchy[1:], lines[line_num:], line_num + 1)
-
-    return None  # If the property was not found
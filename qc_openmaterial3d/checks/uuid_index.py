@@ -0,0 +1,214 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import sqlite3
+import threading
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from qc_openmaterial3d.checks import models
+
+# File name of the index in the cache directory of batch and watch runs
+INDEX_FILE_NAME = "uuid_index.sqlite"
+
+# Bump to drop all entries when the table layout changes
+INDEX_FORMAT_VERSION = 1
+
+# Seconds to wait for other processes writing to the index
+BUSY_TIMEOUT = 30.0
+
+# Metadata properties holding the version of a file, by file type
+VERSION_KEYS = ("materialVersion", "assetVersion", "mappingVersion")
+
+
+@dataclass
+class IndexEntry:
+    """Identity of a checked file as recorded in the index.
+
+    Attributes:
+        path: Normalized absolute path of the file.
+        uuid: metadata.uuid of the file.
+        version: Material, asset or mapping version of the file, if it has one.
+        name: metadata.name of the file, if it has one.
+        stamp: Modification time and size of the file when it was indexed.
+    """
+
+    path: str
+    uuid: str
+    version: Optional[str]
+    name: Optional[str]
+    stamp: Tuple[int, int]
+
+
+def get_identity(data: Any) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """Returns the uuid, version and name of a parsed document, or None if it has no uuid."""
+    metadata = data.get("metadata") if isinstance(data, dict) else None
+    if not isinstance(metadata, dict) or not isinstance(metadata.get("uuid"), str):
+        return None
+
+    version = next(
+        (metadata[key] for key in VERSION_KEYS if isinstance(metadata.get(key), str)),
+        None,
+    )
+    name = metadata.get("name") if isinstance(metadata.get("name"), str) else None
+    return metadata["uuid"], version, name
+
+
+def _get_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class UuidIndex:
+    """Persistent index of the uuid, version and name of the checked files.
+
+    The index is an SQLite database that batch and watch runs fill with their input
+    files before checking them, and that each check updates, so that the files sharing the uuid of a checked file are found
+    by an indexed lookup instead of reading the whole library. Processes checking
+    files at the same time can share a database. Each process opens its own
+    connection, which the checkers of a process share.
+
+    Entries of files that were deleted or modified since they were indexed are
+    dropped when they are looked up, a modified file is indexed again by the next run
+    over it.
+    """
+
+    def __init__(self) -> None:
+        self.path: Optional[str] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.path is not None
+
+    def open(self, path: str) -> None:
+        """Uses the database at path, creating it if it does not exist."""
+        self.close()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        with self._lock:
+            self._get_connection()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._pid = None
+            self.path = None
+
+    def add(self, document: models.JsonDocument) -> None:
+        """Records the identity of a checked file, replacing its earlier entry."""
+        path = os.path.normpath(os.path.abspath(document.file_path))
+        identity = get_identity(document.data)
+        stamp = _get_stamp(path)
+
+        with self._lock:
+            connection = self._get_connection()
+            if identity is None or stamp is None:
+                connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                return
+            connection.execute(
+                "INSERT OR REPLACE INTO files (path, uuid, version, name, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, *identity, *stamp),
+            )
+
+    def get_entry(self, file_path: str) -> Optional[IndexEntry]:
+        """Returns the entry of a file, or None if it is not indexed or changed since it was indexed."""
+        path = os.path.normpath(os.path.abspath(file_path))
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute(
+                    "SELECT path, uuid, version, name, mtime_ns, size FROM files WHERE path = ?",
+                    (path,),
+                )
+                .fetchone()
+            )
+        if row is None or _get_stamp(path) != (row[4], row[5]):
+            return None
+        return IndexEntry(row[0], row[1], row[2], row[3], (row[4], row[5]))
+
+    def find_others(self, file_path: str, uuid: str) -> List[IndexEntry]:
+        """Looks up the other files with a uuid.
+
+        Args:
+            file_path: Path of the file whose entry is left out.
+            uuid: uuid to look up.
+
+        Returns:
+            The entries of the files sharing the uuid that are unchanged since they were
+            indexed, sorted by path.
+        """
+        path = os.path.normpath(os.path.abspath(file_path))
+        with self._lock:
+            connection = self._get_connection()
+            rows = connection.execute(
+                "SELECT path, uuid, version, name, mtime_ns, size FROM files "
+                "WHERE uuid = ? AND path <> ? ORDER BY path",
+                (uuid, path),
+            ).fetchall()
+
+            entries = []
+            for other_path, other_uuid, version, name, mtime_ns, size in rows:
+                if _get_stamp(other_path) == (mtime_ns, size):
+                    entries.append(
+                        IndexEntry(
+                            other_path, other_uuid, version, name, (mtime_ns, size)
+                        )
+                    )
+                else:
+                    connection.execute(
+                        "DELETE FROM files WHERE path = ? AND mtime_ns = ? AND size = ?",
+                        (other_path, mtime_ns, size),
+                    )
+            return entries
+
+    def clear(self) -> None:
+        """Drops all entries."""
+        with self._lock:
+            self._get_connection().execute("DELETE FROM files")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Connects to the database once per process, forked workers do not share the connection."""
+        if self.path is None:
+            raise RuntimeError("The uuid index is not open")
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path,
+                timeout=BUSY_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            if (
+                connection.execute("PRAGMA user_version").fetchone()[0]
+                != INDEX_FORMAT_VERSION
+            ):
+                connection.execute("DROP TABLE IF EXISTS files")
+                connection.execute(f"PRAGMA user_version = {INDEX_FORMAT_VERSION}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, uuid TEXT NOT NULL, "
+                "version TEXT, name TEXT, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS files_by_uuid ON files (uuid)"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+
+INDEX = UuidIndex()
@@ -4,7 +4,32 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from . import general_valid_json_document as valid_json_document
-from . import general_version_is_defined as version_is_defined
-from . import general_valid_schema as valid_schema
-from . import general_uris_exist as uris_exist
\ No newline at end of file
+import importlib
+import pkgutil
+import types
+
+from typing import Any
+
+CHECKER_MODULE_PREFIX = "general_"
+
+# Short checker name -> module, e.g. "valid_schema" -> "general_valid_schema". A checker
+# module is imported on first access of its short name, so that a run only pays for
+# the imports of the checkers it uses.
+CHECKER_MODULES = {
+    module_info.name[len(CHECKER_MODULE_PREFIX) :]: module_info.name
+    for module_info in pkgutil.iter_modules(__path__)
+    if module_info.name.startswith(CHECKER_MODULE_PREFIX)
+}
+
+
+def get_checker(name: str) -> types.ModuleType:
+    """Imports a checker module by its short name, e.g. "valid_schema"."""
+    checker = importlib.import_module(f"{__name__}.{CHECKER_MODULES[name]}")
+    globals()[name] = checker
+    return checker
+
+
+def __getattr__(name: str) -> Any:
+    if name in CHECKER_MODULES:
+        return get_checker(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,307 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from qc_baselib import IssueSeverity, StatusType
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.schemas import schema_files
+from qc_openmaterial3d.checks import lookup_table, models, utils
+
+from qc_openmaterial3d.checks.xom_general_checker import (
+    general_lookup_table_grid,
+    general_valid_schema,
+)
+
+CHECKER_ID = "check_asam.net:xom:1.0.0:general.brdf_plausibility"
+CHECKER_DESCRIPTION = (
+    "BRDF lookup tables must satisfy Helmholtz reciprocity and conserve energy."
+)
+CHECKER_PRECONDITIONS = {
+    general_valid_schema.CHECKER_ID,
+    general_lookup_table_grid.CHECKER_ID,
+}
+RULE_UID = "asam.net:xom:1.0.0:general.brdf_plausibility"
+
+# Checker parameters and their defaults
+RECIPROCITY_TOLERANCE = ("reciprocityTolerance", 0.05)
+RECIPROCITY_ABSOLUTE_TOLERANCE = ("reciprocityAbsoluteTolerance", 1e-6)
+ENERGY_TOLERANCE = ("energyTolerance", 0.05)
+
+# Issues reported per kind of violation, the total count is part of the descriptions
+MAX_REPORTED_ISSUES = 10
+
+BRDF_COLUMNS = 5
+GRID_COLUMNS = 4
+
+
+def add_issue(
+    checker_data: models.CheckerData,
+    description: str,
+    location: Optional[Tuple[int, int]],
+) -> None:
+    """
+    Add issue to checker_data.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        description: Description of the issue
+        location: 1-based (line, column) of the issue, if known
+    """
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description=description,
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+    if location:
+        checker_data.result.add_file_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            row=location[0],
+            column=location[1],
+            description=description,
+        )
+
+
+def get_param(checker_data: models.CheckerData, param: Tuple[str, float]) -> float:
+    return utils.get_float_checker_param(checker_data, CHECKER_ID, *param)
+
+
+def azimuth_weights(azimuths: np.ndarray) -> np.ndarray:
+    """
+    Quadrature weights over the full circle of exit azimuth angles.
+
+    Tables up to pi are taken as the half of an isotropic BRDF that is mirror symmetric to
+    the plane of incidence, larger ranges are closed periodically at 2 pi.
+
+    Args:
+        azimuths: Sorted distinct azimuth angles of the table in rad
+
+    Returns:
+        One weight per azimuth angle
+    """
+    if len(azimuths) == 1:
+        return np.array([2 * np.pi])
+
+    weights = lookup_table.trapezoid_weights(azimuths)
+    if azimuths[-1] <= np.pi + 1e-6:
+        return 2 * weights
+
+    gap = azimuths[0] + 2 * np.pi - azimuths[-1]
+    weights[0] += gap / 2
+    weights[-1] += gap / 2
+    return weights
+
+
+def find_reciprocity_violations(
+    axes: List[np.ndarray],
+    brdf: np.ndarray,
+    relative_tolerance: float,
+    absolute_tolerance: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compare f(theta_i, theta_r, phi) with f(theta_r, theta_i, phi) for all zenith angles present on both axes.
+
+    Args:
+        axes: Wavelengths, incident zenith, exit zenith and exit azimuth angles of the grid
+        brdf: BRDF values, shape (wavelengths, incident zenith, exit zenith, azimuth)
+        relative_tolerance: Allowed difference relative to the larger value
+        absolute_tolerance: Allowed absolute difference
+
+    Returns:
+        Grid indices (wavelength, incident, exit, azimuth) of the violating points with
+        theta_i < theta_r, and the grid indices of their reciprocal points
+    """
+    common, incident_indices, exit_indices = np.intersect1d(
+        axes[1], axes[2], return_indices=True
+    )
+    if len(common) < 2:
+        return np.empty((0, 4), dtype=np.intp), np.empty((0, 4), dtype=np.intp)
+
+    # [wavelength, a, b, azimuth] = f(theta_i = common[a], theta_r = common[b])
+    values = brdf[:, incident_indices][:, :, exit_indices]
+    swapped = values.transpose(0, 2, 1, 3)
+
+    allowed = absolute_tolerance + relative_tolerance * np.maximum(
+        np.abs(values), np.abs(swapped)
+    )
+    violations = np.abs(values - swapped) > allowed
+    # Each pair is compared twice, keep the one with the smaller incident angle
+    violations &= np.triu(np.ones((len(common), len(common)), dtype=bool), k=1)[
+        None, :, :, None
+    ]
+
+    wavelength, first, second, azimuth = np.nonzero(violations)
+    points = np.stack(
+        [wavelength, incident_indices[first], exit_indices[second], azimuth], axis=1
+    )
+    reciprocal_points = np.stack(
+        [wavelength, incident_indices[second], exit_indices[first], azimuth], axis=1
+    )
+    return points, reciprocal_points
+
+
+def compute_reflectance(axes: List[np.ndarray], brdf: np.ndarray) -> np.ndarray:
+    """
+    Integrate f cos(theta_r) over the hemisphere of exit directions for each wavelength and incident angle.
+
+    Args:
+        axes: Wavelengths, incident zenith, exit zenith and exit azimuth angles of the grid
+        brdf: BRDF values, shape (wavelengths, incident zenith, exit zenith, azimuth)
+
+    Returns:
+        Directional-hemispherical reflectance, shape (wavelengths, incident zenith)
+    """
+    exit_zenith = axes[2]
+    # Solid angle element sin(theta_r) dtheta_r dphi, projected with cos(theta_r)
+    zenith_weights = (
+        lookup_table.trapezoid_weights(exit_zenith)
+        * np.cos(exit_zenith)
+        * np.sin(exit_zenith)
+    )
+    return np.einsum("lirp,r,p->li", brdf, zenith_weights, azimuth_weights(axes[3]))
+
+
+def check_reciprocity(
+    checker_data: models.CheckerData,
+    table_path: Tuple[str, ...],
+    axes: List[np.ndarray],
+    brdf: np.ndarray,
+    rows: np.ndarray,
+) -> None:
+    """
+    Check Helmholtz reciprocity of the BRDF.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        table_path: JSON path of the lookup table
+        axes: Wavelengths, incident zenith, exit zenith and exit azimuth angles of the grid
+        brdf: BRDF values on the grid
+        rows: Row index of each grid point
+    """
+    relative_tolerance = get_param(checker_data, RECIPROCITY_TOLERANCE)
+    absolute_tolerance = get_param(checker_data, RECIPROCITY_ABSOLUTE_TOLERANCE)
+
+    points, reciprocal_points = find_reciprocity_violations(
+        axes, brdf, relative_tolerance, absolute_tolerance
+    )
+    reported = list(
+        zip(
+            points[:MAX_REPORTED_ISSUES].tolist(),
+            reciprocal_points[:MAX_REPORTED_ISSUES].tolist(),
+        )
+    )
+    locations = lookup_table.find_row_locations(
+        utils.get_document(checker_data),
+        table_path,
+        [int(rows[tuple(point)]) for point, _ in reported],
+    )
+
+    table_name = ".".join(table_path)
+    for point, reciprocal_point in reported:
+        w, i, r, _ = point
+        row, reciprocal_row = int(rows[tuple(point)]), int(
+            rows[tuple(reciprocal_point)]
+        )
+        add_issue(
+            checker_data,
+            f"Rows {row} and {reciprocal_row} of {table_name} violate Helmholtz reciprocity, "
+            f"their BRDF values {float(brdf[tuple(point)])!r} and {float(brdf[tuple(reciprocal_point)])!r} "
+            f"differ by more than the tolerance at wavelength {float(axes[0][w])!r} for the zenith angles "
+            f"{float(axes[1][i])!r} and {float(axes[2][r])!r} ({len(points)} violation(s) in total).",
+            locations.get(row),
+        )
+
+
+def check_energy_conservation(
+    checker_data: models.CheckerData,
+    table_path: Tuple[str, ...],
+    axes: List[np.ndarray],
+    brdf: np.ndarray,
+    rows: np.ndarray,
+) -> None:
+    """
+    Check that no more energy is reflected than received, per wavelength and incident angle.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        table_path: JSON path of the lookup table
+        axes: Wavelengths, incident zenith, exit zenith and exit azimuth angles of the grid
+        brdf: BRDF values on the grid
+        rows: Row index of each grid point
+    """
+    tolerance = get_param(checker_data, ENERGY_TOLERANCE)
+
+    reflectance = compute_reflectance(axes, brdf)
+    violations = np.argwhere(reflectance > 1 + tolerance)
+    reported = violations[:MAX_REPORTED_ISSUES].tolist()
+
+    # Locate each violation at the first row of its wavelength and incident angle
+    first_rows = [int(rows[w, i].min()) for w, i in reported]
+    locations = lookup_table.find_row_locations(
+        utils.get_document(checker_data), table_path, first_rows
+    )
+
+    table_name = ".".join(table_path)
+    for (w, i), row in zip(reported, first_rows):
+        add_issue(
+            checker_data,
+            f"The BRDF of {table_name} reflects {reflectance[w, i]:.4g} times the incident energy "
+            f"at wavelength {float(axes[0][w])!r} and incident zenith angle {float(axes[1][i])!r}, "
+            f"which violates energy conservation ({len(violations)} violation(s) in total).",
+            locations.get(row),
+        )
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements a rule to check the physical plausibility of BRDF lookup tables
+
+    Args:
+        checker_data: Checker data object used to raise issues
+    """
+    logging.info(f"Executing {CHECKER_ID}")
+
+    schema_key = schema_files.get_schema_key(
+        checker_data.schema_version, checker_data.json_file_path
+    )
+    document = utils.get_document(checker_data)
+
+    table = None
+    if schema_key.endswith(":brdf.xompt"):
+        table_path = schema_files.LOOKUP_TABLE_PATHS[schema_key]
+        table = lookup_table.load_columns(document, table_path, BRDF_COLUMNS)
+
+    if table is None:
+        checker_data.result.set_checker_status(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            status=StatusType.SKIPPED,
+        )
+        checker_data.result.add_checker_summary(
+            constants.BUNDLE_NAME,
+            CHECKER_ID,
+            "The file has no BRDF lookup table. Skip the check.",
+        )
+        return
+
+    if len(table) == 0:
+        return
+
+    # The grid checker precondition guarantees a full grid without repeated points
+    axes, values, rows = lookup_table.to_grid(table, GRID_COLUMNS)
+    brdf = values[..., 0]
+
+    check_reciprocity(checker_data, table_path, axes, brdf, rows)
+    check_energy_conservation(checker_data, table_path, axes, brdf, rows)
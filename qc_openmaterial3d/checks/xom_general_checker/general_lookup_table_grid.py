@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from qc_baselib import IssueSeverity, StatusType
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.schemas import schema_files
+from qc_openmaterial3d.checks import lookup_table, models, utils
+
+from qc_openmaterial3d.checks.xom_general_checker import general_valid_schema
+
+CHECKER_ID = "check_asam.net:xom:1.0.0:general.lookup_table_grid"
+CHECKER_DESCRIPTION = (
+    "Lookup tables must be sorted based on the columns starting with the first, list all of their "
+    "wavelengths and cover the full grid of their measurement conditions."
+)
+CHECKER_PRECONDITIONS = {general_valid_schema.CHECKER_ID}
+RULE_UID = "asam.net:xom:1.0.0:general.lookup_table_grid"
+
+# Issues reported per kind of violation, the total count is part of the descriptions
+MAX_REPORTED_ROWS = 10
+
+
+def add_issue(
+    checker_data: models.CheckerData,
+    description: str,
+    location: Optional[Tuple[int, int]],
+) -> None:
+    """
+    Add issue to checker_data.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        description: Description of the issue
+        location: 1-based (line, column) of the issue, if known
+    """
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description=description,
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+    if location:
+        checker_data.result.add_file_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            row=location[0],
+            column=location[1],
+            description=description,
+        )
+
+
+def format_point(point) -> str:
+    return "(" + ", ".join(repr(float(value)) for value in point) + ")"
+
+
+def check_sort_order(
+    checker_data: models.CheckerData, table_path: Tuple[str, ...], keys: np.ndarray
+) -> None:
+    """
+    Check that the rows are sorted based on the columns starting with the first.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        table_path: JSON path of the lookup table
+        keys: Grid columns of the table
+    """
+    table_name = ".".join(table_path)
+    unsorted_rows = lookup_table.find_unsorted_rows(keys)
+    reported_rows = unsorted_rows[:MAX_REPORTED_ROWS].tolist()
+    locations = lookup_table.find_row_locations(
+        utils.get_document(checker_data), table_path, reported_rows
+    )
+
+    for index in reported_rows:
+        add_issue(
+            checker_data,
+            f"Row {index} of {table_name} is not sorted based on the columns starting with the first, "
+            f"it must not precede row {index - 1} ({len(unsorted_rows)} unsorted row(s) in total).",
+            locations.get(index),
+        )
+
+
+def check_grid(
+    checker_data: models.CheckerData, table_path: Tuple[str, ...], keys: np.ndarray
+) -> None:
+    """
+    Check that the rows cover each point of the measurement grid exactly once.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        table_path: JSON path of the lookup table
+        keys: Grid columns of the table
+    """
+    document = utils.get_document(checker_data)
+    table_name = ".".join(table_path)
+
+    duplicate_rows = lookup_table.find_duplicate_rows(keys)
+    reported_rows = duplicate_rows[:MAX_REPORTED_ROWS].tolist()
+    locations = lookup_table.find_row_locations(document, table_path, reported_rows)
+
+    for index in reported_rows:
+        add_issue(
+            checker_data,
+            f"Row {index} of {table_name} repeats the grid point {format_point(keys[index])} "
+            f"({len(duplicate_rows)} repeated row(s) in total).",
+            locations.get(index),
+        )
+
+    missing_count, grid_size, missing_points = lookup_table.find_missing_grid_points(
+        keys, MAX_REPORTED_ROWS
+    )
+    if missing_count == 0:
+        return
+
+    table_location = document.find_location(table_path)
+    if not missing_points:
+        add_issue(
+            checker_data,
+            f"{table_name} is not a full grid, {missing_count} of {grid_size} grid points are missing.",
+            table_location,
+        )
+
+    for point in missing_points:
+        add_issue(
+            checker_data,
+            f"{table_name} is not a full grid, the grid point {format_point(point)} is missing "
+            f"({missing_count} of {grid_size} grid points missing in total).",
+            table_location,
+        )
+
+
+def check_wavelengths(
+    checker_data: models.CheckerData,
+    table_path: Tuple[str, ...],
+    wavelengths_path: Tuple[str, ...],
+    keys: np.ndarray,
+) -> None:
+    """
+    Check that the wavelength list holds exactly the distinct values of the first table column.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        table_path: JSON path of the lookup table
+        wavelengths_path: JSON path of the wavelength list
+        keys: Grid columns of the table
+    """
+    document = utils.get_document(checker_data)
+    table_name = ".".join(table_path)
+    wavelengths_name = ".".join(wavelengths_path)
+
+    listed = lookup_table.get_table_rows(document.data, wavelengths_path)
+    if listed is None:
+        return
+    listed = np.array(listed, dtype=np.float64)
+    used = np.unique(keys[:, 0])
+
+    not_used = np.flatnonzero(~np.isin(listed, used))
+    for index in not_used[:MAX_REPORTED_ROWS].tolist():
+        add_issue(
+            checker_data,
+            f"Wavelength {float(listed[index])!r} listed in {wavelengths_name} does not occur in {table_name}.",
+            document.find_location(wavelengths_path + (index,)),
+        )
+
+    not_listed = used[~np.isin(used, listed)]
+    reported = not_listed[:MAX_REPORTED_ROWS]
+    # Locate each unlisted wavelength at its first row
+    first_rows = [int(np.argmax(keys[:, 0] == wavelength)) for wavelength in reported]
+    locations = lookup_table.find_row_locations(document, table_path, first_rows)
+
+    for wavelength, index in zip(reported.tolist(), first_rows):
+        add_issue(
+            checker_data,
+            f"Wavelength {wavelength!r} of row {index} of {table_name} is not listed in {wavelengths_name} "
+            f"({len(not_listed)} unlisted wavelength(s) in total).",
+            locations.get(index),
+        )
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements a rule to check the order, wavelengths and grid of lookup tables
+
+    Args:
+        checker_data: Checker data object used to raise issues
+    """
+    logging.info(f"Executing {CHECKER_ID}")
+
+    schema_key = schema_files.get_schema_key(
+        checker_data.schema_version, checker_data.json_file_path
+    )
+    table_path = schema_files.LOOKUP_TABLE_PATHS.get(schema_key)
+    document = utils.get_document(checker_data)
+
+    keys = None
+    if table_path is not None:
+        keys = lookup_table.load_columns(
+            document, table_path, schema_files.LOOKUP_TABLE_KEY_COLUMNS[schema_key]
+        )
+
+    if keys is None:
+        checker_data.result.set_checker_status(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            status=StatusType.SKIPPED,
+        )
+        checker_data.result.add_checker_summary(
+            constants.BUNDLE_NAME,
+            CHECKER_ID,
+            "The file has no lookup table. Skip the check.",
+        )
+        return
+
+    if len(keys) == 0:
+        return
+
+    check_sort_order(checker_data, table_path, keys)
+    check_grid(checker_data, table_path, keys)
+
+    wavelengths_path = schema_files.LOOKUP_TABLE_WAVELENGTHS.get(schema_key)
+    if wavelengths_path is not None:
+        check_wavelengths(checker_data, table_path, wavelengths_path, keys)
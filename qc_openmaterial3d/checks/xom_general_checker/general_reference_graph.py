@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+import os
+
+from typing import Optional, Tuple
+
+from qc_baselib import IssueSeverity
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import models, reference_graph, utils
+
+from qc_openmaterial3d.checks.xom_general_checker import (
+    general_valid_json_document,
+    general_version_is_defined,
+)
+
+CHECKER_ID = "check_asam.net:xom:1.0.0:general.reference_graph"
+CHECKER_DESCRIPTION = "All files reachable through the links of the input file must exist, be valid and not link back to each other."
+CHECKER_PRECONDITIONS = {
+    general_valid_json_document.CHECKER_ID,
+    general_version_is_defined.CHECKER_ID,
+}
+RULE_UID = "asam.net:xom:1.0.0:general.reference_graph"
+
+
+def add_issue(
+    checker_data: models.CheckerData,
+    description: str,
+    location: Optional[Tuple[int, int]],
+) -> None:
+    """
+    Add issue to checker_data.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        description: Description of the issue
+        location: 1-based (line, column) of the issue in the input file, if known
+    """
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description=description,
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+    if location:
+        checker_data.result.add_file_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            row=location[0],
+            column=location[1],
+            description=description,
+        )
+
+
+def describe_reference(
+    closure: reference_graph.ReferenceClosure,
+    path: str,
+    reference: reference_graph.Reference,
+) -> str:
+    """Names the link as "<key> at line <line> of <file>", the file relative to the input file."""
+    file_name = utils.get_display_path(path, os.path.dirname(closure.entry))
+    if reference.location is None:
+        return f"{reference.key} of {file_name}"
+    return f"{reference.key} at line {reference.location[0]} of {file_name}"
+
+
+def entry_location(
+    closure: reference_graph.ReferenceClosure,
+    path: str,
+    reference: reference_graph.Reference,
+) -> Optional[Tuple[int, int]]:
+    """Location of the link if it is part of the input file."""
+    return reference.location if path == closure.entry else None
+
+
+def get_dependency_fingerprint(checker_data: models.CheckerData) -> list:
+    """
+    State of all files reachable from the input file, which the result depends on besides the input file.
+
+    Args:
+        checker_data: Checker data object of the run
+
+    Returns:
+        Path, modification time and size of each reached file, followed by the dangling link
+        targets with a None stamp
+    """
+    closure = reference_graph.GRAPH.walk(
+        utils.get_document(checker_data),
+        utils.get_streaming_threshold(checker_data.config),
+    )
+    return [[node.path, *node.stamp] for node in closure.nodes] + [
+        [reference.target, None] for _, reference in closure.dangling
+    ]
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements a rule to check the files linked directly and indirectly by the input file
+
+    Args:
+        checker_data: Checker data object used to raise issues
+    """
+    logging.info(f"Executing {CHECKER_ID}")
+
+    closure = reference_graph.GRAPH.walk(
+        utils.get_document(checker_data),
+        utils.get_streaming_threshold(checker_data.config),
+    )
+
+    for path, reference in closure.dangling:
+        # Missing targets of URI properties of the input file are reported by the uris_exist checker
+        if (
+            path == closure.entry
+            and reference.key != reference_graph.MATERIAL_MAPPING_KEY
+        ):
+            continue
+        add_issue(
+            checker_data,
+            f"The URI {reference.uri} set in {describe_reference(closure, path, reference)} does not exist.",
+            entry_location(closure, path, reference),
+        )
+
+    for node in closure.nodes:
+        if node.problem is None:
+            continue
+        path, reference = closure.parents[node.path]
+        add_issue(
+            checker_data,
+            f"The file {reference.uri} linked in {describe_reference(closure, path, reference)} {node.problem}.",
+            entry_location(closure, path, reference),
+        )
+
+    for cycle in closure.cycles:
+        file_names = [
+            utils.get_display_path(path, os.path.dirname(closure.entry))
+            for path in cycle
+        ]
+        add_issue(
+            checker_data,
+            f"The files link to each other in a cycle: {' -> '.join(file_names)}.",
+            None,
+        )
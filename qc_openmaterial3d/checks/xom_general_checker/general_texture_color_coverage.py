@@ -0,0 +1,279 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+import os
+import re
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from qc_baselib import IssueSeverity, StatusType
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import models, texture_colors, utils
+
+from qc_openmaterial3d.checks.xom_general_checker import (
+    general_reference_graph,
+    general_valid_schema,
+)
+
+CHECKER_ID = "check_asam.net:xom:1.0.0:general.texture_color_coverage"
+CHECKER_DESCRIPTION = "Every color of the material assignment textures of an asset must be mapped to a material in its material mapping."
+CHECKER_PRECONDITIONS = {
+    general_valid_schema.CHECKER_ID,
+    general_reference_graph.CHECKER_ID,
+}
+RULE_UID = "asam.net:xom:1.0.0:general.texture_color_coverage"
+
+TEXTURE_ASSIGNMENT_KEY = "materialTextureAssignment"
+TEXTURE_URI_COLUMN = 1
+MATERIAL_MAPPING_URI_KEY = "materialMappingUri"
+MATERIAL_MAPPING_KEY = "materialMapping"
+
+# Mapping keys naming a color of an assignment texture, e.g. "rgb:255;0;0"
+RGB_KEY_PATTERN = re.compile(r"rgb:(\d{1,3});(\d{1,3});(\d{1,3})")
+
+# Unmapped colors listed per texture, the most frequent first
+MAX_REPORTED_COLORS = 10
+
+
+def add_issue(
+    checker_data: models.CheckerData,
+    description: str,
+    location: Optional[Tuple[int, int]],
+) -> None:
+    """
+    Add issue to checker_data.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        description: Description of the issue
+        location: 1-based (line, column) of the issue, if known
+    """
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description=description,
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+    if location:
+        checker_data.result.add_file_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            row=location[0],
+            column=location[1],
+            description=description,
+        )
+
+
+def skip(checker_data: models.CheckerData, summary: str) -> None:
+    checker_data.result.set_checker_status(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        status=StatusType.SKIPPED,
+    )
+    checker_data.result.add_checker_summary(constants.BUNDLE_NAME, CHECKER_ID, summary)
+
+
+def collect_textures(
+    checker_data: models.CheckerData,
+) -> List[Tuple[int, str, str, str]]:
+    """
+    Collect the assignment textures of the input file.
+
+    Args:
+        checker_data: Checker data object of the run
+
+    Returns:
+        Row index, material name, URI and normalized absolute path of each assigned texture
+    """
+    data = utils.get_document(checker_data).data
+    assignments = data.get(TEXTURE_ASSIGNMENT_KEY) if isinstance(data, dict) else None
+    if not isinstance(assignments, list):
+        return []
+
+    base_dir = os.path.dirname(os.path.abspath(checker_data.json_file_path))
+    textures = []
+    for index, row in enumerate(assignments):
+        if (
+            isinstance(row, list)
+            and len(row) > TEXTURE_URI_COLUMN
+            and isinstance(row[TEXTURE_URI_COLUMN], str)
+        ):
+            uri = row[TEXTURE_URI_COLUMN]
+            textures.append(
+                (index, row[0], uri, os.path.normpath(os.path.join(base_dir, uri)))
+            )
+    return textures
+
+
+def get_mapping_path(checker_data: models.CheckerData) -> Optional[str]:
+    """Normalized absolute path of the material mapping of the input file, if it links one."""
+    data = utils.get_document(checker_data).data
+    uri = data.get(MATERIAL_MAPPING_URI_KEY) if isinstance(data, dict) else None
+    if not isinstance(uri, str):
+        return None
+    base_dir = os.path.dirname(os.path.abspath(checker_data.json_file_path))
+    return os.path.normpath(os.path.join(base_dir, uri))
+
+
+def get_mapped_colors(mapping_path: Optional[str]) -> np.ndarray:
+    """
+    Collect the colors the material mapping assigns a material to.
+
+    Args:
+        mapping_path: Path of the material mapping, or None if the asset links none
+
+    Returns:
+        Packed colors of the "rgb:R;G;B" keys of the mapping, dtype uint32
+    """
+    data = utils.load_json_document(mapping_path).data if mapping_path else None
+    rows = data.get(MATERIAL_MAPPING_KEY) if isinstance(data, dict) else None
+
+    colors = []
+    for row in rows if isinstance(rows, list) else []:
+        match = (
+            RGB_KEY_PATTERN.fullmatch(row[0])
+            if row and isinstance(row[0], str)
+            else None
+        )
+        if match and all(int(channel) <= 255 for channel in match.groups()):
+            colors.append(texture_colors.pack_color(*map(int, match.groups())))
+    return np.array(colors, dtype=np.uint32)
+
+
+def describe_unmapped_colors(
+    colors: texture_colors.TextureColors, unmapped: np.ndarray
+) -> str:
+    """Lists the most frequent unmapped colors as mapping keys with their pixel counts."""
+    order = np.argsort(-colors.counts[unmapped], kind="stable")[:MAX_REPORTED_COLORS]
+    listed = [
+        "rgb:{};{};{} ({} pixels)".format(*texture_colors.unpack_color(color), count)
+        for color, count in zip(
+            colors.colors[unmapped][order], colors.counts[unmapped][order]
+        )
+    ]
+    if len(unmapped) > MAX_REPORTED_COLORS:
+        listed.append(f"and {len(unmapped) - MAX_REPORTED_COLORS} more")
+    return ", ".join(listed)
+
+
+def find_unmapped_colors(path: str, mapped_colors: np.ndarray) -> Optional[str]:
+    """
+    Describe the problem of an assignment texture with the material mapping.
+
+    Args:
+        path: Absolute path of the texture
+        mapped_colors: Packed colors of the material mapping
+
+    Returns:
+        The predicate of the issue description, or None if all colors of the texture are mapped
+    """
+    try:
+        colors = texture_colors.TEXTURES.get(path)
+    except FileNotFoundError:
+        return "does not exist."
+    except texture_colors.DECODE_ERRORS as e:
+        return f"cannot be decoded: {e}"
+
+    unmapped = np.flatnonzero(~np.isin(colors.colors, mapped_colors))
+    if len(unmapped) == 0:
+        return None
+    return (
+        f"has {len(unmapped)} color(s) without material in the material mapping, covering "
+        f"{int(colors.counts[unmapped].sum())} of {int(colors.counts.sum())} pixels: "
+        f"{describe_unmapped_colors(colors, unmapped)}."
+    )
+
+
+def check_textures(
+    checker_data: models.CheckerData,
+    mapped_colors: np.ndarray,
+    textures: List[Tuple[int, str, str, str]],
+) -> None:
+    """
+    Report the assignment textures with colors that the material mapping does not contain.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        mapped_colors: Packed colors of the material mapping
+        textures: Row index, material name, URI and absolute path of each assigned texture
+    """
+    # Assets assign few textures to many materials, so each path is looked at once
+    problems: Dict[str, Optional[str]] = {}
+    for index, material, uri, path in textures:
+        if path not in problems:
+            problems[path] = find_unmapped_colors(path, mapped_colors)
+        if problems[path] is None:
+            continue
+
+        location = utils.get_document(checker_data).find_location(
+            [TEXTURE_ASSIGNMENT_KEY, index, TEXTURE_URI_COLUMN]
+        )
+        add_issue(
+            checker_data,
+            f"The texture {uri} assigned to {material} {problems[path]}",
+            location,
+        )
+
+
+def get_dependency_fingerprint(checker_data: models.CheckerData) -> list:
+    """
+    State of the material mapping and the assignment textures, which the result depends on besides the input file.
+
+    Args:
+        checker_data: Checker data object of the run
+
+    Returns:
+        Path, modification time and size of the mapping and each distinct texture, None for missing files
+    """
+    if not utils.get_document(checker_data).is_valid_json:
+        return []
+
+    paths = list(dict.fromkeys(path for *_, path in collect_textures(checker_data)))
+    mapping_path = get_mapping_path(checker_data)
+    if paths and mapping_path:
+        paths.insert(0, mapping_path)
+
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append([path, stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            fingerprint.append([path, None])
+    return fingerprint
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements a rule to check that the colors of assignment textures are mapped to materials
+
+    Args:
+        checker_data: Checker data object used to raise issues
+    """
+    logging.info(f"Executing {CHECKER_ID}")
+
+    textures = collect_textures(checker_data)
+    if not textures:
+        skip(
+            checker_data, "The file has no material texture assignment. Skip the check."
+        )
+        return
+
+    if not texture_colors.is_available():
+        skip(
+            checker_data, "Pillow is not installed to decode textures. Skip the check."
+        )
+        return
+
+    check_textures(
+        checker_data, get_mapped_colors(get_mapping_path(checker_data)), textures
+    )
@@ -6,14 +6,11 @@
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import logging
-import json
 import os
 
-from pathlib import Path
-
 from qc_baselib import IssueSeverity
 from qc_openmaterial3d import constants
-from qc_openmaterial3d.checks import models, utils
+from qc_openmaterial3d.checks import models, uri_resolver, utils
 
 CHECKER_ID = "check_asam.net:xom:1.0.0:general.uris_exist"
 CHECKER_DESCRIPTION = "If a URI property to other file is set in a JSON file, the file linked in that property shall exist."
@@ -21,80 +18,114 @@ CHECKER_PRECONDITIONS = {}
 RULE_UID = "asam.net:xom:1.0.0:general.uris_exist"
 
 
-def add_issue(checker_data: models.CheckerData, input_json_path: str, json_field_path: list, uri_path: str, key: str):
+def add_issue(
+    checker_data: models.CheckerData, json_field_path: list, uri_path: str, key: str
+):
+    """
+    Add issue to checker_data.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        json_field_path: List of field hierarchy up to the uri, e.g. ['materialProperties', 'brdfUris', 1] used to get issue locations.
+        uri_path: Content of the uri field
+        key: Name of the field
     """
-        Add issue to checker_data.
-
-        Args:
-            input_json_path: Absolute path of the input json needed to get issue locations
-            checker_data: Checker data object used to raise issues
-            json_field_path: List of field hierarchy, e.g. ['metadata', 'fieldToFind'] used to get issue locations. Leave empty when initially calling this function.
-            uri_path: Content of the uri field
-            key: Name of the field
-        """
     issue_id = checker_data.result.register_issue(
         checker_bundle_name=constants.BUNDLE_NAME,
         checker_id=CHECKER_ID,
         description=f"The URI {uri_path} set in {key} does not exist.",
         level=IssueSeverity.ERROR,
-        rule_uid=RULE_UID
+        rule_uid=RULE_UID,
     )
-    current_json_field_path = json_field_path.copy()
-    current_json_field_path.append(key)
-    line = utils.find_property_line(input_json_path, current_json_field_path)
-    if line:
+    location = utils.get_document(checker_data).find_location(json_field_path)
+    if location:
         checker_data.result.add_file_location(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=CHECKER_ID,
             issue_id=issue_id,
-            row=line,
-            column=0,
+            row=location[0],
+            column=location[1],
             description="File does not exist.",
         )
 
-def check_uris_recursively(input_json_path: str, input_json: dict, checker_data: models.CheckerData, json_field_path: list):
+
+def collect_uris_recursively(input_json: dict, json_field_path: list, uris: list):
     """
-    Recursively check all properties ending in 'Uri' or 'Uris' and verify if the file exists.
+    Recursively collect all properties ending in 'Uri' or 'Uris'.
 
     Args:
-        input_json_path: Absolute path of the input json needed to get issue locations
         input_json: The JSON data for the current recursion
-        checker_data: Checker data object used to raise issues
         json_field_path: List of field hierarchy, e.g. ['metadata', 'fieldToFind'] used to get issue locations. Leave empty when initially calling this function.
+        uris: Receives (json field path, uri, key) for each uri in document order
     """
-    # Get the absolute directory of the JSON file
-    base_dir = os.path.dirname(os.path.abspath(input_json_path))
-
     for key, uri_field in input_json.items():
-        if key.endswith("Uri") and isinstance(uri_field, str):  # Ensure it's a string path
-            uri_path = uri_field
-            absolute_path = os.path.join(base_dir, uri_path)
-
-            if not os.path.exists(absolute_path):
-                add_issue(checker_data, input_json_path, json_field_path, uri_path, key)
-        elif key.endswith("Uris") and isinstance(uri_field, list):  # Ensure it's a string path
-            for uri_path in uri_field:
+        if key.endswith("Uri") and isinstance(
+            uri_field, str
+        ):  # Ensure it's a string path
+            uris.append((json_field_path + [key], uri_field, key))
+        elif key.endswith("Uris") and isinstance(
+            uri_field, list
+        ):  # Ensure it's a string path
+            for index, uri_path in enumerate(uri_field):
                 if isinstance(uri_path, str):
-                    absolute_path = os.path.join(base_dir, uri_path)
-                    if not os.path.exists(absolute_path):
-                        add_issue(checker_data, input_json_path, json_field_path, uri_path, key)
+                    uris.append((json_field_path + [key, index], uri_path, key))
 
         # Recur for nested dictionaries
         if isinstance(uri_field, dict):
-            current_json_field_path = json_field_path.copy()
-            current_json_field_path.append(key)
-            check_uris_recursively(input_json_path, uri_field, checker_data, current_json_field_path)
+            collect_uris_recursively(uri_field, json_field_path + [key], uris)
 
-def check_uris(input_json_path: str, input_json: dict, checker_data: models.CheckerData):
+
+def check_uris(
+    input_json_path: str, input_json: dict, checker_data: models.CheckerData
+):
     """
-        Call recursive check for all properties ending in 'Uri' or 'Uris' and verify if the file exists.
+        Check all properties ending in 'Uri' or 'Uris' and verify if the file exists.
+
+        The existence of all referenced files is checked at once, so that repeated uris are
+        checked once and the checks run concurrently.
 
     Args:
-        input_json_path: Absolute path of the input json needed to get issue locations
-        input_json: The JSON data for the current recursion
+        input_json_path: Absolute path of the input json needed to resolve relative uris
+        input_json: The JSON data of the input file
         checker_data: Checker data object used to raise issues
     """
-    check_uris_recursively(input_json_path, input_json, checker_data, list())
+    # Get the absolute directory of the JSON file
+    base_dir = os.path.dirname(os.path.abspath(input_json_path))
+
+    uris = []
+    collect_uris_recursively(input_json, list(), uris)
+
+    absolute_paths = [os.path.join(base_dir, uri_path) for _, uri_path, _ in uris]
+    existing = uri_resolver.RESOLVER.exists_many(absolute_paths)
+
+    for (json_field_path, uri_path, key), absolute_path in zip(uris, absolute_paths):
+        if not existing[absolute_path]:
+            add_issue(checker_data, json_field_path, uri_path, key)
+
+
+def get_dependency_fingerprint(checker_data: models.CheckerData) -> list:
+    """
+    Existence of each file linked by the input file, which the result depends on besides the input file.
+
+    Args:
+        checker_data: Checker data object of the run
+
+    Returns:
+        Sorted [absolute path, exists] pairs
+    """
+    document = utils.get_document(checker_data)
+    if not document.is_valid_json:
+        return []
+
+    uris = []
+    collect_uris_recursively(document.data, list(), uris)
+
+    base_dir = os.path.dirname(os.path.abspath(checker_data.json_file_path))
+    existing = uri_resolver.RESOLVER.exists_many(
+        os.path.join(base_dir, uri_path) for _, uri_path, _ in uris
+    )
+    return sorted([path, exists] for path, exists in existing.items())
+
 
 def check_rule(checker_data: models.CheckerData) -> None:
     """
@@ -105,15 +136,15 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info(f"Executing {CHECKER_ID}")
 
-    # Check the precondition (whether the input file exists).
-    file_path = Path(checker_data.json_file_path)
+    document = utils.get_document(checker_data)
 
-    if file_path.exists():
-        # Load file
-        with open(file_path, "r") as file:
-            input_file = json.load(file)
+    # Check the precondition (whether the input file exists).
+    if document.exists:
+        # The checker has no precondition on the JSON validity, so report parse errors as checker errors
+        if document.parse_error is not None:
+            raise document.parse_error
 
-        check_uris(checker_data.json_file_path, input_file, checker_data)
+        check_uris(checker_data.json_file_path, document.data, checker_data)
 
     else:
         checker_data.result.register_issue(
@@ -122,4 +153,4 @@ def check_rule(checker_data: models.CheckerData) -> None:
             description="The input file does not exist.",
             level=IssueSeverity.ERROR,
             rule_uid=RULE_UID,
-        )
\ No newline at end of file
+        )
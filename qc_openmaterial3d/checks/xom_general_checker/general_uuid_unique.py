@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+import os
+
+from typing import List, Optional, Tuple
+
+from qc_baselib import IssueSeverity, StatusType
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import models, utils, uuid_index
+
+from qc_openmaterial3d.checks.xom_general_checker import general_valid_schema
+
+CHECKER_ID = "check_asam.net:xom:1.0.0:general.uuid_unique"
+CHECKER_DESCRIPTION = (
+    "A uuid must identify one material, asset or mapping: no other file may claim the same uuid and version, "
+    "and files of other names may not use the uuid."
+)
+CHECKER_PRECONDITIONS = {general_valid_schema.CHECKER_ID}
+RULE_UID = "asam.net:xom:1.0.0:general.uuid_unique"
+
+
+def add_issue(
+    checker_data: models.CheckerData,
+    description: str,
+    location: Optional[Tuple[int, int]],
+) -> None:
+    """
+    Add issue to checker_data.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        description: Description of the issue
+        location: 1-based (line, column) of the issue, if known
+    """
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description=description,
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+    if location:
+        checker_data.result.add_file_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            row=location[0],
+            column=location[1],
+            description=description,
+        )
+
+
+def find_other_files(checker_data: models.CheckerData) -> List[uuid_index.IndexEntry]:
+    """Indexed files sharing the uuid of the input file, empty if no index is open."""
+    identity = uuid_index.get_identity(utils.get_document(checker_data).data)
+    if not uuid_index.INDEX.is_open or identity is None:
+        return []
+    return uuid_index.INDEX.find_others(checker_data.json_file_path, identity[0])
+
+
+def get_dependency_fingerprint(checker_data: models.CheckerData) -> list:
+    """
+    Indexed files sharing the uuid of the input file, which the result depends on besides the input file.
+
+    Args:
+        checker_data: Checker data object of the run
+
+    Returns:
+        Path, version, name, modification time and size of each of the files
+    """
+    return [
+        [entry.path, entry.version, entry.name, *entry.stamp]
+        for entry in find_other_files(checker_data)
+    ]
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements a rule to check that no other indexed file claims the uuid of the input file
+
+    Batch and watch runs index all input files before checking them, so the collision
+    is reported for every file claiming the uuid, independent of the order of the files.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+    """
+    logging.info(f"Executing {CHECKER_ID}")
+
+    if not uuid_index.INDEX.is_open:
+        checker_data.result.set_checker_status(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            status=StatusType.SKIPPED,
+        )
+        checker_data.result.add_checker_summary(
+            constants.BUNDLE_NAME,
+            CHECKER_ID,
+            "No uuid index is open, which batch and watch runs use. Skip the check.",
+        )
+        return
+
+    document = utils.get_document(checker_data)
+    uuid, version, name = uuid_index.get_identity(document.data)
+    base_dir = os.path.dirname(os.path.abspath(checker_data.json_file_path))
+
+    for entry in find_other_files(checker_data):
+        file_name = utils.get_display_path(entry.path, base_dir)
+        if entry.version == version:
+            description = f"The uuid {uuid} with version {version} is also claimed by {file_name}."
+        elif entry.name != name:
+            description = (
+                f"The uuid {uuid} is also used by {file_name} for a different file named "
+                f"{entry.name!r} (version {entry.version})."
+            )
+        else:
+            # Another version of the same material, asset or mapping
+            continue
+        add_issue(
+            checker_data, description, document.find_location(["metadata", "uuid"])
+        )
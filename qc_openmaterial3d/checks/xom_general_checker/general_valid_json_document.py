@@ -8,33 +8,28 @@
 import logging
 import json
 
-from pathlib import Path
-
 from qc_baselib import IssueSeverity
 from qc_openmaterial3d import constants
-from qc_openmaterial3d.checks import models
+from qc_openmaterial3d.checks import models, utils
 
 CHECKER_ID = "check_asam.net:xom:1.0.0:general.valid_json_document"
 CHECKER_DESCRIPTION = "The given file to check must be a valid JSON document."
 CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:xom:1.0.0:general.valid_json_document"
+# Runs before the OpenMATERIAL 3D version of the input file is known
+REQUIRED_DEFINITION_SETTING = False
 
 
-def is_valid_json(file_path: str) -> bool:
-    """Checks if a file contains valid JSON.
+def is_valid_json(document: models.JsonDocument) -> bool:
+    """Checks if a document contains valid JSON.
 
     Args:
-        file_path: Path to the JSON file.
+        document: Parsed input file.
 
     Returns:
         True if the file contains valid JSON, False otherwise.
     """
-    try:
-        with open(file_path, "r") as file:
-            json.load(file)
-        return True
-    except json.JSONDecodeError:
-        return False
+    return document.is_valid_json
 
 
 def check_rule(checker_data: models.CheckerData) -> None:
@@ -46,20 +41,32 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info(f"Executing {CHECKER_ID}")
 
+    document = utils.get_document(checker_data)
+
     # Check the precondition (whether the input file exists).
-    file_path = Path(checker_data.json_file_path)
-    if file_path.exists():
+    if document.exists:
         # Execute the check logic as the precondition holds
-        is_valid = is_valid_json(checker_data.json_file_path)
+        is_valid = is_valid_json(document)
 
         if not is_valid:
-            checker_data.result.register_issue(
+            issue_id = checker_data.result.register_issue(
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=CHECKER_ID,
                 description="The input file is not a valid json file.",
                 level=IssueSeverity.ERROR,
                 rule_uid=RULE_UID,
             )
+
+            parse_error = document.parse_error
+            if isinstance(parse_error, json.JSONDecodeError):
+                checker_data.result.add_file_location(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=CHECKER_ID,
+                    issue_id=issue_id,
+                    row=parse_error.lineno,
+                    column=parse_error.colno,
+                    description=parse_error.msg,
+                )
     else:
         checker_data.result.register_issue(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -67,4 +74,4 @@ def check_rule(checker_data: models.CheckerData) -> None:
             description="The input file does not exist.",
             level=IssueSeverity.ERROR,
             rule_uid=RULE_UID,
-        )
\ No newline at end of file
+        )
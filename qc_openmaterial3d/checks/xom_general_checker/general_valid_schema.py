@@ -5,17 +5,20 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import importlib.resources
-from jsonschema import Draft7Validator
+import collections
+import heapq
+import itertools
 import logging
-import json
-import os
 
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jsonschema import ValidationError
 from qc_baselib import IssueSeverity
 
 from qc_openmaterial3d import constants
-from qc_openmaterial3d.schemas import schema_files
-from qc_openmaterial3d.checks import utils, models
+from qc_openmaterial3d.schemas import schema_files, validator_registry
+from qc_openmaterial3d.checks import json_stream, lookup_table, utils, models
 
 from qc_openmaterial3d.checks.xom_general_checker import (
     general_valid_json_document,
@@ -23,49 +26,46 @@ from qc_openmaterial3d.checks.xom_general_checker import (
 )
 
 CHECKER_ID = "check_asam.net:xom:1.0.0:general.valid_schema"
-CHECKER_DESCRIPTION = "Input JSON file must be valid according to the corresponding schema."
+CHECKER_DESCRIPTION = (
+    "Input JSON file must be valid according to the corresponding schema."
+)
 CHECKER_PRECONDITIONS = {
     general_valid_json_document.CHECKER_ID,
     general_version_is_defined.CHECKER_ID,
 }
 RULE_UID = "asam.net:xom:1.0.0:general.valid_schema"
 
+# Checker parameters and their defaults, a maxIssues of 0 reports all errors
+MAX_ISSUES = ("maxIssues", 0)
+AGGREGATE_ISSUES = ("aggregateIssues", False)
 
-def get_schema_file(version: str, file_path: str) -> str:
-    """Retrieves the schema file corresponding to the given file path and version.
+# Locations listed per aggregated issue
+MAX_SAMPLE_LOCATIONS = 5
 
-    Args:
-        file_path: Path to the file.
-        version: Version string to construct the schema key.
+# Errors registered as issues at once, so that the errors of an error-dense file are
+# not held in memory as a whole
+ERRORS_PER_CHUNK = 256
 
-    Returns:
-        The schema file path if found, otherwise None.
+# A schema violation and the location of its row in a streamed table, if known
+LocatedError = Tuple[Optional[lookup_table.Location], ValidationError]
 
-    Raises:
-        ValueError: If the file extension is not supported.
-    """
-    # Extract the file name and extension
-    file_name, file_extension = os.path.splitext(file_path)
-    file_extension = file_extension.lower()  # Ensure extension is lowercase
 
-    # Supported extensions
-    supported_extensions = [".xoma", ".xomm", ".xomp", ".xompt"]
+@dataclass
+class ErrorGroup:
+    """Errors that violate the same keyword of the same subschema, e.g. the minimum of a column.
 
-    schema_key = ""
+    Attributes:
+        samples: The first MAX_SAMPLE_LOCATIONS errors, at which the issue is located.
+        count: Number of errors of the group.
+    """
 
-    if file_extension in supported_extensions:
-        if file_extension == ".xompt":
-            # Handle .xompt case with additional string from file name
-            previous_string = file_name.split('_')[-1]
-            combined_extension = f"{previous_string}.xompt"
-            schema_key = f"{version}:{combined_extension}"
-        else:
-            # Handle other cases
-            schema_key = f"{version}:{file_extension[1:]}"  # Remove leading dot
-    else:
-        raise ValueError(f"Unsupported file extension: {file_extension}")
+    samples: List[LocatedError] = field(default_factory=list)
+    count: int = 0
 
-    return schema_files.SCHEMA_FILES.get(schema_key)
+    def add(self, located_error: LocatedError) -> None:
+        self.count += 1
+        if len(self.samples) < MAX_SAMPLE_LOCATIONS:
+            self.samples.append(located_error)
 
 
 def check_rule(checker_data: models.CheckerData) -> None:
@@ -77,38 +77,298 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info(f"Executing {CHECKER_ID}")
 
-    with open(checker_data.json_file_path, "r") as file:
-        data = json.load(file)
+    document = utils.get_document(checker_data)
+    schema_key = schema_files.get_schema_key(
+        checker_data.schema_version, checker_data.json_file_path
+    )
 
-    schema_version = checker_data.schema_version
-    schema_path = get_schema_file(schema_version, checker_data.json_file_path)
-    schema_file_path = str(
-        importlib.resources.files("qc_openmaterial3d.schemas").joinpath(schema_path)
+    max_errors = int(
+        utils.get_float_checker_param(checker_data, CHECKER_ID, *MAX_ISSUES)
+    )
+    aggregate = utils.get_bool_checker_param(
+        checker_data, CHECKER_ID, *AGGREGATE_ISSUES
     )
 
-    with open(schema_file_path, "r") as file:
-        schema_file = json.load(file)
+    located_errors = iter_schema_errors(document, schema_key)
+    if max_errors > 0:
+        # One error more than reported tells whether validation stopped early
+        located_errors = itertools.islice(located_errors, max_errors + 1)
 
-    validator = Draft7Validator(schema_file)
-    errors = sorted(validator.iter_errors(data), key=lambda e: e.path)
+    # Row locators of the tables validated from a sidecar array, by table path
+    locators: Dict[lookup_table.TablePath, lookup_table.RowLocator] = {}
+    groups: Dict[Tuple, ErrorGroup] = {}
+    error_count = 0
+    stopped_early = False
+    while chunk := list(itertools.islice(located_errors, ERRORS_PER_CHUNK)):
+        if 0 < max_errors < error_count + len(chunk):
+            chunk = chunk[: max_errors - error_count]
+            stopped_early = True
+        error_count += len(chunk)
 
-    for error in errors:
-        issue_id = checker_data.result.register_issue(
+        if aggregate:
+            for located_error in chunk:
+                error = located_error[1]
+                groups.setdefault(
+                    (error.validator, tuple(error.absolute_schema_path)), ErrorGroup()
+                ).add(located_error)
+        else:
+            add_issues(
+                checker_data,
+                document,
+                [ErrorGroup([located_error], 1) for located_error in chunk],
+                locators,
+            )
+    if aggregate:
+        add_issues(checker_data, document, list(groups.values()), locators)
+
+    if stopped_early:
+        checker_data.result.register_issue(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=CHECKER_ID,
-            description=f"Error in {error.json_path[2:]}: {error.message}",
-            level=IssueSeverity.ERROR,
+            description=(
+                f"Schema validation stopped after {max_errors} errors, "
+                "further errors are not reported."
+            ),
+            level=IssueSeverity.INFORMATION,
             rule_uid=RULE_UID,
         )
 
-        error_path = list(error.absolute_path)
-        line = utils.find_property_line(checker_data.json_file_path, error_path)
-        if line:
+
+def add_issues(
+    checker_data: models.CheckerData,
+    document: models.JsonDocument,
+    groups: List[ErrorGroup],
+    locators: Dict[lookup_table.TablePath, lookup_table.RowLocator],
+) -> None:
+    """Registers one issue per error group, after locating the rows of their samples.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        document: Validated document, used to locate the errors.
+        groups: Error groups, whose rows follow the rows of earlier calls.
+        locators: Row locators of earlier calls, by table path.
+    """
+    locate_array_rows(document, groups, locators)
+    for group in groups:
+        add_issue(checker_data, document, group)
+
+
+def locate_array_rows(
+    document: models.JsonDocument,
+    groups: List[ErrorGroup],
+    locators: Dict[lookup_table.TablePath, lookup_table.RowLocator],
+) -> None:
+    """Locates the samples of errors of tables validated from a sidecar array.
+
+    The rows are read from the JSON source up to the last reported row, once for
+    all calls sharing the locators.
+
+    Args:
+        document: Validated document.
+        groups: Error groups, whose samples receive the location of their row.
+        locators: Row locators, created on first use, by table path.
+    """
+    for table_path in document.table_arrays:
+        # Group and position of each sample in the table, by row index
+        samples_by_row: Dict[int, List[Tuple[ErrorGroup, int]]] = {}
+        for group in groups:
+            for position, (location, error) in enumerate(group.samples):
+                path = tuple(error.absolute_path)
+                if (
+                    location is None
+                    and len(path) > len(table_path)
+                    and path[: len(table_path)] == table_path
+                ):
+                    samples_by_row.setdefault(path[len(table_path)], []).append(
+                        (group, position)
+                    )
+
+        if not samples_by_row:
+            continue
+        if table_path not in locators:
+            locators[table_path] = lookup_table.RowLocator(document, table_path)
+        locations = locators[table_path].locate(samples_by_row)
+        for index, location in locations.items():
+            for group, position in samples_by_row[index]:
+                group.samples[position] = (location, group.samples[position][1])
+
+
+def add_issue(
+    checker_data: models.CheckerData,
+    document: models.JsonDocument,
+    group: ErrorGroup,
+) -> None:
+    """Registers one issue for a group of errors, located at its samples.
+
+    Args:
+        checker_data: Checker data object used to raise issues
+        document: Validated document, used to locate the errors.
+        group: Errors of the same group.
+    """
+    error = group.samples[0][1]
+    description = f"Error in {error.json_path[2:]}: {error.message}"
+    if group.count > 1:
+        schema_path = "/".join(str(key) for key in error.absolute_schema_path)
+        description += (
+            f" (and {group.count - 1} more violations of '{error.validator}' "
+            f"at schema path {schema_path})"
+        )
+
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description=description,
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+
+    for location, error in group.samples:
+        location = location or document.find_location(error.absolute_path)
+        if location:
             checker_data.result.add_file_location(
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=CHECKER_ID,
                 issue_id=issue_id,
-                row=line,
-                column=0,
+                row=location[0],
+                column=location[1],
                 description=error.message,
             )
+
+
+def collect_schema_errors(
+    document: models.JsonDocument,
+    schema_key: str,
+    max_errors: Optional[int] = None,
+) -> List[ValidationError]:
+    """Validates a parsed document against its schema.
+
+    Args:
+        document: Parsed or streamed document.
+        schema_key: Key of the schema of the document.
+        max_errors: Maximum number of errors to collect, all errors if None.
+
+    Returns:
+        Schema violations sorted by their path, see iter_schema_errors.
+    """
+    return [
+        error
+        for _, error in itertools.islice(
+            iter_schema_errors(document, schema_key), max_errors
+        )
+    ]
+
+
+def iter_schema_errors(
+    document: models.JsonDocument, schema_key: str
+) -> Iterator[LocatedError]:
+    """Validates a parsed document against its schema while the errors are consumed.
+
+    Lookup tables are split off and validated separately with vectorized range checks.
+    Their rows are validated in order, so the errors are sorted by merging the errors
+    of the tables with those of the rest of the document.
+
+    Args:
+        document: Parsed or streamed document.
+        schema_key: Key of the schema of the document.
+
+    Yields:
+        Schema violations sorted by their path, with the row location of errors of
+        streamed tables.
+    """
+    validator = validator_registry.VALIDATORS.get_validator(schema_key)
+
+    table_path = schema_files.LOOKUP_TABLE_PATHS.get(schema_key)
+    data, tables = lookup_table.split_tables(
+        document.data, [table_path] if table_path else []
+    )
+
+    # The tree without its tables is small, so its errors are sorted at once
+    error_iterators: List[Iterable[LocatedError]] = [
+        [
+            (None, error)
+            for error in sorted(validator.iter_errors(data), key=get_error_path)
+        ]
+    ]
+    for table_path, rows in tables.items():
+        row_validator = validator_registry.VALIDATORS.get_row_validator(
+            schema_key, table_path
+        )
+        error_iterators.append(
+            sort_row_errors(
+                (index, (None, error))
+                for index, error in lookup_table.iter_row_errors(
+                    rows, row_validator, table_path
+                )
+            )
+        )
+    for table_path in document.streamed_tables:
+        if table_path in document.table_arrays:
+            row_validator = validator_registry.VALIDATORS.get_row_validator(
+                schema_key, table_path
+            )
+            error_iterators.append(
+                sort_row_errors(
+                    (index, (None, error))
+                    for index, error in lookup_table.iter_array_row_errors(
+                        document.table_arrays[table_path], row_validator, table_path
+                    )
+                )
+            )
+        else:
+            error_iterators.append(
+                sort_row_errors(
+                    iter_streamed_row_errors(document, schema_key, table_path)
+                )
+            )
+
+    # Merged lazily, so validation ends with the last consumed error
+    return heapq.merge(
+        *error_iterators, key=lambda located_error: get_error_path(located_error[1])
+    )
+
+
+def get_error_path(error: ValidationError) -> collections.deque:
+    return error.path
+
+
+def sort_row_errors(
+    row_errors: Iterator[Tuple[int, LocatedError]]
+) -> Iterator[LocatedError]:
+    """Sorts the errors of each table row by their path, given the errors row by row in row order."""
+    for _, errors in itertools.groupby(row_errors, key=lambda row_error: row_error[0]):
+        yield from sorted(
+            (located_error for _, located_error in errors),
+            key=lambda located_error: get_error_path(located_error[1]),
+        )
+
+
+def iter_streamed_row_errors(
+    document: models.JsonDocument,
+    schema_key: str,
+    table_path: Tuple[str, ...],
+) -> Iterator[Tuple[int, LocatedError]]:
+    """Validates the rows of a streamed lookup table in chunks.
+
+    Errors are located at the start of their row.
+
+    Args:
+        document: Streamed document.
+        schema_key: Key of the schema of the document.
+        table_path: JSON path of the streamed table.
+
+    Yields:
+        Row index and the schema violation with its row location.
+    """
+    row_validator = validator_registry.VALIDATORS.get_row_validator(
+        schema_key, table_path
+    )
+    rows = json_stream.iter_table_rows(document.file_path, table_path)
+
+    first_index = 0
+    for chunk_rows, locations in lookup_table.iter_row_chunks(rows):
+        for position, error in lookup_table.iter_row_errors(
+            chunk_rows, row_validator, table_path, first_index
+        ):
+            yield first_index + position, (locations[position], error)
+
+        first_index += len(chunk_rows)
@@ -6,23 +6,24 @@
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import logging
-import json
 
 from qc_baselib import IssueSeverity
 
 from qc_openmaterial3d import constants
-from qc_openmaterial3d.checks import models
+from qc_openmaterial3d.checks import models, utils
 
 from qc_openmaterial3d.checks.xom_general_checker import (
     general_valid_json_document,
 )
 
 CHECKER_ID = "check_asam.net:xom:1.0.0:general.version_is_defined"
-CHECKER_DESCRIPTION = "The metadata of the file must contain an openMaterial3dVersion field."
-CHECKER_PRECONDITIONS = {
-    general_valid_json_document.CHECKER_ID
-}
+CHECKER_DESCRIPTION = (
+    "The metadata of the file must contain an openMaterial3dVersion field."
+)
+CHECKER_PRECONDITIONS = {general_valid_json_document.CHECKER_ID}
 RULE_UID = "asam.net:xom:1.0.0:general.version_is_defined"
+# Runs before the OpenMATERIAL 3D version of the input file is known
+REQUIRED_DEFINITION_SETTING = False
 
 
 def check_rule(checker_data: models.CheckerData) -> None:
@@ -34,8 +35,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info(f"Executing {CHECKER_ID}")
 
-    with open(checker_data.json_file_path, "r") as file:
-        data = json.load(file)
+    data = utils.get_document(checker_data).data
 
     # Check if "metadata.openMaterial3dVersion" exists
     if "metadata" not in data or "openMaterial3dVersion" not in data["metadata"]:
@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# Command line entry point. It only imports the standard library, so that --help and
+# runs forwarded to a check server start quickly. The checks are imported by main.run.
+import argparse
+import importlib
+import logging
+import os
+
+from qc_openmaterial3d import constants, daemon
+
+
+def args_entrypoint() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ASAM OpenMATERIAL 3D Checker Bundle",
+        description="This is a collection of scripts for checking validity of OpenMATERIAL 3D (.xoma, .xomm, .xomp, .xompt) files.",
+    )
+
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("-c", "--config_path")
+    group.add_argument(
+        "--serve",
+        nargs="?",
+        const=daemon.DEFAULT_ADDRESS,
+        metavar="HOST:PORT",
+        help=f"Serve check requests on a local HTTP address (default {daemon.DEFAULT_ADDRESS}) "
+        f"with validators kept in memory. Runs started with {daemon.SERVER_ENVIRONMENT_VARIABLE} "
+        "set to that address are forwarded to the server.",
+    )
+    group.add_argument(
+        "--write_table_sidecars",
+        nargs="+",
+        metavar="FILE",
+        help="Convert the lookup table of each file to an array sidecar next to it. Later checks "
+        "of an unchanged file validate the memory-mapped array instead of parsing the rows.",
+    )
+
+    parser.add_argument("-g", "--generate_markdown", action="store_true")
+
+    batch_group = parser.add_mutually_exclusive_group()
+    batch_group.add_argument(
+        "--input_dir",
+        help="Check all OpenMATERIAL 3D files found in this directory instead of the configured InputFile.",
+    )
+    batch_group.add_argument(
+        "--file_list",
+        help="Check all files listed in this text file (one path per line) instead of the configured InputFile.",
+    )
+    batch_group.add_argument(
+        "--watch",
+        help="Check all OpenMATERIAL 3D files found in this directory and check them again whenever they change.",
+    )
+    parser.add_argument(
+        "--output_dir",
+        help="Directory for the per-file reports of a batch run. Defaults to the resultFile path without extension.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes checking the files of a batch run in parallel.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap reading the next files and writing reports with checking in a batch run with one job.",
+    )
+    parser.add_argument(
+        "--poll_interval",
+        type=float,
+        default=constants.WATCH_POLL_INTERVAL,
+        help="Seconds between two scans of the watched directory.",
+    )
+
+    parser.add_argument(
+        "--stream_results",
+        action="store_true",
+        help="Write the issues of each checker to the report as soon as the checkers before it "
+        "finished instead of collecting all issues of a file in memory first. For single-file "
+        "and batch runs with very many issues.",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Write the wall time, CPU time, peak memory, issues and location lookups of parsing "
+        "and of each checker to this JSON file. Only for single-file runs, whose checkers then "
+        "run one after another.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Profile the run with cProfile, write the statistics to this file for pstats and "
+        "log the slowest functions. Checkers then run one after another.",
+    )
+
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--cache_dir",
+        help="Directory of the result cache. Defaults to qc_openmaterial3d in the user cache directory.",
+    )
+    cache_group.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Run all checkers instead of replaying cached results of unchanged files.",
+    )
+
+    parser.add_argument(
+        "--uuid_index",
+        metavar="PATH",
+        help="SQLite index of the uuid and version of the checked files, updated by the run and used "
+        "to find other files claiming the same uuid. Batch and watch runs use "
+        "uuid_index.sqlite in the cache directory unless --no_cache is given.",
+    )
+
+    args = parser.parse_args()
+    if args.metrics is not None and (
+        args.serve is not None
+        or args.write_table_sidecars is not None
+        or args.input_dir is not None
+        or args.file_list is not None
+        or args.watch is not None
+    ):
+        parser.error("--metrics is only supported for single-file runs")
+    if args.stream_results and (args.serve is not None or args.watch is not None):
+        parser.error(
+            "--stream_results is only supported for single-file and batch runs"
+        )
+
+    return args
+
+
+def main():
+    args = args_entrypoint()
+
+    server_address = os.environ.get(daemon.SERVER_ENVIRONMENT_VARIABLE)
+    # The server uses its own cache and no uuid index, so runs choosing them are checked locally
+    can_forward = (
+        args.config_path is not None
+        and args.input_dir is None
+        and args.file_list is None
+        and args.watch is None
+        and args.metrics is None
+        and args.profile is None
+        and not args.stream_results
+        and not args.no_cache
+        and args.cache_dir is None
+        and args.uuid_index is None
+    )
+    if server_address and can_forward:
+        logging.basicConfig(format="%(asctime)s - %(message)s", level=logging.INFO)
+        try:
+            daemon.request_check(
+                server_address, args.config_path, args.generate_markdown
+            )
+            logging.info(f"Checked by server {server_address}")
+            return
+        except OSError as e:
+            logging.warning(
+                f"Cannot use server {server_address}, checking locally: {e}"
+            )
+
+    importlib.import_module("qc_openmaterial3d.main").run(args)
+
+
+if __name__ == "__main__":
+    main()
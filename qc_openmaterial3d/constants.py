@@ -7,3 +7,9 @@
 
 BUNDLE_NAME = "xomBundle"
 BUNDLE_VERSION = "v1.0.0-rc.1"
+
+# Input files above this size are parsed without materializing their lookup tables
+STREAMING_THRESHOLD = 64 * 1024 * 1024
+
+# Seconds between two scans of the directory tree in watch mode
+WATCH_POLL_INTERVAL = 0.25
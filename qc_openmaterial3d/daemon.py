@@ -0,0 +1,393 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# The client side of this module only uses the standard library, the checker modules
+# are imported by the server.
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import secrets
+import socket
+import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from qc_openmaterial3d import result_cache
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+# Address of a running server, e.g. "127.0.0.1:8765". If set, runs are forwarded to it.
+SERVER_ENVIRONMENT_VARIABLE = "QC_OPENMATERIAL3D_SERVER"
+
+REQUEST_TIMEOUT = 600
+
+# Token files of the servers of a user, next to the result cache of result_cache.get_default_cache_dir
+TOKEN_DIR_NAME = "qc_openmaterial3d"
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Splits "host:port" into host and port.
+
+    Raises:
+        ValueError: If the port is missing or not a number.
+    """
+    host, separator, port = address.rpartition(":")
+    if not separator or not port.isdigit():
+        raise ValueError(f"Invalid server address {address}, expected HOST:PORT")
+    return host or "127.0.0.1", int(port)
+
+
+def is_loopback_host(host: str) -> bool:
+    """Whether all addresses of a host name or IP address are loopback addresses."""
+    if host.lower() == "localhost":
+        return True
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except OSError:
+        return False
+    return bool(addresses) and all(
+        _is_loopback_address(address.split("%")[0]) for address in addresses
+    )
+
+
+def _is_loopback_address(address: str) -> bool:
+    try:
+        return ipaddress.ip_address(address).is_loopback
+    except ValueError:
+        return False
+
+
+def get_token_file_path(port: int) -> str:
+    """Path of the file holding the token of the server of the user listening on port."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, TOKEN_DIR_NAME, f"server-{port}.token")
+
+
+def write_token_file(port: int, token: str) -> str:
+    """Writes the token of a server to a file only its user can read.
+
+    Returns:
+        The path of the token file.
+    """
+    token_file_path = get_token_file_path(port)
+    os.makedirs(os.path.dirname(token_file_path), mode=0o700, exist_ok=True)
+    # Created anew, an existing file of a stopped server may have another mode
+    if os.path.exists(token_file_path):
+        os.remove(token_file_path)
+    fd = os.open(token_file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        file.write(token)
+    return token_file_path
+
+
+def read_token_file(port: int) -> str:
+    """Reads the token of the server of the user listening on port.
+
+    Raises:
+        OSError: If no server of the user wrote a token for port.
+    """
+    with open(get_token_file_path(port), "r", encoding="utf-8") as file:
+        return file.read().strip()
+
+
+def check_writable(file_path: str) -> None:
+    """Raises PermissionError unless the user may create or replace the file."""
+    if os.path.exists(file_path):
+        writable = os.access(file_path, os.W_OK)
+    else:
+        writable = os.access(os.path.dirname(file_path), os.W_OK | os.X_OK)
+    if not writable:
+        raise PermissionError(f"Cannot write {file_path}")
+
+
+class CheckRequestHandler(BaseHTTPRequestHandler):
+    """Handles POST /check requests with a JSON body and answers with the result XML.
+
+    The body holds either "config_path" and "cwd", to run like
+    'qc_openmaterial -c <config_path>' started in cwd, or "file_name" and "content",
+    to check the given content with the default configuration.
+
+    Requests must have the Content-Type application/json, which browsers only send
+    cross-site after a preflight request that the server does not answer, and a
+    loopback Host header, which rules out pages of other sites resolving to the server.
+    They must also carry the token of the server as "Authorization: Bearer <token>",
+    which only the user of the server can read, see write_token_file.
+    """
+
+    server: "CheckServer"
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self.send_error(404)
+            return
+        self._send(200, "text/plain", b"ok")
+
+    def do_POST(self) -> None:
+        if self.path != "/check":
+            self.send_error(404)
+            return
+        if not self._has_loopback_host():
+            self._send(
+                403,
+                "text/plain",
+                b"Requests must address the server by a loopback host",
+            )
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._send(
+                415,
+                "text/plain",
+                b"Requests must have the Content-Type application/json",
+            )
+            return
+        if not self._has_token():
+            self._send(
+                401, "text/plain", b"Requests must carry the token of the server"
+            )
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            report = self.server.check(request)
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            self._send(400, "text/plain", str(e).encode("utf-8"))
+            return
+
+        self._send(200, "application/xml", report.encode("utf-8"))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+    def _has_loopback_host(self) -> bool:
+        # Not resolved, a name resolving to a loopback address may belong to another site
+        host = urllib.parse.urlsplit(f"//{self.headers.get('Host', '')}").hostname
+        return host is not None and (host == "localhost" or _is_loopback_address(host))
+
+    def _has_token(self) -> bool:
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        return scheme == "Bearer" and hmac.compare_digest(
+            token.encode("utf-8"), self.server.token.encode("utf-8")
+        )
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class CheckServer(HTTPServer):
+    """Local HTTP server running the checks with validators and caches kept warm between requests.
+
+    Requests are handled one at a time. The server reads and writes files with the
+    permissions of its user, so it only listens on loopback addresses and only answers
+    requests carrying a random token, which it writes to a file only its user can read.
+    The token file is removed by server_close.
+
+    Args:
+        address: Host and port to listen on. Port 0 picks a free port.
+        cache: Result cache used for all requests, or None to run all checkers.
+
+    Raises:
+        ValueError: If the host is not a loopback address.
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        cache: Optional["result_cache.ResultCache"] = None,
+    ) -> None:
+        from qc_openmaterial3d.schemas import validator_registry
+
+        if not is_loopback_host(address[0]):
+            raise ValueError(
+                f"The check server only listens on loopback addresses, {address[0]} is not one"
+            )
+
+        super().__init__(address, CheckRequestHandler)
+        self.cache = cache
+        self.token = secrets.token_urlsafe(32)
+        self.token_file_path = write_token_file(self.server_address[1], self.token)
+        validator_registry.VALIDATORS.warm_up()
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Left alone if another server took over the port and its token file
+        try:
+            if read_token_file(self.server_address[1]) == self.token:
+                os.remove(self.token_file_path)
+        except OSError:
+            pass
+
+    def check(self, request: Dict[str, Any]) -> str:
+        """Runs the checks of a request.
+
+        Args:
+            request: Decoded JSON body of a /check request.
+
+        Returns:
+            The result XML.
+        """
+        if "content" in request:
+            return self._check_content(request["file_name"], request["content"])
+        return self._check_config(
+            request["config_path"],
+            request["cwd"],
+            request.get("generate_markdown", False),
+        )
+
+    def _check_config(self, config_path: str, cwd: str, generate_markdown: bool) -> str:
+        from qc_baselib import Configuration
+
+        from qc_openmaterial3d import constants, main
+
+        if not os.path.isabs(cwd):
+            raise ValueError(f"The directory {cwd} of the request is not absolute")
+
+        config = Configuration()
+        config.load_from_file(xml_file_path=os.path.join(cwd, config_path))
+
+        # Resolve the paths of the configuration like a run started in cwd
+        input_file = config.get_config_param("InputFile")
+        config.set_config_param(name="InputFile", value=os.path.join(cwd, input_file))
+        result_file_path = os.path.join(
+            cwd,
+            config.get_checker_bundle_param(
+                checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
+            ),
+        )
+
+        markdown_file_path = os.path.join(cwd, "generated_checker_bundle_doc.md")
+        check_writable(result_file_path)
+        if generate_markdown:
+            check_writable(markdown_file_path)
+
+        result = main.check_input_file(config, self.cache)
+        result.write_to_file(result_file_path, generate_summary=True)
+        if generate_markdown:
+            result.write_markdown_doc(markdown_file_path)
+
+        with open(result_file_path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def _check_content(self, file_name: str, content: str) -> str:
+        from qc_baselib import Configuration
+
+        from qc_openmaterial3d import constants, main
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, os.path.basename(file_name))
+            with open(input_file, "w", encoding="utf-8") as file:
+                file.write(content)
+
+            config = Configuration()
+            config.set_config_param(name="InputFile", value=input_file)
+            config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+            result_file_path = os.path.join(temp_dir, "result.xqar")
+            main.check_input_file(config, self.cache).write_to_file(
+                result_file_path, generate_summary=True
+            )
+            with open(result_file_path, "r", encoding="utf-8") as file:
+                return file.read()
+
+
+def serve(
+    address: str = DEFAULT_ADDRESS, cache: Optional["result_cache.ResultCache"] = None
+) -> None:
+    """Serves check requests until interrupted.
+
+    Args:
+        address: "host:port" to listen on.
+        cache: Result cache used for all requests, or None to run all checkers.
+    """
+    with CheckServer(parse_address(address), cache) as server:
+        host, port = server.server_address[:2]
+        logging.info(f"Serving checks on http://{host}:{port}, press Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logging.info("Stopped serving")
+
+
+def request_check(
+    address: str,
+    config_path: str,
+    generate_markdown: bool = False,
+    cwd: Optional[str] = None,
+) -> str:
+    """Lets a running server check the InputFile of a configuration.
+
+    The server writes the report to the configured resultFile, like a local run.
+
+    Args:
+        address: "host:port" of the server.
+        config_path: Path of the configuration file.
+        generate_markdown: Whether the server writes generated_checker_bundle_doc.md as well.
+        cwd: Directory relative paths are resolved against. Defaults to the current directory.
+
+    Returns:
+        The result XML.
+
+    Raises:
+        OSError: If the server cannot be reached, its token cannot be read or it
+            rejects the request.
+    """
+    request = {
+        "config_path": config_path,
+        "cwd": os.getcwd() if cwd is None else cwd,
+        "generate_markdown": generate_markdown,
+    }
+    return _post(address, "/check", request)
+
+
+def request_content_check(address: str, file_name: str, content: str) -> str:
+    """Lets a running server check file content with the default configuration.
+
+    Args:
+        address: "host:port" of the server.
+        file_name: Name of the file, which selects the schema, e.g. "material_brdf.xompt".
+        content: Content of the file.
+
+    Returns:
+        The result XML.
+
+    Raises:
+        OSError: If the server cannot be reached, its token cannot be read or it
+            rejects the request.
+    """
+    return _post(address, "/check", {"file_name": file_name, "content": content})
+
+
+def _post(address: str, path: str, request: Dict[str, Any]) -> str:
+    host, port = parse_address(address)
+    http_request = urllib.request.Request(
+        f"http://{host}:{port}{path}",
+        data=json.dumps(request).encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {read_token_file(port)}",
+        },
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(http_request, timeout=REQUEST_TIMEOUT) as response:
+            return response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        raise OSError(
+            f"Server rejected the request: {e.read().decode('utf-8', 'replace')}"
+        ) from e
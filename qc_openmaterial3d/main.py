@@ -5,73 +5,104 @@
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import argparse
+import concurrent.futures
+import contextlib
+import cProfile
+import dataclasses
+import io
 import logging
+import os
+import pstats
 import types
 
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+
 from qc_baselib import Configuration, Result, StatusType
 
-from qc_openmaterial3d import constants
-from qc_openmaterial3d.checks import xom_general_checker
-from qc_openmaterial3d.checks import utils, models
+from qc_openmaterial3d import cli, constants, result_cache
+from qc_openmaterial3d.checks import registry as checker_registry
+from qc_openmaterial3d.checks import (
+    uri_resolver,
+    utils,
+    models,
+    uuid_index,
+)
+
+# The modes of a run are imported by the branches of run_checker_bundle using them
+if TYPE_CHECKING:
+    from qc_openmaterial3d import metrics, result_writer
 
 logging.basicConfig(format="%(asctime)s - %(message)s", level=logging.INFO)
 
+# Threads running independent checkers of one input file at the same time
+CHECKER_WORKERS = 4
 
-def args_entrypoint() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(
-        prog="ASAM OpenMATERIAL 3D Checker Bundle",
-        description="This is a collection of scripts for checking validity of OpenMATERIAL 3D (.xoma, .xomm, .xomp, .xompt) files.",
-    )
+# Functions of a --profile run logged, by cumulative time
+PROFILE_TOP_FUNCTIONS = 25
 
-    group = parser.add_mutually_exclusive_group(required=True)
-    group.add_argument("-c", "--config_path")
 
-    parser.add_argument("-g", "--generate_markdown", action="store_true")
+class InlineExecutor(concurrent.futures.Executor):
+    """Runs each submitted function immediately in the calling thread.
 
-    return parser.parse_args()
+    Used to run the checkers one after another, so that they can be profiled and
+    their metrics are not mixed.
+    """
 
+    def submit(
+        self, fn: Callable, /, *args: Any, **kwargs: Any
+    ) -> concurrent.futures.Future:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
 
-def execute_checker(
-    checker: types.ModuleType,
-    checker_data: models.CheckerData,
-    required_definition_setting: bool = True,
-) -> None:
+
+def register_checker(checker: types.ModuleType, result: Result) -> None:
     # Register checker
-    checker_data.result.register_checker(
+    result.register_checker(
         checker_bundle_name=constants.BUNDLE_NAME,
         checker_id=checker.CHECKER_ID,
         description=checker.CHECKER_DESCRIPTION,
     )
 
     # Register rule uid
-    checker_data.result.register_rule_by_uid(
+    result.register_rule_by_uid(
         checker_bundle_name=constants.BUNDLE_NAME,
         checker_id=checker.CHECKER_ID,
         rule_uid=checker.RULE_UID,
     )
 
-    # Check preconditions. If not satisfied then set status as SKIPPED and return
-    if not checker_data.result.all_checkers_completed_without_issue(
-        checker.CHECKER_PRECONDITIONS
-    ):
-        checker_data.result.set_checker_status(
-            checker_bundle_name=constants.BUNDLE_NAME,
-            checker_id=checker.CHECKER_ID,
-            status=StatusType.SKIPPED,
-        )
 
-        checker_data.result.add_checker_summary(
-            constants.BUNDLE_NAME,
-            checker.CHECKER_ID,
-            "Preconditions are not satisfied. Skip the check.",
-        )
+def is_completed_without_issue(record: Dict[str, Any]) -> bool:
+    return record["status"] == StatusType.COMPLETED.value and not record["issues"]
 
-        return
 
-    # Checker definition setting. If not satisfied then set status as SKIPPED and return
-    if required_definition_setting:
-        schema_version = checker_data.schema_version
+def get_skip_reason(
+    checker: types.ModuleType,
+    schema_version: Optional[str],
+    records: Dict[str, Dict[str, Any]],
+) -> Optional[str]:
+    """Decides whether a checker is skipped before it is started.
+
+    Args:
+        checker: Checker module.
+        schema_version: OpenMATERIAL 3D version of the input file, if known.
+        records: Records of the checkers that already finished, by checker ID.
+
+    Returns:
+        The summary of the skipped checker, or None if the checker runs.
+    """
+    # Check preconditions. If not satisfied then skip the checker
+    if not all(
+        is_completed_without_issue(records[precondition])
+        for precondition in checker_registry.get_preconditions(checker)
+    ):
+        return "Preconditions are not satisfied. Skip the check."
 
+    # Checker definition setting. If not satisfied then skip the checker
+    if checker_registry.requires_definition_setting(checker):
         splitted_rule_uid = checker.RULE_UID.split(":")
         if len(splitted_rule_uid) != 4:
             raise RuntimeError(f"Invalid rule uid: {checker.RULE_UID}")
@@ -81,115 +112,543 @@ def execute_checker(
             schema_version is None
             or utils.compare_versions(schema_version, definition_setting) < 0
         ):
-            checker_data.result.set_checker_status(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=checker.CHECKER_ID,
-                status=StatusType.SKIPPED,
-            )
+            return f"Version {schema_version} is lower than definition setting {definition_setting}. Skip the check."
 
-            checker_data.result.add_checker_summary(
-                constants.BUNDLE_NAME,
-                checker.CHECKER_ID,
-                f"Version {schema_version} is lower than definition setting {definition_setting}. Skip the check.",
-            )
+    return None
+
+
+def record_checker(result: Any, checker_id: str) -> Dict[str, Any]:
+    """Captures the result of an executed checker from a Result or a result_writer.CheckerRecorder."""
+    if isinstance(result, Result):
+        return result_cache.record_checker(result, checker_id)
+    return result.get_record()
 
-            return
+
+def execute_checker(
+    checker: types.ModuleType,
+    checker_data: models.CheckerData,
+    cache: Optional[result_cache.ResultCache] = None,
+    stream_issues: bool = False,
+) -> Dict[str, Any]:
+    """Runs a checker on a result of its own, so that several checkers can run at the same time.
+
+    Args:
+        checker: Checker module whose preconditions are satisfied.
+        checker_data: Checker data of the run. Its result is not modified.
+        cache: Result cache to replay the checker result from and to store it in.
+        stream_issues: Whether the checker records its issues in a
+            result_writer.CheckerRecorder, which spools them to disk, instead of a Result.
+
+    Returns:
+        The record of the checker result, see result_cache.record_checker.
+    """
+    if stream_issues:
+        from qc_openmaterial3d import result_writer
+
+        result = result_writer.CheckerRecorder()
+    else:
+        result = create_result()
+    register_checker(checker, result)
 
     # Execute checker
     try:
-        checker.check_rule(checker_data)
+        # Replay the result of an earlier run on the same content, if available
+        cache_key = cache.get_key(checker, checker_data) if cache is not None else None
+        if cache_key is not None:
+            record = cache.load(cache_key)
+            if record is not None:
+                return record
+
+        checker.check_rule(dataclasses.replace(checker_data, result=result))
 
         # If checker is not explicitly set as SKIPPED, then set it as COMPLETED
-        if (
-            checker_data.result.get_checker_status(checker.CHECKER_ID)
-            != StatusType.SKIPPED
-        ):
-            checker_data.result.set_checker_status(
+        if result.get_checker_status(checker.CHECKER_ID) != StatusType.SKIPPED:
+            result.set_checker_status(
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=checker.CHECKER_ID,
                 status=StatusType.COMPLETED,
             )
+
+        record = record_checker(result, checker.CHECKER_ID)
+        # Spooled issues are too many to be held in memory for the cache
+        if cache_key is not None and isinstance(record["issues"], list):
+            cache.store(cache_key, record)
+        return record
     except Exception as e:
         # If any exception occurs during the check, set the status as ERROR
-        checker_data.result.set_checker_status(
+        result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=checker.CHECKER_ID,
             status=StatusType.ERROR,
         )
 
-        checker_data.result.add_checker_summary(
+        result.add_checker_summary(
             constants.BUNDLE_NAME, checker.CHECKER_ID, f"Error: {str(e)}."
         )
 
         logging.exception(f"An error occurred in {checker.CHECKER_ID}.")
+        return record_checker(result, checker.CHECKER_ID)
+
+
+def execute_measured_checker(
+    checker: types.ModuleType,
+    checker_data: models.CheckerData,
+    cache: Optional[result_cache.ResultCache],
+    run_metrics: "metrics.RunMetrics",
+    stream_issues: bool = False,
+) -> Dict[str, Any]:
+    """Runs execute_checker and records its metrics as a stage named by the checker ID."""
+    with run_metrics.measure(checker.CHECKER_ID, checker_data.document) as stage:
+        record = execute_checker(checker, checker_data, cache, stream_issues)
+        stage.issues = len(record["issues"])
+    return record
+
+
+def execute_checkers(
+    checkers: List[types.ModuleType],
+    checker_data: models.CheckerData,
+    records: Dict[str, Dict[str, Any]],
+    executor: concurrent.futures.Executor,
+    cache: Optional[result_cache.ResultCache] = None,
+    run_metrics: Optional["metrics.RunMetrics"] = None,
+    writer: Optional["result_writer.StreamingResultWriter"] = None,
+) -> None:
+    """Runs checkers as soon as their preconditions finished, independent checkers at the same time.
+
+    Checkers whose preconditions are not satisfied are skipped without being started,
+    and so are the checkers depending on them.
+
+    Args:
+        checkers: Checkers in registry order. Their preconditions are part of checkers or records.
+        checker_data: Checker data of the run.
+        records: Records of finished checkers by checker ID, extended by this function.
+        executor: Executor running the checkers.
+        cache: Result cache to replay checker results from and to store them in.
+        run_metrics: Metrics to record a stage per started checker in, or None.
+        writer: Writer receiving the records as soon as the checkers before them in
+            registry order finished, or None. The checkers spool their issues if given.
+    """
+    pending = list(checkers)
+    running: Dict[concurrent.futures.Future, types.ModuleType] = {}
+    while pending or running:
+        for checker in list(pending):
+            if not checker_registry.get_preconditions(checker).issubset(records):
+                continue
+            pending.remove(checker)
+
+            skip_reason = get_skip_reason(checker, checker_data.schema_version, records)
+            if skip_reason is not None:
+                records[checker.CHECKER_ID] = result_cache.record_skipped(skip_reason)
+                continue
+
+            if run_metrics is None:
+                future = executor.submit(
+                    execute_checker, checker, checker_data, cache, writer is not None
+                )
+            else:
+                future = executor.submit(
+                    execute_measured_checker,
+                    checker,
+                    checker_data,
+                    cache,
+                    run_metrics,
+                    writer is not None,
+                )
+            running[future] = checker
+
+        done, _ = concurrent.futures.wait(
+            running, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            records[running.pop(future).CHECKER_ID] = future.result()
 
+        if writer is not None:
+            writer.write_ready(records)
+
+
+def run_checks(
+    config: Configuration,
+    result: Optional[Result],
+    cache: Optional[result_cache.ResultCache] = None,
+    document: Optional[models.JsonDocument] = None,
+    run_metrics: Optional["metrics.RunMetrics"] = None,
+    workers: int = CHECKER_WORKERS,
+    writer: Optional["result_writer.StreamingResultWriter"] = None,
+) -> None:
+    """Runs all checkers and adds their results to result, or streams them to writer if given."""
+    input_file_path = config.get_config_param("InputFile")
+    if document is None:
+        with (
+            run_metrics.measure("parse")
+            if run_metrics is not None
+            else contextlib.nullcontext()
+        ):
+            document = utils.load_json_document(
+                input_file_path, utils.get_streaming_threshold(config)
+            )
 
-def run_checks(config: Configuration, result: Result) -> None:
     checker_data = models.CheckerData(
-        json_file_path=config.get_config_param("InputFile"),
+        json_file_path=input_file_path,
         config=config,
         result=result,
         schema_version=None,
+        document=document,
     )
+    if cache is not None:
+        # Hashed once, the checkers run on copies of checker_data
+        checker_data.content_hash = result_cache.get_content_hash(document)
+
+    registry = checker_registry.get_registry()
+    basic_checkers = [
+        checker
+        for checker in registry.checkers
+        if not checker_registry.requires_definition_setting(checker)
+    ]
+    further_checkers = [
+        checker for checker in registry.checkers if checker not in basic_checkers
+    ]
+
+    records: Dict[str, Dict[str, Any]] = {}
+    # Measured checkers run one after another, so that their metrics are not mixed
+    if workers > 1 and run_metrics is None:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = InlineExecutor()
+    with executor:
+        # 1. Run basic checks
+        execute_checkers(
+            basic_checkers, checker_data, records, executor, cache, run_metrics, writer
+        )
+
+        # Get schema version if file and version exist
+        if all(
+            is_completed_without_issue(records[checker.CHECKER_ID])
+            for checker in basic_checkers
+        ):
+            checker_data.schema_version = utils.get_open_material_version(
+                checker_data.document.data
+            )
+
+            # Recorded before the checkers looking up other files with the same uuid run
+            if uuid_index.INDEX.is_open:
+                uuid_index.INDEX.add(checker_data.document)
+
+        # Run further xom:general checker
+        execute_checkers(
+            further_checkers,
+            checker_data,
+            records,
+            executor,
+            cache,
+            run_metrics,
+            writer,
+        )
+
+    if writer is not None:
+        return
+
+    # Merge in registry order, so that the report does not depend on which checker finished first
+    with (
+        run_metrics.measure("report")
+        if run_metrics is not None
+        else contextlib.nullcontext()
+    ):
+        for checker in registry.checkers:
+            register_checker(checker, result)
+            result_cache.replay_checker(
+                result, checker.CHECKER_ID, records[checker.CHECKER_ID]
+            )
 
-    # 1. Run basic checks
-    execute_checker(
-        xom_general_checker.valid_json_document,
-        checker_data,
-        required_definition_setting=False,
-    )
 
-    execute_checker(
-        xom_general_checker.version_is_defined,
-        checker_data,
-        required_definition_setting=False,
+def create_result() -> Result:
+    result = Result()
+    result.register_checker_bundle(
+        name=constants.BUNDLE_NAME,
+        description="OpenMATERIAL 3D Checker Bundle",
+        version=constants.BUNDLE_VERSION,
+        summary="",
     )
+    result.set_result_version(version=constants.BUNDLE_VERSION)
+
+    return result
+
+
+def check_input_file(
+    config: Configuration,
+    cache: Optional[result_cache.ResultCache] = None,
+    document: Optional[models.JsonDocument] = None,
+    run_metrics: Optional["metrics.RunMetrics"] = None,
+    workers: int = CHECKER_WORKERS,
+) -> Result:
+    """Runs all checks on the InputFile of config and returns the filled result.
+
+    Checker results found in cache are replayed instead of running the checker again.
+    The InputFile is loaded unless its already loaded document is given. If run_metrics
+    is given, the parse stage and each checker are measured. With workers set to 1 the
+    checkers run in the calling thread.
+    """
+    result = create_result()
+
+    run_checks(config, result, cache, document, run_metrics, workers)
+
+    result.copy_param_from_config(config)
 
-    # Get schema version if file and version exist
-    if result.all_checkers_completed_without_issue(
-        {
-            xom_general_checker.valid_json_document.CHECKER_ID,
-            xom_general_checker.version_is_defined.CHECKER_ID,
-        }
+    return result
+
+
+def stream_input_file(
+    config: Configuration,
+    report_file_path: str,
+    cache: Optional[result_cache.ResultCache] = None,
+    document: Optional[models.JsonDocument] = None,
+    run_metrics: Optional["metrics.RunMetrics"] = None,
+    workers: int = CHECKER_WORKERS,
+) -> int:
+    """Runs all checks on the InputFile of config like check_input_file and streams the report.
+
+    The checker results are written to the report as the checkers finish instead of
+    being collected in a Result, see result_writer.StreamingResultWriter. The report
+    file is only replaced once all checkers finished.
+
+    Returns:
+        The number of issues in the report.
+    """
+    from qc_openmaterial3d import result_writer
+
+    checkers = checker_registry.get_registry().checkers
+    writer = result_writer.StreamingResultWriter(report_file_path, config, checkers)
+    try:
+        run_checks(config, None, cache, document, run_metrics, workers, writer)
+    except BaseException:
+        writer.discard()
+        raise
+
+    with (
+        run_metrics.measure("report")
+        if run_metrics is not None
+        else contextlib.nullcontext()
     ):
-        checker_data.schema_version = utils.get_open_material_version(checker_data.json_file_path)
+        writer.close()
+    return writer.issue_count
+
+
+def get_dependency_paths(
+    config: Configuration, document: models.JsonDocument
+) -> Set[str]:
+    """Collects the files besides the input file that the checker results depend on.
+
+    Args:
+        config: Configuration of the run.
+        document: Loaded input file.
+
+    Returns:
+        Normalized absolute paths of the files listed by the get_dependency_fingerprint
+        functions of the checkers, see result_cache.ResultCache.
+    """
+    checker_data = models.CheckerData(
+        json_file_path=document.file_path,
+        config=config,
+        result=None,
+        schema_version=None,
+        document=document,
+    )
+    paths = set()
+    for checker in checker_registry.get_registry().checkers:
+        get_dependency_fingerprint = getattr(
+            checker, "get_dependency_fingerprint", None
+        )
+        if get_dependency_fingerprint is not None:
+            paths.update(
+                os.path.normpath(os.path.abspath(entry[0]))
+                for entry in get_dependency_fingerprint(checker_data)
+            )
+    return paths
+
 
-    # Run further xom:general checker
-    execute_checker(xom_general_checker.valid_schema, checker_data)
-    execute_checker(xom_general_checker.uris_exist, checker_data)
+def create_registered_result() -> Result:
+    """Creates a result with all checkers registered, which the checker bundle documentation is written from."""
+    result = create_result()
+    for checker in checker_registry.get_registry().checkers:
+        register_checker(checker, result)
+    return result
+
+
+def create_cache(args: argparse.Namespace) -> Optional[result_cache.ResultCache]:
+    if args.no_cache:
+        return None
+    return result_cache.ResultCache(
+        args.cache_dir or result_cache.get_default_cache_dir()
+    )
+
+
+def open_uuid_index(args: argparse.Namespace, is_batch_run: bool) -> None:
+    """Opens the uuid index given on the command line, by default the one in the cache directory for batch runs."""
+    index_path = args.uuid_index
+    if index_path is None and is_batch_run and not args.no_cache:
+        index_path = os.path.join(
+            args.cache_dir or result_cache.get_default_cache_dir(),
+            uuid_index.INDEX_FILE_NAME,
+        )
+    if index_path is not None:
+        uuid_index.INDEX.open(index_path)
+
+
+def write_table_sidecars(input_files: List[str]) -> None:
+    from qc_openmaterial3d.checks import table_sidecar
+
+    for input_file in input_files:
+        try:
+            manifest_path = table_sidecar.write_sidecar(input_file)
+            logging.info(f"Table sidecar of {input_file} written to {manifest_path}")
+        except (OSError, ValueError) as e:
+            logging.error(f"Cannot write the table sidecar of {input_file}: {e}")
 
 
 def main():
-    args = args_entrypoint()
+    cli.main()
 
-    logging.info("Initializing checks")
+
+def run(args: argparse.Namespace) -> None:
+    """Runs the checks requested by the parsed command line arguments of cli.args_entrypoint."""
+    if args.profile is None:
+        run_checker_bundle(args)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run_checker_bundle(args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+        logging.info(f"Profile written to {args.profile}\n{stream.getvalue()}")
 
 
+def run_checker_bundle(args: argparse.Namespace) -> None:
+    if args.serve is not None:
+        from qc_openmaterial3d import daemon
+
+        daemon.serve(args.serve, create_cache(args))
+        return
+
+    if args.write_table_sidecars is not None:
+        write_table_sidecars(args.write_table_sidecars)
+        return
+
+    logging.info("Initializing checks")
+
     config = Configuration()
     config.load_from_file(xml_file_path=args.config_path)
 
-    result = Result()
-    result.register_checker_bundle(
-        name=constants.BUNDLE_NAME,
-        description="OpenMATERIAL 3D Checker Bundle",
-        version=constants.BUNDLE_VERSION,
-        summary="",
+    cache = create_cache(args)
+    open_uuid_index(
+        args,
+        args.watch is not None
+        or args.input_dir is not None
+        or args.file_list is not None,
     )
-    result.set_result_version(version=constants.BUNDLE_VERSION)
+    try:
+        run_configured_checks(args, config, cache)
+    finally:
+        uuid_index.INDEX.close()
 
-    run_checks(config, result)
 
-    result.copy_param_from_config(config)
+def run_configured_checks(
+    args: argparse.Namespace,
+    config: Configuration,
+    cache: Optional[result_cache.ResultCache],
+) -> None:
+    """Runs the checks of a loaded configuration in watch, batch or single-file mode."""
+    result_file_path = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
+    )
+
+    if args.watch is not None:
+        from qc_openmaterial3d import watch
 
-    result.write_to_file(
-        config.get_checker_bundle_param(
-            checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
-        ),
-        generate_summary=True,
+        output_dir = args.output_dir
+        if output_dir is None:
+            output_dir = os.path.splitext(result_file_path)[0]
+
+        watch.watch(config, args.watch, output_dir, cache, args.poll_interval)
+        return
+
+    if args.input_dir is not None or args.file_list is not None:
+        from qc_openmaterial3d import batch
+
+        if args.input_dir is not None:
+            input_files = batch.discover_input_files(args.input_dir)
+        else:
+            input_files = batch.read_file_list(args.file_list)
+
+        output_dir = args.output_dir
+        if output_dir is None:
+            output_dir = os.path.splitext(result_file_path)[0]
+
+        batch.run_batch(
+            config,
+            input_files,
+            output_dir,
+            args.jobs,
+            cache,
+            args.pipeline,
+            args.stream_results,
+        )
+
+        logging.info("Done")
+        return
+
+    run_metrics = None
+    if args.metrics is not None:
+        from qc_openmaterial3d import metrics
+
+        run_metrics = metrics.RunMetrics(config.get_config_param("InputFile"))
+
+    # Profiled checkers run in the main thread, the profiler does not follow other threads
+    workers = 1 if args.profile is not None else CHECKER_WORKERS
+    resolver = uri_resolver.RESOLVER
+    uri_hits, uri_misses = resolver.hits, resolver.misses
+    result: Optional[Result] = None
+    try:
+        if args.stream_results:
+            stream_input_file(
+                config,
+                result_file_path,
+                cache,
+                run_metrics=run_metrics,
+                workers=workers,
+            )
+        else:
+            result = check_input_file(
+                config, cache, run_metrics=run_metrics, workers=workers
+            )
+    finally:
+        if run_metrics is not None:
+            run_metrics.close()
+
+    if result is not None:
+        result.write_to_file(result_file_path, generate_summary=True)
+
+    if run_metrics is not None:
+        run_metrics.write_to_file(args.metrics)
+        logging.info(f"Metrics written to {args.metrics}")
+
+    logging.info(
+        f"URI existence cache: {resolver.hits - uri_hits} hit(s), "
+        f"{resolver.misses - uri_misses} miss(es)"
     )
+    if cache is not None:
+        logging.info(f"Result cache: {cache.hits} hit(s), {cache.misses} miss(es)")
 
     if args.generate_markdown:
-        result.write_markdown_doc("generated_checker_bundle_doc.md")
+        # The documentation lists the checkers only, which a streamed run did not collect
+        (result or create_registered_result()).write_markdown_doc(
+            "generated_checker_bundle_doc.md"
+        )
 
     logging.info("Done")
 
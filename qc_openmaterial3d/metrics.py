@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import contextlib
+import dataclasses
+import json
+import time
+import tracemalloc
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import models
+
+
+@dataclass
+class StageMetrics:
+    """Resources used by one stage of a run, the parse stage or a checker.
+
+    Attributes:
+        name: "parse" or the checker ID.
+        wall_time: Elapsed time in seconds.
+        cpu_time: CPU time of the running thread in seconds.
+        peak_memory: Peak of the memory allocated by Python during the stage, in bytes above
+            its start. 0 if memory is not traced.
+        issues: Number of issues raised.
+        location_lookups: Number of properties of the input file whose line and column were looked up.
+    """
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: int = 0
+    issues: int = 0
+    location_lookups: int = 0
+
+
+class RunMetrics:
+    """Collects the metrics of the stages of a single-file run.
+
+    Memory is traced with tracemalloc from creation until close() unless disabled,
+    which slows the run down. The peak memory of a stage is only meaningful if no
+    other stage runs at the same time, so measured runs execute their checkers one
+    after another.
+
+    Args:
+        input_file: Path of the checked file.
+        trace_memory: Whether to trace the peak memory of the stages.
+    """
+
+    def __init__(self, input_file: str, trace_memory: bool = True) -> None:
+        self.input_file = input_file
+        self.trace_memory = trace_memory
+        self.stages: List[StageMetrics] = []
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def measure(
+        self, name: str, document: Optional[models.JsonDocument] = None
+    ) -> Iterator[StageMetrics]:
+        """Measures the code run in the with block as a stage.
+
+        Args:
+            name: Name of the stage.
+            document: Input file, whose location lookups are counted.
+
+        Yields:
+            The stage, whose issues can be set by the caller.
+        """
+        stage = StageMetrics(name=name)
+        location_lookups = document.location_lookups if document is not None else 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        start_time = time.perf_counter()
+        start_cpu_time = time.thread_time()
+        try:
+            yield stage
+        finally:
+            stage.cpu_time = time.thread_time() - start_cpu_time
+            stage.wall_time = time.perf_counter() - start_time
+            if self.trace_memory:
+                stage.peak_memory = max(
+                    0, tracemalloc.get_traced_memory()[1] - start_memory
+                )
+            if document is not None:
+                stage.location_lookups = document.location_lookups - location_lookups
+            self.stages.append(stage)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "input_file": self.input_file,
+            "bundle_version": constants.BUNDLE_VERSION,
+            "stages": [dataclasses.asdict(stage) for stage in self.stages],
+        }
+
+    def write_to_file(self, file_path: str) -> None:
+        """Writes the metrics as JSON sidecar file of the report."""
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+            file.write("\n")
+
+    def close(self) -> None:
+        """Stops tracing memory, unless it was traced before the metrics were created."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
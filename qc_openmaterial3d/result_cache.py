@@ -0,0 +1,303 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import types
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from qc_baselib import IssueSeverity, Result, StatusType
+
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import models
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bump to invalidate all cache entries when their layout changes
+CACHE_FORMAT_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_default_cache_dir() -> str:
+    """Returns $XDG_CACHE_HOME/qc_openmaterial3d, falling back to ~/.cache/qc_openmaterial3d."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "qc_openmaterial3d")
+
+
+@functools.lru_cache(maxsize=None)
+def get_code_fingerprint() -> str:
+    """Hashes the sources and schemas of the package once per process.
+
+    Cached results of a modified checker are not replayed, even if the bundle version
+    was not changed.
+    """
+    digest = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(PACKAGE_DIR):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if os.path.splitext(file_name)[1] in (".py", ".json"):
+                file_path = os.path.join(dir_path, file_name)
+                digest.update(os.path.relpath(file_path, PACKAGE_DIR).encode("utf-8"))
+                with open(file_path, "rb") as file:
+                    digest.update(file.read())
+    return digest.hexdigest()
+
+
+def get_content_hash(document: models.JsonDocument) -> Optional[str]:
+    """Hashes the content of a document, reading streamed files again in chunks.
+
+    Args:
+        document: Loaded document.
+
+    Returns:
+        The SHA-256 of the file content, or None if the file does not exist.
+    """
+    if not document.exists:
+        return None
+
+    if document.content_hash is not None:
+        return document.content_hash
+
+    if document.raw is not None:
+        return hashlib.sha256(document.raw).hexdigest()
+
+    digest = hashlib.sha256()
+    with open(document.file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_checker_params(
+    checker_data: models.CheckerData, checker_id: str
+) -> Dict[str, Any]:
+    params = {}
+    for bundle in checker_data.config.get_all_checker_bundles():
+        if bundle.application == constants.BUNDLE_NAME:
+            for checker in bundle.checkers:
+                if checker.checker_id == checker_id:
+                    params.update((param.name, param.value) for param in checker.params)
+    return params
+
+
+def record_checker(result: Result, checker_id: str) -> Dict[str, Any]:
+    """Captures the status, summary and issues of an executed checker.
+
+    Args:
+        result: Result the checker wrote to.
+        checker_id: ID of the checker.
+
+    Returns:
+        A JSON serializable record for replay_checker.
+    """
+    checker = result.get_checker_result(constants.BUNDLE_NAME, checker_id)
+    return {
+        "status": checker.status.value,
+        "summary": checker.summary,
+        "issues": [
+            {
+                "description": issue.description,
+                "level": issue.level.value,
+                "rule_uid": issue.rule_uid,
+                "locations": [
+                    {
+                        "description": location.description,
+                        "file_locations": [
+                            [file_location.row, file_location.column]
+                            for file_location in location.file_location
+                        ],
+                    }
+                    for location in issue.locations
+                ],
+            }
+            for issue in checker.issues
+        ],
+    }
+
+
+def record_skipped(summary: str) -> Dict[str, Any]:
+    """Creates the record of a checker that was skipped before it started."""
+    return {"status": StatusType.SKIPPED.value, "summary": summary, "issues": []}
+
+
+def replay_checker(result: Result, checker_id: str, record: Dict[str, Any]) -> None:
+    """Writes a record of record_checker to the registered checker of result.
+
+    Args:
+        result: Result to write to.
+        checker_id: ID of the checker.
+        record: Record of an earlier execution of the checker.
+    """
+    for issue in record["issues"]:
+        issue_id = result.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker_id,
+            description=issue["description"],
+            level=IssueSeverity(issue["level"]),
+            rule_uid=issue["rule_uid"],
+        )
+        for location in issue["locations"]:
+            for row, column in location["file_locations"]:
+                result.add_file_location(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=checker_id,
+                    issue_id=issue_id,
+                    row=row,
+                    column=column,
+                    description=location["description"],
+                )
+
+    if record["summary"]:
+        result.add_checker_summary(constants.BUNDLE_NAME, checker_id, record["summary"])
+    result.set_checker_status(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=checker_id,
+        status=StatusType(record["status"]),
+    )
+
+
+class ResultCache:
+    """Persistent cache of checker results, keyed by the content of the checked file.
+
+    A key covers the file content and name, the OpenMATERIAL 3D version, the bundle
+    version and code, the checker ID and its parameters. Checkers whose result also
+    depends on other files define get_dependency_fingerprint(checker_data), whose
+    return value is part of the key as well. It is a list with an entry per file, a
+    list starting with the path of the file, so that watch mode can follow the files.
+
+    Entries are JSON files written atomically, so several processes can share a
+    cache directory. Long-running processes can additionally keep the most recently
+    used entries in memory. The checkers of a run can use the cache from several threads.
+
+    Args:
+        cache_dir: Directory holding the entries, or None to keep them in memory only.
+        memory_size: Maximum number of entries kept in memory.
+    """
+
+    def __init__(self, cache_dir: Optional[str], memory_size: int = 0) -> None:
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Batch workers receive the cache pickled, locks cannot be pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get_key(
+        self, checker: types.ModuleType, checker_data: models.CheckerData
+    ) -> Optional[str]:
+        """Computes the cache key of a checker for the input file of checker_data.
+
+        Args:
+            checker: Checker module.
+            checker_data: Checker data of the run.
+
+        Returns:
+            The key, or None if the result of the checker cannot be cached.
+        """
+        if checker_data.content_hash is None and checker_data.document is not None:
+            checker_data.content_hash = get_content_hash(checker_data.document)
+        if checker_data.content_hash is None:
+            return None
+
+        key = {
+            "format": CACHE_FORMAT_VERSION,
+            "bundle_version": constants.BUNDLE_VERSION,
+            "code": get_code_fingerprint(),
+            "content": checker_data.content_hash,
+            "file_name": os.path.basename(checker_data.json_file_path),
+            "schema_version": checker_data.schema_version,
+            "checker_id": checker.CHECKER_ID,
+            "params": get_checker_params(checker_data, checker.CHECKER_ID),
+        }
+        get_dependency_fingerprint = getattr(
+            checker, "get_dependency_fingerprint", None
+        )
+        if get_dependency_fingerprint is not None:
+            key["dependencies"] = get_dependency_fingerprint(checker_data)
+
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the record stored under key and counts the lookup as hit or miss."""
+        with self._lock:
+            record = self._memory.get(key)
+            if record is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return record
+
+        record = self._read(key)
+        with self._lock:
+            if record is None:
+                self.misses += 1
+                return None
+            self._remember(key, record)
+            self.hits += 1
+            return record
+
+    def store(self, key: str, record: Dict[str, Any]) -> None:
+        """Stores a record under key. Failing writes are logged and otherwise ignored."""
+        with self._lock:
+            self._remember(key, record)
+        if self.cache_dir is None:
+            return
+
+        entry_path = self._get_entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=os.path.dirname(entry_path),
+                suffix=".tmp",
+                delete=False,
+            ) as file:
+                json.dump(record, file)
+            os.replace(file.name, entry_path)
+        except OSError as e:
+            logging.warning(f"Cannot write result cache entry {entry_path}: {e}")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._get_entry_path(key), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _remember(self, key: str, record: Dict[str, Any]) -> None:
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = record
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
@@ -0,0 +1,389 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import collections
+import datetime
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import types
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from lxml import etree
+from qc_baselib import Configuration, IssueSeverity, StatusType
+
+from qc_openmaterial3d import constants
+
+# Indentation of the elements, matching the pretty printed reports of qc_baselib
+BUNDLE_INDENT = "\n  "
+CHECKER_INDENT = "\n    "
+CHECKER_CHILD_INDENT = "\n      "
+ISSUE_CHILD_LEVEL = 4
+
+XML_DECLARATION = b"<?xml version='1.0' encoding='UTF-8' standalone='no'?>\n"
+
+# Issues of a checker held in memory while it runs, further issues are spooled to disk
+SPOOL_MEMORY_ISSUES = 1000
+
+
+def get_checker_params(config: Configuration) -> Dict[str, List[Tuple[str, str]]]:
+    """Collects the configured parameters of the checkers of the bundle, by checker ID."""
+    checker_params: Dict[str, List[Tuple[str, str]]] = collections.defaultdict(list)
+    for config_bundle in config.get_all_checker_bundles():
+        if config_bundle.application != constants.BUNDLE_NAME:
+            continue
+        for config_checker in config_bundle.checkers:
+            checker_params[config_checker.checker_id].extend(
+                (param.name, str(param.value)) for param in config_checker.params
+            )
+    return checker_params
+
+
+def get_bundle_params(config: Configuration) -> List[Tuple[str, str]]:
+    """Collects the global parameters and the bundle parameters of the configuration, as copied into reports."""
+    params = [
+        (name, str(value))
+        for name, value in config.get_all_global_config_param().items()
+    ]
+    for config_bundle in config.get_all_checker_bundles():
+        if config_bundle.application == constants.BUNDLE_NAME:
+            params.extend(
+                (param.name, str(param.value)) for param in config_bundle.params
+            )
+    return params
+
+
+def create_issue_element(issue_id: int, issue: Dict[str, Any]) -> etree._Element:
+    """Creates the Issue element of an issue of a record of result_cache.record_checker."""
+    element = etree.Element(
+        "Issue",
+        issueId=str(issue_id),
+        description=issue["description"],
+        level=str(issue["level"]),
+        ruleUID=issue["rule_uid"],
+    )
+    for location in issue["locations"]:
+        location_element = etree.SubElement(
+            element, "Locations", description=location["description"]
+        )
+        for row, column in location["file_locations"]:
+            file_location = etree.SubElement(location_element, "FileLocation")
+            if column is not None:
+                file_location.set("column", str(column))
+            if row is not None:
+                file_location.set("row", str(row))
+    etree.indent(element, level=ISSUE_CHILD_LEVEL - 1)
+    return element
+
+
+class IssueSpool:
+    """Issues of a record of one checker, spooled to a temporary file beyond a limit.
+
+    Takes the place of the list of issues in a record, it supports len, truthiness and
+    iteration. The first issues are kept in memory, the others are written to the
+    temporary file as JSON lines and read back one by one while iterating.
+
+    Args:
+        memory_issues: Number of issues kept in memory, SPOOL_MEMORY_ISSUES if None.
+    """
+
+    def __init__(self, memory_issues: Optional[int] = None) -> None:
+        self._memory: List[Dict[str, Any]] = []
+        self._memory_issues = (
+            memory_issues if memory_issues is not None else SPOOL_MEMORY_ISSUES
+        )
+        self._file: Optional[Any] = None
+        self._count = 0
+
+    @property
+    def is_spooled(self) -> bool:
+        """Whether issues were written to the temporary file."""
+        return self._file is not None
+
+    def append(self, issue: Dict[str, Any]) -> None:
+        self._count += 1
+        if len(self._memory) < self._memory_issues:
+            self._memory.append(issue)
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self._file.write(json.dumps(issue))
+        self._file.write("\n")
+
+    def close(self) -> None:
+        """Removes the temporary file."""
+        if self._file is not None:
+            self._file.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        yield from self._memory
+        if self._file is not None:
+            self._file.seek(0)
+            for line in self._file:
+                yield json.loads(line)
+
+
+class CheckerRecorder:
+    """Records the result of one checker in place of a Result, spooling its issues.
+
+    Implements the methods of qc_baselib.Result that the checkers and main.execute_checker
+    call for a single checker. Locations are added to the issue registered last, which
+    the checkers do right after registering it, so that only that issue is open.
+
+    Args:
+        memory_issues: Number of issues kept in memory, see IssueSpool.
+    """
+
+    def __init__(self, memory_issues: Optional[int] = None) -> None:
+        self.status: Optional[StatusType] = None
+        self.summary = ""
+        self.issues = IssueSpool(memory_issues)
+        self._issue: Optional[Dict[str, Any]] = None
+        self._issue_id = -1
+
+    def register_checker(self, **kwargs: Any) -> None:
+        pass
+
+    def register_rule_by_uid(self, **kwargs: Any) -> None:
+        pass
+
+    def register_issue(
+        self,
+        checker_bundle_name: str,
+        checker_id: str,
+        description: str,
+        level: IssueSeverity,
+        rule_uid: str,
+    ) -> int:
+        self._close_issue()
+        self._issue_id += 1
+        self._issue = {
+            "description": description,
+            "level": level.value,
+            "rule_uid": rule_uid,
+            "locations": [],
+        }
+        return self._issue_id
+
+    def add_file_location(
+        self,
+        checker_bundle_name: str,
+        checker_id: str,
+        issue_id: int,
+        row: Optional[int],
+        column: Optional[int],
+        description: str,
+        offset: Optional[int] = None,
+        coalesce: bool = True,
+    ) -> None:
+        if self._issue is None or issue_id != self._issue_id:
+            raise ValueError(
+                f"Locations can only be added to the issue registered last, not to issue {issue_id}"
+            )
+        locations = self._issue["locations"]
+        location = next(
+            (
+                location
+                for location in locations
+                if coalesce and location["description"] == description
+            ),
+            None,
+        )
+        if location is None:
+            location = {"description": description, "file_locations": []}
+            locations.append(location)
+        location["file_locations"].append([row, column])
+
+    def add_checker_summary(
+        self, checker_bundle_name: str, checker_id: str, content: str
+    ) -> None:
+        self.summary = f"{self.summary} {content}" if self.summary else content
+
+    def set_checker_status(
+        self, checker_bundle_name: str, checker_id: str, status: StatusType
+    ) -> None:
+        self.status = status
+
+    def get_checker_status(self, checker_id: str) -> Optional[StatusType]:
+        return self.status
+
+    def get_record(self) -> Dict[str, Any]:
+        """Returns the record of the checker like result_cache.record_checker.
+
+        The issues are a list, unless they were spooled to disk.
+        """
+        self._close_issue()
+        return {
+            "status": self.status.value if self.status is not None else None,
+            "summary": self.summary,
+            "issues": self.issues if self.issues.is_spooled else list(self.issues),
+        }
+
+    def _close_issue(self) -> None:
+        if self._issue is not None:
+            self.issues.append(self._issue)
+            self._issue = None
+
+
+class StreamingResultWriter:
+    """Writes a report checker by checker instead of building the whole Result first.
+
+    The records of result_cache.record_checker or CheckerRecorder are written in registry
+    order as soon as all earlier checkers finished, each Checker element to a temporary
+    file next to the report. close() then writes the report: the CheckerBundle element
+    with the summary counted from the written checkers, followed by the content of the
+    temporary file. Checkers recorded by a CheckerRecorder hold at most
+    SPOOL_MEMORY_ISSUES of their issues in memory until they are written.
+
+    The report is the same as Result.write_to_file(generate_summary=True) writes for
+    the same records after Result.copy_param_from_config, so qc_baselib reads it.
+    """
+
+    def __init__(
+        self,
+        report_file_path: str,
+        config: Configuration,
+        checkers: List[types.ModuleType],
+    ) -> None:
+        self.report_file_path = report_file_path
+        self.issue_count = 0
+        self._config = config
+        self._checkers = list(checkers)
+        self._checker_params = get_checker_params(config)
+        self._written = 0
+        self._status_counts: collections.Counter = collections.Counter()
+
+        report_dir = os.path.dirname(os.path.abspath(report_file_path))
+        os.makedirs(report_dir, exist_ok=True)
+        self._body = tempfile.NamedTemporaryFile(
+            dir=report_dir,
+            prefix=f".{os.path.basename(report_file_path)}.",
+            suffix=".part",
+            delete=False,
+        )
+
+    @property
+    def is_complete(self) -> bool:
+        return self._written == len(self._checkers)
+
+    def write_ready(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Writes the records of the next checkers in registry order that have finished.
+
+        Written records keep at most one of their issues, which is all the checkers
+        depending on them look at.
+
+        Args:
+            records: Records of the finished checkers, by checker ID.
+        """
+        while (
+            not self.is_complete and self._checkers[self._written].CHECKER_ID in records
+        ):
+            checker = self._checkers[self._written]
+            record = records[checker.CHECKER_ID]
+            self._write_checker(checker, record)
+            issues = record["issues"]
+            records[checker.CHECKER_ID] = {
+                **record,
+                "issues": list(itertools.islice(issues, 1)),
+            }
+            if isinstance(issues, IssueSpool):
+                issues.close()
+            self._written += 1
+
+    def close(self) -> None:
+        """Writes the report, after all checkers are written."""
+        if not self.is_complete:
+            self.discard()
+            raise RuntimeError(
+                f"Only {self._written} of {len(self._checkers)} checker(s) were written to {self.report_file_path}"
+            )
+
+        try:
+            with open(self.report_file_path, "wb") as report:
+                report.write(XML_DECLARATION)
+                with etree.xmlfile(report, encoding="UTF-8") as xf:
+                    with xf.element("CheckerResults", version=constants.BUNDLE_VERSION):
+                        xf.write(BUNDLE_INDENT)
+                        with xf.element("CheckerBundle", self._get_bundle_attributes()):
+                            for name, value in get_bundle_params(self._config):
+                                xf.write(CHECKER_INDENT)
+                                xf.write(etree.Element("Param", name=name, value=value))
+
+                            # The Checker elements are copied as they are
+                            xf.flush()
+                            self._body.seek(0)
+                            shutil.copyfileobj(self._body, report)
+                            xf.write(BUNDLE_INDENT)
+                        xf.write("\n")
+                report.write(b"\n")
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Removes the temporary file without writing the report."""
+        self._body.close()
+        if os.path.exists(self._body.name):
+            os.remove(self._body.name)
+
+    def _get_bundle_attributes(self) -> Dict[str, str]:
+        counts = self._status_counts
+        no_status = len(self._checkers) - sum(
+            counts[status]
+            for status in (StatusType.COMPLETED, StatusType.SKIPPED, StatusType.ERROR)
+        )
+        summary = (
+            f"{len(self._checkers)} checker(s) are executed. "
+            f"{counts[StatusType.COMPLETED]} checker(s) are completed. {counts[StatusType.SKIPPED]} checker(s) are skipped. "
+            f"{counts[StatusType.ERROR]} checker(s) have internal error and {no_status} checker(s) do not contain status."
+        )
+        return {
+            "build_date": datetime.datetime.today().strftime("%Y-%m-%d"),
+            "description": "OpenMATERIAL 3D Checker Bundle",
+            "name": constants.BUNDLE_NAME,
+            "version": constants.BUNDLE_VERSION,
+            "summary": summary,
+        }
+
+    def _write_checker(self, checker: types.ModuleType, record: Dict[str, Any]) -> None:
+        status: Optional[StatusType] = (
+            StatusType(record["status"]) if record["status"] is not None else None
+        )
+        self._status_counts[status] += 1
+
+        summary = f"{len(record['issues'])} issue(s) are found."
+        if record["summary"]:
+            summary = f"{record['summary']} {summary}"
+
+        attributes = {}
+        if status is not None:
+            attributes["status"] = status.value
+        attributes.update(
+            checkerId=checker.CHECKER_ID,
+            description=checker.CHECKER_DESCRIPTION,
+            summary=summary,
+        )
+
+        # A document per checker, the xmlfile writer allows only one root element and no text around it
+        self._body.write(CHECKER_INDENT.encode())
+        with etree.xmlfile(self._body, encoding="UTF-8") as xf:
+            with xf.element("Checker", attributes):
+                for name, value in self._checker_params.get(checker.CHECKER_ID, []):
+                    xf.write(CHECKER_CHILD_INDENT)
+                    xf.write(etree.Element("Param", name=name, value=value))
+                xf.write(CHECKER_CHILD_INDENT)
+                xf.write(etree.Element("AddressedRule", ruleUID=checker.RULE_UID))
+
+                for issue in record["issues"]:
+                    xf.write(CHECKER_CHILD_INDENT)
+                    xf.write(create_issue_element(self.issue_count, issue))
+                    self.issue_count += 1
+                xf.write(CHECKER_INDENT)
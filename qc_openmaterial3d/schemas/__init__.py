@@ -4,4 +4,17 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import importlib
+
+from typing import Any
+
 from . import schema_files as schema_files
+
+# Imports jsonschema, which only the runs validating a schema pay for
+_LAZY_SUBMODULES = {"validator_registry"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,10 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import os
+
+from typing import List, Tuple
+
 SCHEMA_FILES = {
     "1.0.0:xoma": "1.0.0/asset_schema.json",
     "1.0.0:xomm": "1.0.0/mapping_schema.json",
@@ -11,5 +15,78 @@ SCHEMA_FILES = {
     "1.0.0:emp.xompt": "1.0.0/material_emp_schema.json",
     "1.0.0:optical.xompt": "1.0.0/material_optical_schema.json",
     "1.0.0:reflCoeff.xompt": "1.0.0/material_reflCoeff_schema.json",
-    "1.0.0:xomp": "1.0.0/material_schema.json"
+    "1.0.0:xomp": "1.0.0/material_schema.json",
+}
+
+# JSON paths of the lookup table arrays, which hold one row per measurement point
+LOOKUP_TABLE_PATHS = {
+    "1.0.0:brdf.xompt": ("brdf", "lookupTable"),
+    "1.0.0:emp.xompt": ("electromagneticProperties",),
+    "1.0.0:optical.xompt": ("opticalProperties",),
+    "1.0.0:reflCoeff.xompt": ("reflectionCoefficient", "lookupTable"),
+}
+
+# Number of leading lookup table columns that span the measurement grid, the others hold measured values
+LOOKUP_TABLE_KEY_COLUMNS = {
+    "1.0.0:brdf.xompt": 4,
+    "1.0.0:emp.xompt": 3,
+    "1.0.0:optical.xompt": 2,
+    "1.0.0:reflCoeff.xompt": 5,
 }
+
+# JSON paths of the wavelength lists, which hold the distinct values of the first lookup table column
+LOOKUP_TABLE_WAVELENGTHS = {
+    "1.0.0:brdf.xompt": ("brdf", "wavelengths"),
+    "1.0.0:reflCoeff.xompt": ("reflectionCoefficient", "wavelengths"),
+}
+
+SUPPORTED_EXTENSIONS = [".xoma", ".xomm", ".xomp", ".xompt"]
+
+
+def get_schema_key(version: str, file_path: str) -> str:
+    """Builds the SCHEMA_FILES key of a file from its version and file name.
+
+    Args:
+        version: OpenMATERIAL 3D version of the file.
+        file_path: Path to the file.
+
+    Returns:
+        The schema key, e.g. "1.0.0:xomp" or "1.0.0:brdf.xompt".
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    # Extract the file name and extension
+    file_name, file_extension = os.path.splitext(file_path)
+    file_extension = file_extension.lower()  # Ensure extension is lowercase
+
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file extension: {file_extension}")
+
+    if file_extension == ".xompt":
+        # Handle .xompt case with additional string from file name
+        previous_string = file_name.split("_")[-1]
+        return f"{version}:{previous_string}.xompt"
+
+    return f"{version}:{file_extension[1:]}"  # Remove leading dot
+
+
+def get_lookup_table_paths(file_path: str) -> List[Tuple[str, ...]]:
+    """Returns the lookup table paths a file may contain, for any supported version.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        JSON paths of the lookup tables of the file kind, empty for files without tables.
+    """
+    try:
+        file_kind = get_schema_key("", file_path)
+    except ValueError:
+        return []
+
+    paths = []
+    for schema_key, path in LOOKUP_TABLE_PATHS.items():
+        if schema_key.endswith(file_kind) and path not in paths:
+            paths.append(path)
+    return paths
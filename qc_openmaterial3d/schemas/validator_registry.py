@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import importlib.resources
+import json
+import threading
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from jsonschema import Draft7Validator
+
+from qc_openmaterial3d.schemas import schema_files
+
+
+class ValidatorRegistry:
+    """Process-wide cache of compiled schema validators.
+
+    Each schema of schema_files.SCHEMA_FILES is loaded, checked against the
+    Draft 7 meta-schema and compiled at most once per process.
+
+    Args:
+        schemas: Mapping of schema keys ("<version>:<file kind>") to schema file paths
+            relative to the qc_openmaterial3d.schemas package.
+    """
+
+    def __init__(self, schemas: Optional[Dict[str, str]] = None) -> None:
+        self._schemas = schema_files.SCHEMA_FILES if schemas is None else schemas
+        self._validators: Dict[str, Draft7Validator] = {}
+        self._row_validators: Dict[Tuple[str, Tuple[str, ...]], Draft7Validator] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_validator(self, schema_key: str) -> Draft7Validator:
+        """Returns the compiled validator for a schema key, compiling it on first use.
+
+        Args:
+            schema_key: Key of schema_files.SCHEMA_FILES, e.g. "1.0.0:xomp".
+
+        Returns:
+            The compiled Draft7Validator.
+
+        Raises:
+            ValueError: If no schema is registered for the key.
+        """
+        with self._lock:
+            validator = self._validators.get(schema_key)
+            if validator is not None:
+                self.hits += 1
+                return validator
+
+            self.misses += 1
+            validator = self._compile(schema_key)
+            self._validators[schema_key] = validator
+            return validator
+
+    def get_row_validator(
+        self, schema_key: str, table_path: Tuple[str, ...]
+    ) -> Draft7Validator:
+        """Returns a validator for single rows of the lookup table at table_path.
+
+        Args:
+            schema_key: Key of schema_files.SCHEMA_FILES, e.g. "1.0.0:brdf.xompt".
+            table_path: JSON path of the table array, e.g. ('brdf', 'lookupTable').
+
+        Returns:
+            A Draft7Validator of the "items" schema of the table.
+        """
+        validator = self.get_validator(schema_key)
+
+        with self._lock:
+            row_validator = self._row_validators.get((schema_key, table_path))
+            if row_validator is None:
+                table_schema = validator.schema
+                for key in table_path:
+                    table_schema = table_schema["properties"][key]
+                row_validator = Draft7Validator(table_schema["items"])
+                self._row_validators[(schema_key, table_path)] = row_validator
+            return row_validator
+
+    def warm_up(self, schema_keys: Optional[Iterable[str]] = None) -> None:
+        """Eagerly compiles validators, so that later lookups are hits.
+
+        Args:
+            schema_keys: Keys to compile. All registered schemas if None.
+        """
+        for schema_key in self._schemas if schema_keys is None else schema_keys:
+            with self._lock:
+                if schema_key not in self._validators:
+                    self._validators[schema_key] = self._compile(schema_key)
+
+    def clear(self) -> None:
+        """Drops all compiled validators and resets the counters."""
+        with self._lock:
+            self._validators.clear()
+            self._row_validators.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _compile(self, schema_key: str) -> Draft7Validator:
+        schema_path = self._schemas.get(schema_key)
+        if schema_path is None:
+            raise ValueError(f"No schema available for {schema_key}")
+
+        schema_text = (
+            importlib.resources.files("qc_openmaterial3d.schemas")
+            .joinpath(schema_path)
+            .read_text(encoding="utf-8")
+        )
+        schema = json.loads(schema_text)
+
+        Draft7Validator.check_schema(schema)
+        return Draft7Validator(schema)
+
+
+VALIDATORS = ValidatorRegistry()
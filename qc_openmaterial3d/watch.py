@@ -0,0 +1,255 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+import os
+import time
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from qc_baselib import Configuration
+
+from qc_openmaterial3d import batch, constants, main, result_cache
+from qc_openmaterial3d.checks import reference_graph, utils, uuid_index
+from qc_openmaterial3d.schemas import validator_registry
+
+DEFAULT_POLL_INTERVAL = constants.WATCH_POLL_INTERVAL
+
+# Checker results kept in memory between two edits of the same files
+MEMORY_CACHE_SIZE = 65536
+
+
+def _get_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Watcher:
+    """Re-checks the OpenMATERIAL 3D files of a directory tree when they change.
+
+    The tree is polled for added, modified and removed files. A changed file is
+    checked again together with all watched files that link to it directly or
+    indirectly, and their reports are written again. Checker results that do not
+    depend on the change are replayed from the result cache, so the files linking to
+    a changed file only run the checkers that follow links.
+
+    The other files the checkers depend on, e.g. textures or files outside the tree,
+    are polled as well, and a change re-checks the watched files depending on them.
+    A file that cannot be checked is logged and skipped.
+
+    Args:
+        config: Configuration whose InputFile is replaced by each checked file.
+        watch_dir: Directory to watch.
+        output_dir: Directory receiving one report per file, mirroring watch_dir.
+        cache: Result cache. Checker results are kept in memory if None.
+    """
+
+    def __init__(
+        self,
+        config: Configuration,
+        watch_dir: str,
+        output_dir: str,
+        cache: Optional[result_cache.ResultCache] = None,
+    ) -> None:
+        self.config = config
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.output_dir = output_dir
+        self.cache = cache if cache is not None else result_cache.ResultCache(None)
+        self.cache.memory_size = max(self.cache.memory_size, MEMORY_CACHE_SIZE)
+
+        # Normalized path -> modification time and size at the last poll
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        # Normalized path -> normalized paths of the files it links to or depends on
+        self._references: Dict[str, Set[str]] = {}
+        # Normalized path of a dependency that is not watched -> its stamp when last seen
+        self._dependency_stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def get_report_file_path(self, input_file: str) -> str:
+        return os.path.join(
+            self.output_dir, os.path.relpath(input_file, self.watch_dir) + ".xqar"
+        )
+
+    def poll(self) -> List[str]:
+        """Checks the files that changed since the last poll, all files on the first poll.
+
+        Returns:
+            Sorted paths of the checked files.
+        """
+        stamps = {}
+        for input_file in batch.discover_input_files(self.watch_dir):
+            path = os.path.normpath(os.path.abspath(input_file))
+            stamp = _get_stamp(path)
+            if stamp is not None:
+                stamps[path] = stamp
+
+        changed = {
+            path for path, stamp in stamps.items() if self._stamps.get(path) != stamp
+        }
+        removed = set(self._stamps) - set(stamps)
+        self._stamps = stamps
+        changed_dependencies = self.poll_dependencies()
+        if not changed and not removed and not changed_dependencies:
+            return []
+
+        start_time = time.perf_counter()
+
+        for path in removed:
+            self._references.pop(path, None)
+            report_file = self.get_report_file_path(path)
+            if os.path.exists(report_file):
+                os.remove(report_file)
+
+        # Indexed before any file is checked, so that all files claiming a uuid find each other
+        batch.index_input_files(self.config, sorted(changed))
+
+        affected = sorted(
+            (
+                changed
+                | self.find_dependents(changed | removed | changed_dependencies)
+                | self.find_claimants(changed)
+            )
+            - removed
+        )
+        for path in affected:
+            try:
+                self.check(path)
+            except Exception:
+                logging.exception(f"Cannot check {path}")
+
+        logging.info(
+            f"Checked {len(affected)} file(s) in {(time.perf_counter() - start_time) * 1000:.0f} ms "
+            f"({len(changed)} changed, {len(removed)} removed, "
+            f"{len(changed_dependencies)} dependencies changed)"
+        )
+        return affected
+
+    def poll_dependencies(self) -> Set[str]:
+        """Finds the dependencies outside the watched files that changed since they were last seen.
+
+        Returns:
+            Normalized paths of the changed dependencies.
+        """
+        depended_on = set().union(*self._references.values()) - set(self._stamps)
+        self._dependency_stamps = {
+            path: stamp
+            for path, stamp in self._dependency_stamps.items()
+            if path in depended_on
+        }
+
+        changed = set()
+        for path, stamp in self._dependency_stamps.items():
+            current = _get_stamp(path)
+            if current != stamp:
+                self._dependency_stamps[path] = current
+                changed.add(path)
+        return changed
+
+    def find_claimants(self, paths: Set[str]) -> Set[str]:
+        """Finds the watched files sharing the uuid of any of paths in the uuid index.
+
+        A file whose uuid was changed to one of another file creates a collision, which
+        the other file reports once it is checked again. Collisions that an edit resolves
+        are found by find_dependents, the indexed files sharing a uuid are dependencies.
+
+        Args:
+            paths: Normalized paths of changed files.
+
+        Returns:
+            Normalized paths of the watched files sharing a uuid, without paths itself.
+        """
+        if not uuid_index.INDEX.is_open:
+            return set()
+
+        found = set()
+        for path in paths:
+            entry = uuid_index.INDEX.get_entry(path)
+            if entry is not None:
+                found.update(
+                    other.path
+                    for other in uuid_index.INDEX.find_others(path, entry.uuid)
+                    if other.path in self._stamps
+                )
+        return found - paths
+
+    def find_dependents(self, paths: Set[str]) -> Set[str]:
+        """Finds the watched files that link to any of paths, directly or indirectly.
+
+        Args:
+            paths: Normalized paths of changed files.
+
+        Returns:
+            Normalized paths of the linking files, without paths itself.
+        """
+        dependents: Dict[str, Set[str]] = {}
+        for path, targets in self._references.items():
+            for target in targets:
+                dependents.setdefault(target, set()).add(path)
+
+        found = set()
+        pending = list(paths)
+        while pending:
+            for dependent in dependents.get(pending.pop(), ()):
+                if dependent not in found and dependent not in paths:
+                    found.add(dependent)
+                    pending.append(dependent)
+        return found
+
+    def check(self, path: str) -> None:
+        """Checks a single file, writes its report and records the files it depends on."""
+        # Parsed once for the checkers and the references
+        document = utils.load_json_document(
+            path, utils.get_streaming_threshold(self.config)
+        )
+        checked = batch.check_file(self.config, path, self.cache, document)
+
+        report_file = self.get_report_file_path(path)
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        checked.result.write_to_file(report_file, generate_summary=True)
+
+        dependencies = main.get_dependency_paths(self.config, document)
+        if document.is_valid_json:
+            dependencies.update(
+                reference.target
+                for reference in reference_graph.collect_references(document)
+            )
+        self._references[path] = dependencies
+
+        for dependency in dependencies:
+            if dependency not in self._dependency_stamps:
+                self._dependency_stamps[dependency] = _get_stamp(dependency)
+
+    def run(self, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """Polls the directory tree until interrupted."""
+        logging.info(f"Watching {self.watch_dir}, press Ctrl+C to stop")
+        try:
+            while True:
+                self.poll()
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            logging.info("Stopped watching")
+
+
+def watch(
+    config: Configuration,
+    watch_dir: str,
+    output_dir: str,
+    cache: Optional[result_cache.ResultCache] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> None:
+    """Checks all files of a directory tree, then re-checks them as they change until interrupted.
+
+    Args:
+        config: Configuration whose InputFile is replaced by each checked file.
+        watch_dir: Directory to watch.
+        output_dir: Directory receiving one report per file.
+        cache: Result cache. Checker results are kept in memory if None.
+        poll_interval: Seconds between two scans of the directory tree.
+    """
+    validator_registry.VALIDATORS.warm_up()
+    Watcher(config, watch_dir, output_dir, cache).run(poll_interval)
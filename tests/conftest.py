@@ -0,0 +1,14 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(monkeypatch, tmp_path_factory) -> None:
+    # Runs with the default result cache and uuid index write to a directory of the test,
+    # so that they neither fill the cache of the user nor replay results of earlier runs
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
@@ -0,0 +1,142 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import test_utils
+from qc_baselib import Result
+from qc_openmaterial3d import batch
+
+
+def get_uris_exist_issue_count(report_file_path: str) -> int:
+    result = Result()
+    result.load_from_file(report_file_path)
+    return len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.uris_exist"))
+
+
+def test_discover_input_files() -> None:
+    input_files = batch.discover_input_files("tests/data/uris_exist")
+
+    assert [os.path.basename(input_file) for input_file in input_files] == [
+        "example_mapping.xomm",
+        "uris_exist.negative.xoma",
+        "uris_exist.negative.xomp",
+        "uris_exist.positive.xoma",
+    ]
+
+
+def test_batch_input_dir(monkeypatch, tmp_path) -> None:
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+
+    test_utils.launch_main(
+        monkeypatch, ["--input_dir", "tests/data", "--output_dir", str(tmp_path)]
+    )
+
+    report_files = sorted(
+        os.path.relpath(os.path.join(dir_path, file_name), tmp_path)
+        for dir_path, _, file_names in os.walk(tmp_path)
+        for file_name in file_names
+    )
+    assert len(report_files) == len(batch.discover_input_files("tests/data"))
+    assert os.path.join("uris_exist", "uris_exist.negative.xomp.xqar") in report_files
+
+    assert (
+        get_uris_exist_issue_count(
+            tmp_path / "uris_exist" / "uris_exist.negative.xomp.xqar"
+        )
+        == 5
+    )
+    assert (
+        get_uris_exist_issue_count(
+            tmp_path / "uris_exist" / "uris_exist.positive.xoma.xqar"
+        )
+        == 0
+    )
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_batch_file_list(monkeypatch, tmp_path) -> None:
+    file_list_path = tmp_path / "files.txt"
+    file_list_path.write_text(
+        "# assets\n"
+        f"{os.path.abspath('tests/data/uris_exist/uris_exist.negative.xoma')}\n"
+        "\n"
+        f"{os.path.abspath('tests/data/uris_exist/uris_exist.negative.xomp')}\n"
+    )
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+
+    test_utils.launch_main(
+        monkeypatch,
+        ["--file_list", str(file_list_path), "--output_dir", str(tmp_path / "reports")],
+    )
+
+    assert (
+        get_uris_exist_issue_count(
+            tmp_path / "reports" / "uris_exist.negative.xoma.xqar"
+        )
+        == 1
+    )
+    assert (
+        get_uris_exist_issue_count(
+            tmp_path / "reports" / "uris_exist.negative.xomp.xqar"
+        )
+        == 5
+    )
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_batch_parallel_jobs_match_sequential(tmp_path) -> None:
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+    config = test_utils.load_test_config()
+    input_files = batch.discover_input_files("tests/data")
+
+    sequential = batch.run_batch(config, input_files, str(tmp_path / "sequential"))
+    parallel = batch.run_batch(config, input_files, str(tmp_path / "parallel"), jobs=2)
+
+    assert parallel.file_count == sequential.file_count == len(input_files)
+    assert parallel.issue_count == sequential.issue_count
+    # The validator lookups of the workers are counted as well
+    assert parallel.validator_hits == sequential.validator_hits > 0
+    assert parallel.validator_misses == sequential.validator_misses == 0
+
+    for sequential_report, parallel_report in zip(
+        sequential.report_files, parallel.report_files
+    ):
+        assert os.path.relpath(
+            sequential_report, tmp_path / "sequential"
+        ) == os.path.relpath(parallel_report, tmp_path / "parallel")
+        assert test_utils.get_issue_descriptions(
+            sequential_report
+        ) == test_utils.get_issue_descriptions(parallel_report)
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_batch_pipeline_matches_sequential(tmp_path) -> None:
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+    config = test_utils.load_test_config()
+    input_files = batch.discover_input_files("tests/data")
+
+    sequential = batch.run_batch(config, input_files, str(tmp_path / "sequential"))
+    pipelined = batch.run_batch(
+        config, input_files, str(tmp_path / "pipelined"), pipeline=True
+    )
+
+    assert pipelined.file_count == sequential.file_count == len(input_files)
+    assert pipelined.issue_count == sequential.issue_count
+
+    for sequential_report, pipelined_report in zip(
+        sequential.report_files, pipelined.report_files
+    ):
+        assert os.path.relpath(
+            sequential_report, tmp_path / "sequential"
+        ) == os.path.relpath(pipelined_report, tmp_path / "pipelined")
+        assert test_utils.get_issue_descriptions(
+            sequential_report
+        ) == test_utils.get_issue_descriptions(pipelined_report)
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
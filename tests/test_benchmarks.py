@@ -0,0 +1,39 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from benchmarks import checkers
+
+
+def create_results(stages: dict) -> dict:
+    return {
+        "brdf_1000": {
+            "stages": {
+                name: {"issues": issues, "min": 0.01} for name, issues in stages.items()
+            }
+        }
+    }
+
+
+def test_compare_reports_stages_without_baseline() -> None:
+    baseline = create_results({"valid_schema": 0})
+    results = create_results({"valid_schema": 0, "uuid_unique": 0})
+
+    assert checkers.compare(results, baseline, 1.0) == [
+        "brdf_1000 uuid_unique: no baseline, run with --update_baseline"
+    ]
+    assert checkers.compare(results, {}, 1.0) == [
+        "brdf_1000 valid_schema: no baseline, run with --update_baseline",
+        "brdf_1000 uuid_unique: no baseline, run with --update_baseline",
+    ]
+
+
+def test_compare_reports_changed_issue_counts() -> None:
+    baseline = create_results({"valid_schema": 0})
+    results = create_results({"valid_schema": 2})
+
+    assert checkers.compare(results, baseline, 1.0) == [
+        "brdf_1000 valid_schema: 2 issue(s) instead of 0"
+    ]
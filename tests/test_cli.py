@@ -0,0 +1,34 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import subprocess
+import sys
+
+HEAVY_MODULES = ["jsonschema", "numpy", "qc_baselib", "lxml"]
+
+
+def get_imported(statement: str, modules: list) -> list:
+    script = f"import sys\n{statement}\nprint(' '.join(m for m in {modules!r} if m in sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return process.stdout.split()
+
+
+def test_cli_import_is_light() -> None:
+    assert get_imported("import qc_openmaterial3d.cli", HEAVY_MODULES) == []
+
+
+def test_checker_modules_are_imported_on_first_use() -> None:
+    checker_package = "qc_openmaterial3d.checks.xom_general_checker"
+    modules = [
+        f"{checker_package}.general_valid_json_document",
+        f"{checker_package}.general_brdf_plausibility",
+    ]
+    imported = get_imported(
+        f"from {checker_package} import valid_json_document", modules + ["numpy"]
+    )
+    assert imported == [modules[0]]
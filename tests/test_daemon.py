@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import test_utils
+from qc_openmaterial3d import constants, daemon
+
+NEGATIVE_BRDF_FILE = (
+    "tests/data/brdf_plausibility/brdf_plausibility.negative_brdf.xompt"
+)
+
+
+@pytest.fixture
+def server_address():
+    server = daemon.CheckServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield f"127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_server_checks_configured_file(monkeypatch, server_address) -> None:
+    test_utils.create_test_config(NEGATIVE_BRDF_FILE)
+    test_utils.launch_main(monkeypatch, ["--no_cache"])
+    local_issues = test_utils.get_issue_descriptions(test_utils.REPORT_FILE_PATH)
+    os.remove(test_utils.REPORT_FILE_PATH)
+
+    monkeypatch.setenv(daemon.SERVER_ENVIRONMENT_VARIABLE, server_address)
+    test_utils.launch_main(monkeypatch)
+
+    assert (
+        test_utils.get_issue_descriptions(test_utils.REPORT_FILE_PATH) == local_issues
+    )
+
+    test_utils.cleanup_files()
+
+
+def test_server_checks_content(server_address, tmp_path) -> None:
+    with open(NEGATIVE_BRDF_FILE, "r") as file:
+        content = file.read()
+
+    report = daemon.request_content_check(
+        server_address, "material_brdf.xompt", content
+    )
+
+    report_file_path = tmp_path / "report.xqar"
+    report_file_path.write_text(report)
+    descriptions = [
+        description
+        for _, _, description in test_utils.get_issue_descriptions(report_file_path)
+    ]
+    assert len(descriptions) == 7
+    assert descriptions[0].startswith(
+        "Rows 12 and 48 of brdf.lookupTable violate Helmholtz reciprocity"
+    )
+
+
+def test_unreachable_server_falls_back_to_local_run(monkeypatch) -> None:
+    # Bind and close a socket to get a port nobody listens on
+    server = daemon.CheckServer(("127.0.0.1", 0))
+    server.server_close()
+    monkeypatch.setenv(
+        daemon.SERVER_ENVIRONMENT_VARIABLE, f"127.0.0.1:{server.server_address[1]}"
+    )
+
+    test_utils.create_test_config(NEGATIVE_BRDF_FILE)
+    test_utils.launch_main(monkeypatch, ["--no_cache"])
+
+    assert len(test_utils.get_issue_descriptions(test_utils.REPORT_FILE_PATH)) == 7
+
+    test_utils.cleanup_files()
+
+
+def test_server_refuses_non_loopback_address() -> None:
+    with pytest.raises(ValueError):
+        daemon.CheckServer(("0.0.0.0", 0))
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        ({"Content-Type": "text/plain"}, 415),
+        ({"Content-Type": "application/x-www-form-urlencoded"}, 415),
+        ({"Content-Type": "application/json", "Host": "attacker.example:80"}, 403),
+    ],
+)
+def test_server_rejects_cross_site_requests(server_address, headers, status) -> None:
+    request = urllib.request.Request(
+        f"http://{server_address}/check",
+        data=json.dumps(
+            {"config_path": "bundle_config.xml", "cwd": os.getcwd()}
+        ).encode("utf-8"),
+        headers=headers,
+        method="POST",
+    )
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+
+    assert error.value.code == status
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "Basic token"])
+def test_server_requires_token(server_address, authorization) -> None:
+    headers = {"Content-Type": "application/json"}
+    if authorization is not None:
+        headers["Authorization"] = authorization
+    request = urllib.request.Request(
+        f"http://{server_address}/check",
+        data=json.dumps(
+            {"config_path": "bundle_config.xml", "cwd": os.getcwd()}
+        ).encode("utf-8"),
+        headers=headers,
+        method="POST",
+    )
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+
+    assert error.value.code == 401
+
+
+def test_token_file_is_private_to_the_user() -> None:
+    server = daemon.CheckServer(("127.0.0.1", 0))
+    token_file_path = daemon.get_token_file_path(server.server_address[1])
+    try:
+        assert daemon.read_token_file(server.server_address[1]) == server.token
+        if os.name == "posix":
+            assert os.stat(token_file_path).st_mode & 0o777 == 0o600
+    finally:
+        server.server_close()
+
+    assert not os.path.exists(token_file_path)
+
+
+def test_server_rejects_unwritable_result_file(
+    monkeypatch, server_address, tmp_path
+) -> None:
+    test_utils.create_test_config(os.path.abspath(NEGATIVE_BRDF_FILE))
+    config = test_utils.load_test_config()
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        name="resultFile",
+        value=str(tmp_path / "report.xqar"),
+    )
+    config.write_to_file(test_utils.CONFIG_FILE_PATH)
+
+    # The directory of the report is read-only for the user
+    access = os.access
+    monkeypatch.setattr(
+        os,
+        "access",
+        lambda path, mode: path != str(tmp_path) and access(path, mode),
+    )
+    with pytest.raises(OSError, match="Cannot write"):
+        daemon.request_check(server_address, test_utils.CONFIG_FILE_PATH)
+    assert not os.path.exists(tmp_path / "report.xqar")
+
+    with pytest.raises(OSError, match="is not absolute"):
+        daemon.request_check(server_address, test_utils.CONFIG_FILE_PATH, cwd=".")
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+@pytest.mark.parametrize(
+    "extra_args",
+    [["--no_cache"], ["--cache_dir", "cache"], ["--uuid_index", "index.sqlite"]],
+)
+def test_runs_with_own_cache_or_index_are_not_forwarded(
+    monkeypatch, tmp_path, extra_args
+) -> None:
+    def request_check(*args, **kwargs):
+        raise AssertionError("The run was forwarded")
+
+    monkeypatch.setenv(daemon.SERVER_ENVIRONMENT_VARIABLE, daemon.DEFAULT_ADDRESS)
+    monkeypatch.setattr(daemon, "request_check", request_check)
+    input_file = os.path.abspath(NEGATIVE_BRDF_FILE)
+    monkeypatch.chdir(tmp_path)
+    test_utils.create_test_config(input_file)
+
+    test_utils.launch_main(monkeypatch, extra_args)
+
+    assert len(test_utils.get_issue_descriptions(test_utils.REPORT_FILE_PATH)) == 7
@@ -0,0 +1,102 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import importlib
+import json
+import os
+import tracemalloc
+
+import test_utils
+from qc_baselib import Result, StatusType
+from qc_openmaterial3d.checks import json_parser, utils, xom_general_checker
+
+
+def write_brdf_table(file_path: str, rows: int) -> None:
+    document = {
+        "metadata": {
+            "name": "synthetic",
+            "uuid": "fe7d7070-50e5-45f1-9f26-58ecacb6ac5e",
+            "materialVersion": "1.0.0",
+            "openMaterial3dVersion": "1.0.0",
+            "copyrights": ["(C) 2024 Example Company"],
+            "license": "MPL-2.0",
+            "authors": ["john.doe@asam.net"],
+            "sources": "synthetic",
+        },
+        "brdf": {
+            "wavelengths": [9.05e-07],
+            "lookupTable": [
+                [9.05e-07, 0.01 * (i // 100 % 100), 0.01 * (i % 100), 0.0, 0.1]
+                for i in range(rows)
+            ],
+        },
+    }
+    with open(file_path, "w") as file:
+        json.dump(document, file)
+
+
+def test_input_file_is_parsed_once(monkeypatch, tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(target_file_path, 5000)
+
+    parse_count = 0
+    parser_loads = json_parser.loads
+
+    def counting_loads(raw, *args, **kwargs):
+        nonlocal parse_count
+        # Input files are parsed by json_parser, schema files by the json module
+        parse_count += 1
+        return parser_loads(raw, *args, **kwargs)
+
+    monkeypatch.setattr(json_parser, "loads", counting_loads)
+
+    test_utils.create_test_config(target_file_path)
+
+    # numpy imports numpy.ma on first use of np.unique, which is not document memory
+    importlib.import_module("numpy.ma")
+
+    tracemalloc.start()
+    try:
+        test_utils.launch_main(monkeypatch)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.valid_schema.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema"))
+        == 0
+    )
+
+    assert parse_count == 1
+    # One parsed tree plus validation overhead and lookup table columns, not one tree per checker
+    assert peak_memory < 12 * os.path.getsize(target_file_path)
+
+    test_utils.cleanup_files()
+
+
+def test_load_json_document_reports_parse_error() -> None:
+    document = utils.load_json_document(
+        "tests/data/valid_json_document/json.valid_json_document.negative.xoma"
+    )
+
+    assert document.exists
+    assert document.data is None
+    assert isinstance(document.parse_error, json.JSONDecodeError)
+    assert not document.is_valid_json
+
+
+def test_load_json_document_missing_file() -> None:
+    document = utils.load_json_document("tests/data/does_not_exist.xoma")
+
+    assert not document.exists
+    assert document.parse_error is None
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import bisect
+import concurrent.futures
+import os
+import threading
+import time
+import types
+
+import test_utils
+from qc_baselib import Result
+from qc_openmaterial3d.checks import json_index, models, utils
+from qc_openmaterial3d.checks.json_index import JsonLocationIndex
+
+
+def test_location_of_nested_properties() -> None:
+    raw = b'{\n  "a": {"b": [1, {"c": "x"}]},\n  "d": [[0.1, 0.2],\n        [0.3, null]]\n}'
+    index = JsonLocationIndex(raw)
+
+    assert index.get_location([]) == (1, 1)
+    assert index.get_location(["a"]) == (2, 3)
+    assert index.get_location(["a", "b", 0]) == (2, 15)
+    assert index.get_location(["a", "b", 1, "c"]) == (2, 19)
+    assert index.get_location(["d", 1]) == (4, 9)
+    assert index.get_location(["d", 1, 1]) == (4, 15)
+
+
+def test_location_of_missing_paths() -> None:
+    index = JsonLocationIndex(b'{"a": [1, 2], "b": "[not a container]"}')
+
+    assert index.get_location(["c"]) is None
+    assert index.get_location(["a", 2]) is None
+    assert index.get_location(["a", "0"]) is None
+    assert index.get_location(["b", 0]) is None
+
+
+def test_location_of_repeated_keys_and_escaped_strings() -> None:
+    raw = b'{"k": "first \\"k\\": [", \n "k": {"inner": "]}"},\n "k": {"inner": 1}}'
+    index = JsonLocationIndex(raw)
+
+    # json.loads keeps the last occurrence of a repeated key
+    assert index.get_location(["k"]) == (3, 2)
+    assert index.get_location(["k", "inner"]) == (3, 8)
+
+
+def test_valid_schema_issue_location(monkeypatch) -> None:
+    target_file_path = os.path.join(
+        "tests/data/valid_schema/", "json.valid_schema.negative.xoma"
+    )
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    issues = result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema")
+    assert len(issues) == 1
+
+    file_location = issues[0].locations[0].file_location[0]
+    assert (file_location.row, file_location.column) == (19, 9)
+
+    test_utils.cleanup_files()
+
+
+def test_uris_exist_issue_locations(monkeypatch) -> None:
+    target_file_path = os.path.join(
+        "tests/data/uris_exist/", "uris_exist.negative.xomp"
+    )
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    issues = result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.uris_exist")
+    locations = [
+        (location.file_location[0].row, location.file_location[0].column)
+        for issue in issues
+        for location in issue.locations
+    ]
+    assert locations == [(33, 9), (34, 9), (36, 13), (37, 13), (40, 13)]
+
+    test_utils.cleanup_files()
+
+
+def test_concurrent_lookups(monkeypatch) -> None:
+    rows = ",\n".join(
+        f'  {{"name": "row{index}", "values": [{index}, {index + 1}]}}'
+        for index in range(200)
+    )
+    raw = f'{{"rows": [\n{rows}\n]}}'.encode("utf-8")
+    paths = [["rows", index, key] for index in range(200) for key in ("name", "values")]
+    expected = [JsonLocationIndex(raw).get_location(path) for path in paths]
+
+    # Let other threads run between looking up and inserting a checkpoint of the index
+    def bisect_right(*args):
+        position = bisect.bisect_right(*args)
+        time.sleep(0)
+        return position
+
+    monkeypatch.setattr(
+        json_index, "bisect", types.SimpleNamespace(bisect_right=bisect_right)
+    )
+
+    document = utils.parse_json_document(
+        models.JsonDocument("rows.json", size=len(raw), raw=raw)
+    )
+    thread_count = 4
+    barrier = threading.Barrier(thread_count)
+
+    def find_locations(start: int) -> list:
+        # Each thread starts at another path, so that they fill different parts of the index
+        order = list(range(start, len(paths))) + list(range(start))
+        barrier.wait()
+        return sorted((index, document.find_location(paths[index])) for index in order)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=thread_count) as executor:
+        starts = [thread * len(paths) // thread_count for thread in range(thread_count)]
+        found = list(executor.map(find_locations, starts))
+
+    for locations in found:
+        assert [location for _, location in locations] == expected
+    assert document.location_lookups == thread_count * len(paths)
@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+
+import pytest
+
+from qc_openmaterial3d.checks import json_parser
+
+INSTALLED_BACKENDS = [
+    backend for backend in json_parser.BACKENDS if json_parser.is_available(backend)
+]
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+def test_errors_match_json_module(backend) -> None:
+    for raw in [b'{"a": [1, 2,]}', b'{\n  "a": 1\n  "b": 2\n}', b"", b'{"a": tru}']:
+        with pytest.raises(json.JSONDecodeError) as expected:
+            json.loads(raw)
+        with pytest.raises(json.JSONDecodeError) as actual:
+            json_parser.loads(raw, backend)
+
+        assert type(actual.value) is json.JSONDecodeError
+        assert (actual.value.msg, actual.value.lineno, actual.value.colno) == (
+            expected.value.msg,
+            expected.value.lineno,
+            expected.value.colno,
+        )
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+def test_accepts_documents_of_json_module(backend) -> None:
+    # Byte order mark, non-finite numbers and lone surrogates are not strict JSON
+    raw = b'\xef\xbb\xbf{"a": Infinity, "b": [1.5, null, "\\ud800"], "a": -Infinity}'
+
+    assert json_parser.loads(raw, backend) == json.loads(raw)
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+def test_integers_beyond_64_bits_stay_exact(backend) -> None:
+    raw = b'{"a": [18446744073709551616, -9223372036854775809, 9223372036854775807], "b": 1.5}'
+
+    parsed = json_parser.loads(raw, backend)
+    assert parsed == json.loads(raw)
+    assert all(type(value) is int for value in parsed["a"])
+
+
+def test_unavailable_backend_falls_back(monkeypatch) -> None:
+    monkeypatch.setenv(json_parser.BACKEND_ENVIRONMENT_VARIABLE, "unknown")
+    json_parser.get_backend.cache_clear()
+    try:
+        assert json_parser.get_backend() == INSTALLED_BACKENDS[0]
+    finally:
+        json_parser.get_backend.cache_clear()
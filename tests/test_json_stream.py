@@ -0,0 +1,169 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import io
+import json
+
+import pytest
+
+import test_utils
+from test_json_document import write_brdf_table
+from qc_baselib import Result, StatusType
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import json_stream, utils, xom_general_checker
+
+TABLE_PATH = ("brdf", "lookupTable")
+
+
+def write_invalid_brdf_table(file_path: str) -> None:
+    write_brdf_table(file_path, 50)
+    with open(file_path, "r") as file:
+        document = json.load(file)
+
+    document["brdf"]["lookupTable"][3][1] = "0.5"
+    document["brdf"]["lookupTable"][17] = [9.05e-07, 0.1]
+    document["brdf"]["lookupTable"][42][4] = -1.0
+    document["metadata"]["license"] = 42
+
+    with open(file_path, "w") as file:
+        json.dump(document, file, indent=2)
+
+
+def check_file(monkeypatch, file_path: str, streaming_threshold: int) -> Result:
+    test_utils.create_test_config(file_path)
+    config = test_utils.load_test_config()
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        name="streamingThreshold",
+        value=streaming_threshold,
+    )
+    config.write_to_file(test_utils.CONFIG_FILE_PATH)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    test_utils.cleanup_files()
+    return result
+
+
+def test_parse_streamed_leaves_out_table_rows(tmp_path) -> None:
+    file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(file_path, 1000)
+
+    streamed = json_stream.parse_streamed(file_path, [TABLE_PATH], chunk_size=64)
+
+    with open(file_path, "r") as file:
+        expected = json.load(file)
+    table = expected["brdf"].pop("lookupTable")
+    expected["brdf"]["lookupTable"] = []
+
+    assert streamed.data == expected
+    assert json.loads(streamed.skeleton) == expected
+    assert streamed.tables[TABLE_PATH].row_count == len(table)
+
+    rows = [row for _, row, _ in json_stream.iter_table_rows(file_path, TABLE_PATH, 64)]
+    assert rows == table
+
+
+def test_iter_table_rows_locations(tmp_path) -> None:
+    file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_invalid_brdf_table(file_path)
+
+    with open(file_path, "r") as file:
+        lines = file.read().split("\n")
+
+    for index, row, (line, column) in json_stream.iter_table_rows(
+        file_path, TABLE_PATH, 32
+    ):
+        assert lines[line - 1][column - 1] == "["
+        assert index != 17 or row == [9.05e-07, 0.1]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"brdf": {"lookupTable": [[1, 2],\n [3, 4]\n [5, 6]]}}',
+        '{"brdf": {"lookupTable": [[1, 2], [3, 4],]}}',
+        '{"brdf": {"lookupTable": [[1, 2]]}} {}',
+        '{"brdf": {"wavelengths": [1e-6] "lookupTable": []}}',
+        '{"brdf": {"lookupTable": [[1, 2], [3, 4.5e-]]}}',
+        "",
+    ],
+)
+def test_parse_streamed_syntax_errors_match_json(tmp_path, text) -> None:
+    file_path = tmp_path / "broken_brdf.xompt"
+    file_path.write_text(text)
+
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+    with pytest.raises(json.JSONDecodeError) as streamed:
+        json_stream.parse_streamed(str(file_path), [TABLE_PATH], chunk_size=8)
+
+    assert streamed.value.msg == expected.value.msg
+    assert (streamed.value.lineno, streamed.value.colno) == (
+        expected.value.lineno,
+        expected.value.colno,
+    )
+
+
+def test_load_json_document_streams_large_files(tmp_path) -> None:
+    file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(file_path, 100)
+
+    document = utils.load_json_document(file_path, streaming_threshold=0)
+
+    assert document.exists
+    assert document.is_valid_json
+    assert document.is_streamed
+    assert document.raw is None
+    assert document.data["brdf"]["lookupTable"] == []
+    assert document.streamed_tables[TABLE_PATH].row_count == 100
+
+    assert not utils.load_json_document(file_path).is_streamed
+
+
+def test_streamed_validation_matches_full_validation(monkeypatch, tmp_path) -> None:
+    file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_invalid_brdf_table(file_path)
+
+    full_result = check_file(monkeypatch, file_path, streaming_threshold=1 << 30)
+    streamed_result = check_file(monkeypatch, file_path, streaming_threshold=0)
+
+    rule_uid = "asam.net:xom:1.0.0:general.valid_schema"
+    full_issues = full_result.get_issues_by_rule_uid(rule_uid)
+    streamed_issues = streamed_result.get_issues_by_rule_uid(rule_uid)
+
+    assert (
+        streamed_result.get_checker_status(xom_general_checker.valid_schema.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+    assert len(full_issues) == 4
+    assert [issue.description for issue in streamed_issues] == [
+        issue.description for issue in full_issues
+    ]
+
+    # Properties outside of the tables are located exactly, rows at their opening bracket
+    assert (
+        streamed_issues[-1].locations[0].file_location[0].row
+        == full_issues[-1].locations[0].file_location[0].row
+    )
+    for streamed_issue, full_issue in zip(streamed_issues[:-1], full_issues[:-1]):
+        streamed_row = streamed_issue.locations[0].file_location[0].row
+        full_row = full_issue.locations[0].file_location[0].row
+        assert streamed_row <= full_row < streamed_row + 8
+
+
+def test_syntax_error_does_not_read_the_rest_of_the_file() -> None:
+    rows = ",\n".join(["[1, 2, 3]"] * 10000)
+    file = io.StringIO(f"[[1, 2 3], {rows}]")
+    stream = json_stream._TextStream(file, chunk_size=64)
+
+    with pytest.raises(json.JSONDecodeError) as error:
+        stream.decode_value()
+
+    assert error.value.msg == "Expecting ',' delimiter"
+    assert file.tell() <= 2 * 64
@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from qc_baselib import IssueSeverity, Result
+
+import test_utils
+from test_json_document import write_brdf_table
+from qc_openmaterial3d import constants
+from qc_openmaterial3d.checks import lookup_table, utils
+from qc_openmaterial3d.checks.xom_general_checker import general_valid_schema
+from qc_openmaterial3d.schemas import schema_files, validator_registry
+
+INVALID_CELLS = ["0.5", True, -1.0, 100.0, [1.0], {"a": 1}]
+
+
+@pytest.mark.parametrize("schema_key", sorted(schema_files.LOOKUP_TABLE_PATHS))
+def test_lookup_table_schemas_are_vectorized(schema_key) -> None:
+    table_path = schema_files.LOOKUP_TABLE_PATHS[schema_key]
+    row_validator = validator_registry.VALIDATORS.get_row_validator(
+        schema_key, table_path
+    )
+
+    assert (
+        lookup_table.TableConstraints.from_row_schema(row_validator.schema) is not None
+    )
+
+
+@pytest.mark.parametrize("schema_key", sorted(schema_files.LOOKUP_TABLE_PATHS))
+def test_vectorized_errors_match_jsonschema(schema_key) -> None:
+    table_path = schema_files.LOOKUP_TABLE_PATHS[schema_key]
+    validator = validator_registry.VALIDATORS.get_validator(schema_key)
+    row_validator = validator_registry.VALIDATORS.get_row_validator(
+        schema_key, table_path
+    )
+    column_count = len(row_validator.schema["items"])
+
+    generator = random.Random(schema_key)
+    rows = [
+        [generator.choice([1e-6, 0.5, 1, None]) for _ in range(column_count)]
+        for _ in range(500)
+    ]
+    for index in generator.sample(range(len(rows)), 40):
+        rows[index][generator.randrange(column_count)] = generator.choice(INVALID_CELLS)
+    rows[7] = rows[7][:-1]
+    rows[8] = None
+
+    data = {}
+    parent = data
+    for key in table_path[:-1]:
+        parent = parent.setdefault(key, {})
+    parent[table_path[-1]] = rows
+
+    expected = [
+        (list(error.path), list(error.schema_path), error.message)
+        for error in validator.iter_errors(data)
+        if list(error.path)[: len(table_path)] == list(table_path)
+    ]
+    actual = [
+        (list(error.path), list(error.schema_path), error.message)
+        for _, error in lookup_table.iter_row_errors(rows, row_validator, table_path)
+    ]
+
+    assert len(expected) > 0
+    assert sorted(actual, key=str) == sorted(expected, key=str)
+
+
+def test_split_tables_does_not_modify_document() -> None:
+    data = {
+        "metadata": {"name": "x"},
+        "brdf": {"wavelengths": [1e-6], "lookupTable": [[1]]},
+    }
+    original = json.dumps(data)
+
+    skeleton, tables = lookup_table.split_tables(
+        data, [("brdf", "lookupTable"), ("missing",)]
+    )
+
+    assert json.dumps(data) == original
+    assert skeleton == {
+        "metadata": {"name": "x"},
+        "brdf": {"wavelengths": [1e-6], "lookupTable": []},
+    }
+    assert tables == {("brdf", "lookupTable"): [[1]]}
+
+
+def test_valid_schema_reports_table_rows(monkeypatch, tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(target_file_path, 20)
+    with open(target_file_path, "r") as file:
+        document = json.load(file)
+    document["brdf"]["lookupTable"][5][2] = 2.0
+    document["brdf"]["lookupTable"][11][4] = None
+    with open(target_file_path, "w") as file:
+        json.dump(document, file)
+
+    test_utils.create_test_config(target_file_path)
+    test_utils.launch_main(monkeypatch)
+
+    descriptions = [
+        description
+        for _, _, description in test_utils.get_issue_descriptions(
+            test_utils.REPORT_FILE_PATH
+        )
+    ]
+    assert descriptions == [
+        "Error in brdf.lookupTable[5][2]: 2.0 is greater than the maximum of 1.570796"
+    ]
+
+    test_utils.cleanup_files()
+
+
+def write_invalid_brdf_table(file_path: str) -> None:
+    write_brdf_table(file_path, 20)
+    with open(file_path, "r") as file:
+        document = json.load(file)
+    for row in document["brdf"]["lookupTable"][::2]:
+        row[4] = -1.0
+    document["brdf"]["lookupTable"][3][2] = 2.0
+    with open(file_path, "w") as file:
+        json.dump(document, file)
+
+
+def set_valid_schema_params(**params) -> None:
+    config = test_utils.load_test_config()
+    config.register_checker(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=general_valid_schema.CHECKER_ID,
+        min_level=IssueSeverity.INFORMATION,
+        max_level=IssueSeverity.ERROR,
+    )
+    for name, value in params.items():
+        config.set_checker_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=general_valid_schema.CHECKER_ID,
+            name=name,
+            value=value,
+        )
+    config.write_to_file(test_utils.CONFIG_FILE_PATH)
+
+
+def test_valid_schema_aggregates_errors(monkeypatch, tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_invalid_brdf_table(target_file_path)
+
+    test_utils.create_test_config(target_file_path)
+    test_utils.launch_main(monkeypatch)
+
+    # Every error is its own issue unless aggregation is enabled
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    assert len(result.get_issues_by_rule_uid(general_valid_schema.RULE_UID)) == 11
+
+    set_valid_schema_params(aggregateIssues="true")
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    issues = result.get_issues_by_rule_uid(general_valid_schema.RULE_UID)
+    assert [issue.description for issue in issues] == [
+        "Error in brdf.lookupTable[0][4]: -1.0 is less than the minimum of 0 (and 9 more violations "
+        "of 'minimum' at schema path properties/brdf/properties/lookupTable/items/items/4/minimum)",
+        "Error in brdf.lookupTable[3][2]: 2.0 is greater than the maximum of 1.570796",
+    ]
+    file_locations = [location.file_location for location in issues[0].locations]
+    assert sum(map(len, file_locations)) == general_valid_schema.MAX_SAMPLE_LOCATIONS
+
+    test_utils.cleanup_files()
+
+
+def test_valid_schema_stops_at_max_issues(monkeypatch, tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_invalid_brdf_table(target_file_path)
+
+    test_utils.create_test_config(target_file_path)
+    set_valid_schema_params(maxIssues=4, aggregateIssues="true")
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    issues = result.get_issues_by_rule_uid(general_valid_schema.RULE_UID)
+    assert [issue.level for issue in issues] == [
+        IssueSeverity.ERROR,
+        IssueSeverity.ERROR,
+        IssueSeverity.INFORMATION,
+    ]
+    assert "and 2 more violations" in issues[0].description
+    assert issues[2].description == (
+        "Schema validation stopped after 4 errors, further errors are not reported."
+    )
+
+    test_utils.cleanup_files()
+
+
+def test_grid_checks() -> None:
+    keys = np.array(
+        [[1.0, 0.0], [1.0, 1.0], [1.0, 0.5], [2.0, 0.0], [2.0, 0.0], [1.0, 1.0]]
+    )
+
+    assert lookup_table.find_unsorted_rows(keys).tolist() == [2, 5]
+    assert lookup_table.find_duplicate_rows(keys).tolist() == [4, 5]
+    assert lookup_table.find_missing_grid_points(keys, 10) == (
+        2,
+        6,
+        [(2.0, 0.5), (2.0, 1.0)],
+    )
+    assert lookup_table.find_missing_grid_points(keys, 1) == (2, 6, [(2.0, 0.5)])
+
+
+def test_load_columns_streamed(tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(target_file_path, 300)
+    table_path = ("brdf", "lookupTable")
+
+    parsed = utils.load_json_document(target_file_path)
+    streamed = utils.load_json_document(target_file_path, streaming_threshold=0)
+
+    columns = lookup_table.load_columns(parsed, table_path, 4)
+    assert columns.shape == (300, 4)
+    assert np.array_equal(lookup_table.load_columns(streamed, table_path, 4), columns)
+    assert lookup_table.find_row_locations(streamed, table_path, [0, 299]) == (
+        lookup_table.find_row_locations(parsed, table_path, [0, 299])
+    )
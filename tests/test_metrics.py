@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import pstats
+
+import test_utils
+from qc_openmaterial3d.checks import xom_general_checker
+
+
+def test_metrics_cover_parse_and_checkers(monkeypatch, tmp_path) -> None:
+    metrics_path = str(tmp_path / "metrics.json")
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.negative.xoma")
+
+    test_utils.launch_main(monkeypatch, ["--no_cache", "--metrics", metrics_path])
+
+    with open(metrics_path, "r", encoding="utf-8") as file:
+        stages = {stage["name"]: stage for stage in json.load(file)["stages"]}
+
+    assert list(stages)[0] == "parse"
+    uris_exist = stages[xom_general_checker.uris_exist.CHECKER_ID]
+    assert uris_exist["issues"] == 1
+    assert uris_exist["location_lookups"] >= 1
+    for stage in stages.values():
+        assert stage["wall_time"] > 0
+        assert stage["peak_memory"] >= 0
+
+    test_utils.cleanup_files()
+
+
+def test_profile_is_written(monkeypatch, tmp_path) -> None:
+    profile_path = str(tmp_path / "run.prof")
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.negative.xoma")
+
+    test_utils.launch_main(monkeypatch, ["--no_cache", "--profile", profile_path])
+
+    # Checkers run in the profiled thread
+    functions = {function[2] for function in pstats.Stats(profile_path).stats}
+    assert "check_rule" in functions
+
+    test_utils.cleanup_files()
@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import shutil
+
+import test_utils
+from qc_openmaterial3d import main
+from qc_openmaterial3d.checks import reference_graph, utils, xom_general_checker
+
+DATA_PATH = "tests/data/reference_graph"
+
+
+def copy_data(tmp_path) -> None:
+    for file_name in os.listdir(DATA_PATH):
+        shutil.copy(os.path.join(DATA_PATH, file_name), tmp_path)
+
+
+def test_shared_nodes_are_read_once(tmp_path) -> None:
+    copy_data(tmp_path)
+    graph = reference_graph.ReferenceGraph()
+
+    positive = graph.walk(
+        utils.load_json_document(str(tmp_path / "reference_graph.positive.xoma"))
+    )
+    assert [os.path.basename(node.path) for node in positive.nodes] == [
+        "positive_mapping.xomm",
+        "positive_material.xomp",
+        "positive_material_camera_brdf.xompt",
+    ]
+    assert (graph.hits, graph.misses) == (0, 3)
+
+    negative = graph.walk(
+        utils.load_json_document(str(tmp_path / "reference_graph.negative.xoma"))
+    )
+    assert [os.path.basename(node.path) for node in negative.nodes] == [
+        "negative_mapping.xomm",
+        "positive_material.xomp",
+        "positive_material_camera_brdf.xompt",
+        "invalid_material.xomp",
+        "cyclic_material.xomp",
+    ]
+    # The material and its table are shared with the positive asset
+    assert (graph.hits, graph.misses) == (2, 6)
+    assert [reference.uri for _, reference in negative.dangling] == [
+        "missing_material.xomp"
+    ]
+    assert [
+        [os.path.basename(path) for path in cycle] for cycle in negative.cycles
+    ] == [["negative_mapping.xomm", "cyclic_material.xomp", "negative_mapping.xomm"]]
+
+
+def test_changed_node_is_read_again(tmp_path) -> None:
+    copy_data(tmp_path)
+    graph = reference_graph.ReferenceGraph()
+    entry = utils.load_json_document(str(tmp_path / "reference_graph.positive.xoma"))
+    material_path = str(tmp_path / "positive_material.xomp")
+
+    assert all(node.problem is None for node in graph.walk(entry).nodes)
+
+    with open(material_path, "r") as file:
+        material = json.load(file)
+    material["materialProperties"]["brdfUris"] = ["missing_brdf.xompt"]
+    with open(material_path, "w") as file:
+        json.dump(material, file)
+
+    closure = graph.walk(entry)
+    assert [node.path for node in closure.nodes] == [
+        str(tmp_path / "positive_mapping.xomm"),
+        material_path,
+    ]
+    assert [(path, reference.uri) for path, reference in closure.dangling] == [
+        (material_path, "missing_brdf.xompt")
+    ]
+
+
+def test_files_on_other_drive_are_named_by_path(monkeypatch, tmp_path) -> None:
+    copy_data(tmp_path)
+    test_utils.create_test_config(str(tmp_path / "reference_graph.negative.xoma"))
+    config = test_utils.load_test_config()
+
+    def relpath(path, start):
+        raise ValueError("path is on mount 'D:', start on mount 'C:'")
+
+    monkeypatch.setattr(os.path, "relpath", relpath)
+    result = main.check_input_file(config)
+
+    checker = xom_general_checker.reference_graph
+    issues = result.get_issues_by_rule_uid(checker.RULE_UID)
+    assert len(issues) == 3
+    assert (
+        f"of {tmp_path / 'negative_mapping.xomm'} does not exist"
+        in issues[0].description
+    )
+    assert issues[-1].description == (
+        "The files link to each other in a cycle: "
+        f"{tmp_path / 'negative_mapping.xomm'} -> {tmp_path / 'cyclic_material.xomp'} "
+        f"-> {tmp_path / 'negative_mapping.xomm'}."
+    )
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
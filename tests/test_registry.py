@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import subprocess
+import sys
+import types
+
+import pytest
+
+from qc_openmaterial3d.checks import registry, xom_general_checker
+
+
+def create_checker(name: str, preconditions: set, **attributes) -> types.ModuleType:
+    checker = types.ModuleType(name)
+    checker.CHECKER_ID = name
+    checker.CHECKER_PRECONDITIONS = preconditions
+    checker.__dict__.update(attributes)
+    return checker
+
+
+def test_registry_discovers_all_checkers_in_dependency_order() -> None:
+    checkers = registry.get_registry().checkers
+
+    assert {checker.CHECKER_ID for checker in checkers} == {
+        getattr(xom_general_checker, name).CHECKER_ID
+        for name in xom_general_checker.CHECKER_MODULES
+    }
+    positions = {checker.CHECKER_ID: index for index, checker in enumerate(checkers)}
+    for checker in checkers:
+        for precondition in registry.get_preconditions(checker):
+            assert positions[precondition] < positions[checker.CHECKER_ID]
+
+
+def test_discovered_metadata_matches_checker_modules() -> None:
+    for checker in registry.discover_checkers(xom_general_checker):
+        module = getattr(
+            xom_general_checker,
+            checker.__name__.rsplit(".", 1)[1][
+                len(xom_general_checker.CHECKER_MODULE_PREFIX) :
+            ],
+        )
+        for name in registry.METADATA_NAMES:
+            assert getattr(checker, name, None) == getattr(module, name, None)
+        assert checker.check_rule is module.check_rule
+
+
+def test_registry_does_not_import_checkers_or_modes() -> None:
+    # A fresh interpreter, the other tests already imported everything
+    code = (
+        "import sys\n"
+        "from qc_openmaterial3d import main\n"
+        "main.checker_registry.get_registry()\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    modules = set(
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.split()
+    )
+
+    unexpected = {
+        "jsonschema",
+        "numpy",
+        "qc_openmaterial3d.batch",
+        "qc_openmaterial3d.metrics",
+        "qc_openmaterial3d.result_writer",
+        "qc_openmaterial3d.watch",
+        "qc_openmaterial3d.schemas.validator_registry",
+    } | {
+        f"{xom_general_checker.__name__}.{module_name}"
+        for module_name in xom_general_checker.CHECKER_MODULES.values()
+    }
+    assert not modules & unexpected
+
+
+def test_registry_places_preconditions_first() -> None:
+    checkers = registry.CheckerRegistry(
+        [
+            create_checker("c", {"b"}),
+            create_checker("b", {"a"}),
+            create_checker("a", set(), REQUIRED_DEFINITION_SETTING=False),
+            create_checker("d", {}),
+        ]
+    ).checkers
+
+    assert [checker.CHECKER_ID for checker in checkers] == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize(
+    "checkers,message",
+    [
+        ([create_checker("a", {"missing"})], "unknown preconditions: missing"),
+        (
+            [create_checker("a", {"b"}), create_checker("b", {"a"})],
+            "cycle: a -> b -> a",
+        ),
+        (
+            [
+                create_checker("a", {"b"}, REQUIRED_DEFINITION_SETTING=False),
+                create_checker("b", set()),
+            ],
+            "depends on a checker that needs the version",
+        ),
+    ],
+)
+def test_registry_rejects_invalid_preconditions(checkers: list, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        registry.CheckerRegistry(checkers)
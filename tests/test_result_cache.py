@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+
+import test_utils
+from qc_baselib import Result
+from qc_openmaterial3d import batch, constants, main, result_cache
+
+
+def get_report(report_file_path: str) -> list:
+    result = Result()
+    result.load_from_file(report_file_path)
+    return [
+        (
+            checker.checker_id,
+            checker.status,
+            checker.summary,
+            [
+                (
+                    issue.description,
+                    [location.model_dump() for location in issue.locations],
+                )
+                for issue in checker.issues
+            ],
+        )
+        for checker in result.get_checker_results(constants.BUNDLE_NAME)
+    ]
+
+
+def test_cached_results_are_replayed(monkeypatch, tmp_path) -> None:
+    cache_dir = str(tmp_path / "cache")
+    test_utils.create_test_config(
+        "tests/data/brdf_plausibility/brdf_plausibility.negative_brdf.xompt"
+    )
+
+    test_utils.launch_main(monkeypatch, ["--cache_dir", cache_dir])
+    first_report = get_report(test_utils.REPORT_FILE_PATH)
+
+    cache = result_cache.ResultCache(cache_dir)
+    config = test_utils.load_test_config()
+    main.check_input_file(config, cache).write_to_file(
+        test_utils.REPORT_FILE_PATH, generate_summary=True
+    )
+
+    assert cache.misses == 0
+    assert cache.hits == len(first_report)
+    assert get_report(test_utils.REPORT_FILE_PATH) == first_report
+
+    test_utils.cleanup_files()
+
+
+def test_changed_content_is_checked_again(tmp_path) -> None:
+    target_file_path = str(tmp_path / "uris_exist.positive.xoma")
+    shutil.copy("tests/data/uris_exist/uris_exist.positive.xoma", target_file_path)
+    test_utils.create_test_config(target_file_path)
+    config = test_utils.load_test_config()
+    cache = result_cache.ResultCache(str(tmp_path / "cache"))
+
+    main.check_input_file(config, cache)
+    misses = cache.misses
+
+    with open(target_file_path, "a") as file:
+        file.write("\n")
+    main.check_input_file(config, cache)
+
+    assert (cache.hits, cache.misses) == (0, 2 * misses)
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_uris_exist_key_covers_linked_files(tmp_path) -> None:
+    target_file_path = str(tmp_path / "uris_exist.negative.xoma")
+    shutil.copy("tests/data/uris_exist/uris_exist.negative.xoma", target_file_path)
+    test_utils.create_test_config(target_file_path)
+    config = test_utils.load_test_config()
+    cache = result_cache.ResultCache(str(tmp_path / "cache"))
+
+    result = main.check_input_file(config, cache)
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.uris_exist")) == 1
+    )
+
+    shutil.copy(
+        "tests/data/uris_exist/example_mapping.xomm",
+        tmp_path / "example_mapping_false.xomm",
+    )
+    result = main.check_input_file(config, cache)
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.uris_exist")) == 0
+    )
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_no_cache(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+
+    test_utils.launch_main(monkeypatch, ["--no_cache"])
+
+    assert not os.path.exists(result_cache.get_default_cache_dir())
+
+    test_utils.cleanup_files()
+
+
+def test_cache_is_passed_to_spawned_workers(tmp_path) -> None:
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+    config = test_utils.load_test_config()
+    cache = result_cache.ResultCache(str(tmp_path / "cache"))
+    input_files = ["tests/data/uris_exist/uris_exist.negative.xomp"]
+
+    # Spawned workers receive the initializer arguments pickled, unlike forked ones
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=batch._init_worker,
+        initargs=(config, cache, None),
+    ) as executor:
+        checked = list(executor.map(batch._check_file_in_worker, input_files))
+
+    assert checked[0].result_cache_misses > 0
+    assert os.listdir(tmp_path / "cache")
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
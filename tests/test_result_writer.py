@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import tracemalloc
+
+import pytest
+
+import test_utils
+from test_json_document import write_brdf_table
+from qc_baselib import IssueSeverity, Result, StatusType
+from qc_openmaterial3d import batch, constants, main, result_writer
+from qc_openmaterial3d.checks import utils, xom_general_checker
+
+
+def test_streamed_report_matches_result(tmp_path) -> None:
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+    config = test_utils.load_test_config()
+    config.register_checker(
+        checker_bundle_name="xomBundle",
+        checker_id=xom_general_checker.brdf_plausibility.CHECKER_ID,
+        min_level=IssueSeverity.INFORMATION,
+        max_level=IssueSeverity.ERROR,
+    )
+    config.set_checker_param(
+        checker_bundle_name="xomBundle",
+        checker_id=xom_general_checker.brdf_plausibility.CHECKER_ID,
+        name="energyTolerance",
+        value=0.2,
+    )
+
+    for input_file in batch.discover_input_files("tests/data"):
+        config.set_config_param(name="InputFile", value=input_file)
+        result = main.check_input_file(config)
+        result.write_to_file(str(tmp_path / "collected.xqar"), generate_summary=True)
+
+        issue_count = main.stream_input_file(config, str(tmp_path / "streamed.xqar"))
+
+        assert issue_count == result.get_issue_count()
+        assert (tmp_path / "streamed.xqar").read_bytes() == (
+            tmp_path / "collected.xqar"
+        ).read_bytes()
+
+    # The checker results are only buffered next to the report
+    assert sorted(os.listdir(tmp_path)) == ["collected.xqar", "streamed.xqar"]
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+@pytest.mark.parametrize("jobs, pipeline", [(1, False), (1, True), (2, False)])
+def test_streamed_batch_matches_sequential(tmp_path, jobs, pipeline) -> None:
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+    config = test_utils.load_test_config()
+    input_files = batch.discover_input_files("tests/data")
+
+    sequential = batch.run_batch(config, input_files, str(tmp_path / "sequential"))
+    streamed = batch.run_batch(
+        config,
+        input_files,
+        str(tmp_path / "streamed"),
+        jobs,
+        pipeline=pipeline,
+        stream_results=True,
+    )
+
+    assert streamed.file_count == sequential.file_count == len(input_files)
+    assert streamed.issue_count == sequential.issue_count
+    assert streamed.files_with_issues == sequential.files_with_issues
+
+    for sequential_report, streamed_report in zip(
+        sequential.report_files, streamed.report_files
+    ):
+        with open(sequential_report, "rb") as sequential_file, open(
+            streamed_report, "rb"
+        ) as streamed_file:
+            assert sequential_file.read() == streamed_file.read()
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_single_file_run_streams_report(monkeypatch) -> None:
+    test_utils.create_test_config(
+        "tests/data/valid_schema/json.valid_schema.negative.xomp"
+    )
+    test_utils.launch_main(monkeypatch, ["--stream_results", "--no_cache"])
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    checker_id = xom_general_checker.valid_schema.CHECKER_ID
+    assert result.get_checker_status(checker_id) == StatusType.COMPLETED
+    assert result.get_issue_count() > 0
+    assert result.get_checker_bundle_result("xomBundle").summary.startswith(
+        f"{len(result.get_checker_results('xomBundle'))} checker(s) are executed."
+    )
+    assert os.path.exists("generated_checker_bundle_doc.md")
+
+    os.remove("generated_checker_bundle_doc.md")
+    test_utils.cleanup_files()
+
+
+def get_streamed_peak_memory(tmp_path, rows: int, invalid_rows: int) -> int:
+    """Streams the report of a streamed BRDF table and returns the peak of the memory allocated meanwhile."""
+    file_path = str(tmp_path / f"{rows}_{invalid_rows}_brdf.xompt")
+    write_brdf_table(file_path, rows)
+    with open(file_path, "r") as file:
+        document = json.load(file)
+    for row in document["brdf"]["lookupTable"][:invalid_rows]:
+        row[4] = -1.0
+    with open(file_path, "w") as file:
+        json.dump(document, file)
+
+    test_utils.create_test_config(file_path)
+    config = test_utils.load_test_config()
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, name="streamingThreshold", value=0
+    )
+    document = utils.load_json_document(file_path, 0)
+
+    tracemalloc.start()
+    try:
+        issue_count = main.stream_input_file(
+            config, str(tmp_path / "report.xqar"), document=document, workers=1
+        )
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        os.remove(test_utils.CONFIG_FILE_PATH)
+
+    assert issue_count == invalid_rows
+    return peak
+
+
+def test_streamed_issues_are_bounded_in_memory(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(result_writer, "SPOOL_MEMORY_ISSUES", 50)
+    monkeypatch.setattr(xom_general_checker.valid_schema, "ERRORS_PER_CHUNK", 50)
+    # Compiles the validators, which would count towards the first measurement
+    get_streamed_peak_memory(tmp_path, 10, 10)
+
+    # Memory of the issues of an error-dense table, besides the memory of its rows.
+    # Holding the 2000 issues at once takes several MB.
+    overhead = get_streamed_peak_memory(
+        tmp_path, 2000, 2000
+    ) - get_streamed_peak_memory(tmp_path, 2000, 1)
+
+    assert overhead < 1_000_000
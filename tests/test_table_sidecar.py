@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+import test_utils
+from test_json_document import write_brdf_table
+from qc_baselib import Result
+from qc_openmaterial3d.checks import table_sidecar, utils
+
+
+def write_invalid_brdf_table(file_path: str) -> None:
+    write_brdf_table(file_path, 2000)
+    with open(file_path, "r") as file:
+        document = json.load(file)
+    document["brdf"]["lookupTable"][5][2] = 2.0
+    document["brdf"]["lookupTable"][1500][4] = -1.0
+    with open(file_path, "w") as file:
+        json.dump(document, file, indent=2)
+
+
+def check_issues(monkeypatch) -> list:
+    test_utils.launch_main(monkeypatch, ["--no_cache"])
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    return [
+        (
+            checker.checker_id,
+            checker.status,
+            issue.description,
+            [
+                (file_location.row, file_location.column)
+                for location in issue.locations
+                for file_location in location.file_location
+            ],
+        )
+        for checker in result.get_checker_results("xomBundle")
+        for issue in checker.issues
+    ]
+
+
+def test_sidecar_report_matches_json(monkeypatch, tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_invalid_brdf_table(target_file_path)
+    test_utils.create_test_config(target_file_path)
+    in_memory = check_issues(monkeypatch)
+
+    # Like streamed files, sidecar tables are located at the start of each row
+    config = test_utils.load_test_config()
+    config.set_checker_bundle_param(
+        checker_bundle_name="xomBundle", name="streamingThreshold", value="0"
+    )
+    config.write_to_file(test_utils.CONFIG_FILE_PATH)
+    expected = check_issues(monkeypatch)
+    assert [issue[:3] for issue in expected] == [issue[:3] for issue in in_memory]
+
+    table_sidecar.write_sidecar(target_file_path)
+    document = utils.load_json_document(target_file_path)
+    table = document.table_arrays[("brdf", "lookupTable")]
+    assert isinstance(table, np.memmap)
+    assert table.shape == (2000, 5)
+    assert document.data["brdf"]["lookupTable"] == []
+
+    assert len(expected) == 2
+    assert check_issues(monkeypatch) == expected
+
+    test_utils.cleanup_files()
+
+
+def test_stale_sidecar_is_ignored(tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(target_file_path, 100)
+    table_sidecar.write_sidecar(target_file_path)
+
+    write_invalid_brdf_table(target_file_path)
+    document = utils.load_json_document(target_file_path)
+
+    assert document.table_arrays == {}
+    assert len(document.data["brdf"]["lookupTable"]) == 2000
+
+
+def test_write_sidecar_rejects_non_numeric_rows(tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(target_file_path, 100)
+    with open(target_file_path, "r") as file:
+        document = json.load(file)
+    document["brdf"]["lookupTable"][70][1] = "0.5"
+    with open(target_file_path, "w") as file:
+        json.dump(document, file)
+
+    with pytest.raises(ValueError, match="Row 70"):
+        table_sidecar.write_sidecar(target_file_path)
+
+    assert not os.path.exists(table_sidecar.get_manifest_path(target_file_path))
+    assert not os.path.exists(target_file_path + table_sidecar.ARRAY_SUFFIX)
+
+
+def test_sidecar_runs_table_checks(monkeypatch, tmp_path) -> None:
+    target_file_path = str(tmp_path / "synthetic_brdf.xompt")
+    write_brdf_table(target_file_path, 2000)
+    test_utils.create_test_config(target_file_path)
+    expected = check_issues(monkeypatch)
+
+    table_sidecar.write_sidecar(target_file_path)
+    actual = check_issues(monkeypatch)
+
+    assert [issue[:3] for issue in actual] == [issue[:3] for issue in expected]
+
+    test_utils.cleanup_files()
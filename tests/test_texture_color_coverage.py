@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+import test_utils
+from qc_baselib import Result, StatusType
+from qc_openmaterial3d.checks import texture_colors, xom_general_checker
+
+Image = pytest.importorskip("PIL.Image")
+
+RULE_UID = "asam.net:xom:1.0.0:general.texture_color_coverage"
+
+
+def convert(pixels: np.ndarray, mode: str):
+    image = Image.fromarray(pixels)
+    if mode == "P":
+        # The default web palette would dither the colors
+        return image.convert("P", palette=Image.Palette.ADAPTIVE)
+    return image.convert(mode)
+
+
+def write_texture(file_path: str, mode: str = "RGB") -> None:
+    """Writes a 64x32 texture, red on the left half and blue on the right half with a green square."""
+    pixels = np.zeros((32, 64, 3), dtype=np.uint8)
+    pixels[:, :32] = (255, 0, 0)
+    pixels[:, 32:] = (0, 11, 255)
+    pixels[4:8, 40:44] = (0, 255, 0)
+    convert(pixels, mode).save(file_path)
+
+
+def write_asset(tmp_path, textures: list) -> str:
+    shutil.copytree("tests/data/reference_graph", tmp_path, dirs_exist_ok=True)
+    asset_path = tmp_path / "reference_graph.positive.xoma"
+    asset = json.loads(asset_path.read_text())
+    asset["materialTextureAssignment"] = [
+        [f"Material_{index}", uri] for index, uri in enumerate(textures)
+    ]
+    asset_path.write_text(json.dumps(asset, indent=4))
+    return str(asset_path)
+
+
+def run_checks(monkeypatch, asset_path: str) -> Result:
+    test_utils.create_test_config(asset_path)
+    test_utils.launch_main(monkeypatch, ["--no_cache"])
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    test_utils.cleanup_files()
+    return result
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "P"])
+def test_count_colors(mode) -> None:
+    pixels = np.zeros((32, 64, 3), dtype=np.uint8)
+    pixels[:, 32:] = (0, 11, 255)
+    pixels[0, 0] = (1, 2, 3)
+
+    colors = texture_colors.count_colors(convert(pixels, mode))
+
+    assert colors.as_dict() == {(0, 0, 0): 1023, (1, 2, 3): 1, (0, 11, 255): 1024}
+
+
+def test_count_packed_colors_of_noise(monkeypatch) -> None:
+    pixels = np.random.default_rng(0).integers(0, 1 << 24, size=4096, dtype=np.uint32)
+    expected_colors, expected_counts = np.unique(pixels, return_counts=True)
+
+    for max_sorted_runs in [1 << 22, 0]:
+        monkeypatch.setattr(texture_colors, "MAX_SORTED_RUNS", max_sorted_runs)
+        colors = texture_colors.count_packed_colors(pixels)
+        assert np.array_equal(colors.colors, expected_colors)
+        assert np.array_equal(colors.counts, expected_counts)
+
+
+def test_unmapped_colors_are_reported(monkeypatch, tmp_path) -> None:
+    write_texture(str(tmp_path / "assignment.png"))
+    asset_path = write_asset(tmp_path, ["assignment.png", "missing.png"])
+    texture_colors.TEXTURES.clear()
+
+    result = run_checks(monkeypatch, asset_path)
+
+    checker_id = xom_general_checker.texture_color_coverage.CHECKER_ID
+    assert result.get_checker_status(checker_id) == StatusType.COMPLETED
+    # The mapping assigns rgb:255;0;0 only
+    assert [issue.description for issue in result.get_issues_by_rule_uid(RULE_UID)] == [
+        "The texture assignment.png assigned to Material_0 has 2 color(s) without material in the "
+        "material mapping, covering 1024 of 2048 pixels: rgb:0;11;255 (1008 pixels), rgb:0;255;0 (16 pixels).",
+        "The texture missing.png assigned to Material_1 does not exist.",
+    ]
+
+
+def test_shared_texture_is_decoded_once(monkeypatch, tmp_path) -> None:
+    write_texture(str(tmp_path / "assignment.png"), "P")
+    shutil.copy(tmp_path / "assignment.png", tmp_path / "copy.png")
+    asset_path = write_asset(tmp_path, ["assignment.png", "copy.png"])
+    texture_colors.TEXTURES.clear()
+
+    result = run_checks(monkeypatch, asset_path)
+    assert len(result.get_issues_by_rule_uid(RULE_UID)) == 2
+    assert (texture_colors.TEXTURES.hits, texture_colors.TEXTURES.misses) == (1, 1)
+
+    mapping_path = tmp_path / "positive_mapping.xomm"
+    mapping = json.loads(mapping_path.read_text())
+    mapping["materialMapping"] += [
+        ["rgb:0;11;255", "positive_material.xomp", "blue"],
+        ["rgb:0;255;0", "positive_material.xomp", "green"],
+    ]
+    mapping_path.write_text(json.dumps(mapping))
+
+    result = run_checks(monkeypatch, asset_path)
+    assert result.get_issues_by_rule_uid(RULE_UID) == []
+    assert (texture_colors.TEXTURES.hits, texture_colors.TEXTURES.misses) == (3, 1)
+
+
+def test_asset_without_textures_is_skipped(monkeypatch, tmp_path) -> None:
+    asset_path = write_asset(tmp_path, [])
+
+    result = run_checks(monkeypatch, asset_path)
+
+    checker_id = xom_general_checker.texture_color_coverage.CHECKER_ID
+    assert result.get_checker_status(checker_id) == StatusType.SKIPPED
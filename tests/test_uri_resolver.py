@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+import os
+
+import pytest
+
+import test_utils
+from qc_openmaterial3d import batch
+from qc_openmaterial3d.checks import uri_resolver
+
+
+def test_exists_many_deduplicates_paths(tmp_path) -> None:
+    (tmp_path / "texture.png").write_bytes(b"")
+    resolver = uri_resolver.UriResolver(max_workers=4)
+
+    paths = [
+        str(tmp_path / "texture.png"),
+        str(tmp_path / "missing.png"),
+        str(tmp_path / "texture.png"),
+    ]
+    assert resolver.exists_many(paths) == {paths[0]: True, paths[1]: False}
+    assert (resolver.hits, resolver.misses) == (0, 2)
+
+    assert resolver.exists_many(paths[:2]) == {paths[0]: True, paths[1]: False}
+    assert (resolver.hits, resolver.misses) == (2, 2)
+
+
+def test_parent_of_symbolic_link_is_followed(tmp_path) -> None:
+    (tmp_path / "texture.png").write_bytes(b"")
+    (tmp_path / "library" / "textures").mkdir(parents=True)
+    try:
+        os.symlink(tmp_path / "library" / "textures", tmp_path / "link")
+    except OSError:
+        pytest.skip("Symbolic links cannot be created")
+    resolver = uri_resolver.UriResolver()
+
+    # link/.. is the library directory, which has no texture.png
+    path = str(tmp_path / "link" / ".." / "texture.png")
+    assert resolver.exists(path) is os.path.exists(path) is False
+    assert resolver.exists(str(tmp_path / "texture.png"))
+
+
+def test_directory_change_invalidates_cache(tmp_path) -> None:
+    resolver = uri_resolver.UriResolver()
+    texture_path = str(tmp_path / "texture.png")
+
+    assert not resolver.exists(texture_path)
+
+    (tmp_path / "texture.png").write_bytes(b"")
+    # Make the change visible on file systems with coarse timestamps
+    mtime_ns = os.stat(tmp_path).st_mtime_ns + 1_000_000_000
+    os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+
+    assert resolver.exists(texture_path)
+    assert (resolver.hits, resolver.misses) == (0, 2)
+    assert resolver.exists(texture_path)
+    assert (resolver.hits, resolver.misses) == (1, 2)
+
+
+def test_batch_summary_reports_uri_cache(tmp_path) -> None:
+    uri_resolver.RESOLVER.clear()
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+    config = test_utils.load_test_config()
+    input_files = batch.discover_input_files("tests/data/uris_exist") * 2
+
+    summary = batch.run_batch(config, input_files, str(tmp_path))
+
+    assert summary.uri_cache_misses > 0
+    # The second pass over the same files is answered from the cache
+    assert summary.uri_cache_hits >= summary.uri_cache_misses
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_single_file_run_reports_uri_cache(monkeypatch, caplog) -> None:
+    test_utils.create_test_config("tests/data/uris_exist/uris_exist.positive.xoma")
+    with caplog.at_level(logging.INFO):
+        test_utils.launch_main(monkeypatch, ["--no_cache"])
+
+    assert any(
+        message.startswith("URI existence cache: ") for message in caplog.messages
+    )
+
+    test_utils.cleanup_files()
@@ -8,7 +8,7 @@ import os
 import sys
 import qc_openmaterial3d.main as main
 from qc_openmaterial3d import constants
-from qc_baselib import Configuration
+from qc_baselib import Configuration, Result
 
 
 CONFIG_FILE_PATH = "bundle_config.xml"
@@ -28,11 +28,11 @@ def create_test_config(target_file_path: str):
     test_config.write_to_file(CONFIG_FILE_PATH)
 
 
-def launch_main(monkeypatch):
+def launch_main(monkeypatch, extra_args=()):
     monkeypatch.setattr(
         sys,
         "argv",
-        ["main.py", "-c", CONFIG_FILE_PATH, "--generate_markdown"],
+        ["main.py", "-c", CONFIG_FILE_PATH, "--generate_markdown", *extra_args],
     )
     main.main()
 
@@ -40,3 +40,19 @@ def launch_main(monkeypatch):
 def cleanup_files():
     os.remove(REPORT_FILE_PATH)
     os.remove(CONFIG_FILE_PATH)
+
+
+def load_test_config() -> Configuration:
+    config = Configuration()
+    config.load_from_file(CONFIG_FILE_PATH)
+    return config
+
+
+def get_issue_descriptions(report_file_path: str) -> list:
+    result = Result()
+    result.load_from_file(report_file_path)
+    return [
+        (checker.checker_id, checker.status, issue.description)
+        for checker in result.get_checker_results(constants.BUNDLE_NAME)
+        for issue in checker.issues
+    ]
@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+
+from typing import Optional
+
+import test_utils
+from qc_baselib import Result, StatusType
+from qc_openmaterial3d import watch
+from qc_openmaterial3d.checks import utils, uuid_index, xom_general_checker
+
+RULE_UID = "asam.net:xom:1.0.0:general.uuid_unique"
+
+
+def write_material(
+    file_path, version: str, name: str = "aluminum", uuid: Optional[str] = None
+) -> None:
+    with open("tests/data/reference_graph/positive_material.xomp", "r") as file:
+        material = json.load(file)
+    del material["materialProperties"]["brdfUris"]
+    material["metadata"].update(materialVersion=version, name=name)
+    if uuid is not None:
+        material["metadata"]["uuid"] = uuid
+    with open(file_path, "w") as file:
+        json.dump(material, file, indent=4)
+
+
+def get_uuid_issues(report_file_path) -> list:
+    result = Result()
+    result.load_from_file(report_file_path)
+    return [issue.description for issue in result.get_issues_by_rule_uid(RULE_UID)]
+
+
+def run_batch(
+    monkeypatch, library_dir, output_dir, index_path, input_args=None
+) -> None:
+    test_utils.create_test_config(str(library_dir / "a.xomp"))
+    test_utils.launch_main(
+        monkeypatch,
+        (input_args or ["--input_dir", str(library_dir)])
+        + [
+            "--output_dir",
+            str(output_dir),
+            "--uuid_index",
+            str(index_path),
+            "--no_cache",
+        ],
+    )
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_collisions_are_found_across_runs(monkeypatch, tmp_path) -> None:
+    library_dir = tmp_path / "library"
+    library_dir.mkdir()
+    write_material(library_dir / "a.xomp", "1.0.0")
+    write_material(library_dir / "b.xomp", "2.0.0")
+    write_material(library_dir / "c.xomp", "1.0.0")
+    write_material(library_dir / "d.xomp", "3.0.0", "copper")
+    index_path = tmp_path / "index.sqlite"
+    uuid = "fe7d7070-50e5-45f1-9f26-58ecacb6ac5e"
+
+    run_batch(monkeypatch, library_dir, tmp_path / "first", index_path)
+
+    # All files are indexed before the first is checked, so each file finds all others
+    copper_issue = f"The uuid {uuid} is also used by d.xomp for a different file named 'copper' (version 3.0.0)."
+    assert get_uuid_issues(tmp_path / "first" / "a.xomp.xqar") == [
+        f"The uuid {uuid} with version 1.0.0 is also claimed by c.xomp.",
+        copper_issue,
+    ]
+    assert get_uuid_issues(tmp_path / "first" / "b.xomp.xqar") == [copper_issue]
+    assert get_uuid_issues(tmp_path / "first" / "c.xomp.xqar") == [
+        f"The uuid {uuid} with version 1.0.0 is also claimed by a.xomp.",
+        copper_issue,
+    ]
+    assert get_uuid_issues(tmp_path / "first" / "d.xomp.xqar") == [
+        f"The uuid {uuid} is also used by {name}.xomp for a different file named 'aluminum' (version {version})."
+        for name, version in [("a", "1.0.0"), ("b", "2.0.0"), ("c", "1.0.0")]
+    ]
+
+    # Removed files are dropped from the index, the remaining files find each other
+    os.remove(library_dir / "b.xomp")
+    os.remove(library_dir / "d.xomp")
+    run_batch(monkeypatch, library_dir, tmp_path / "second", index_path)
+
+    assert get_uuid_issues(tmp_path / "second" / "a.xomp.xqar") == [
+        f"The uuid {uuid} with version 1.0.0 is also claimed by c.xomp."
+    ]
+    assert len(get_uuid_issues(tmp_path / "second" / "c.xomp.xqar")) == 1
+    assert not uuid_index.INDEX.is_open
+
+
+def test_collisions_do_not_depend_on_file_order(monkeypatch, tmp_path) -> None:
+    library_dir = tmp_path / "library"
+    library_dir.mkdir()
+    for file_name in ["a.xomp", "b.xomp", "c.xomp"]:
+        write_material(library_dir / file_name, "1.0.0")
+    file_list_path = tmp_path / "files.txt"
+    file_list_path.write_text("library/c.xomp\nlibrary/b.xomp\nlibrary/a.xomp\n")
+
+    run_batch(monkeypatch, library_dir, tmp_path / "forward", tmp_path / "1.sqlite")
+    run_batch(
+        monkeypatch,
+        library_dir,
+        tmp_path / "reversed",
+        tmp_path / "2.sqlite",
+        ["--file_list", str(file_list_path), "--jobs", "2"],
+    )
+
+    for file_name in ["a.xomp", "b.xomp", "c.xomp"]:
+        issues = get_uuid_issues(tmp_path / "forward" / f"{file_name}.xqar")
+        assert len(issues) == 2
+        assert get_uuid_issues(tmp_path / "reversed" / f"{file_name}.xqar") == issues
+
+
+def test_watch_rechecks_files_sharing_a_new_uuid(tmp_path) -> None:
+    library_dir = tmp_path / "library"
+    library_dir.mkdir()
+    write_material(library_dir / "a.xomp", "1.0.0")
+    write_material(
+        library_dir / "b.xomp", "1.0.0", uuid="0b5d2bf4-3e2a-4a4e-9a59-6a2f0d0f1c11"
+    )
+    test_utils.create_test_config(str(library_dir / "a.xomp"))
+    uuid_index.INDEX.open(str(tmp_path / "index.sqlite"))
+    try:
+        watcher = watch.Watcher(
+            test_utils.load_test_config(), str(library_dir), str(tmp_path / "reports")
+        )
+        watcher.poll()
+        assert get_uuid_issues(tmp_path / "reports" / "a.xomp.xqar") == []
+
+        write_material(library_dir / "b.xomp", "1.0.0")
+        assert [os.path.basename(path) for path in watcher.poll()] == [
+            "a.xomp",
+            "b.xomp",
+        ]
+        assert len(get_uuid_issues(tmp_path / "reports" / "a.xomp.xqar")) == 1
+    finally:
+        uuid_index.INDEX.close()
+        os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_modified_entries_are_dropped(tmp_path) -> None:
+    index = uuid_index.UuidIndex()
+    index.open(str(tmp_path / "index.sqlite"))
+    try:
+        for file_name in ["a.xomp", "b.xomp"]:
+            write_material(tmp_path / file_name, "1.0.0")
+            index.add(utils.load_json_document(str(tmp_path / file_name)))
+
+        uuid = "fe7d7070-50e5-45f1-9f26-58ecacb6ac5e"
+        assert [
+            entry.path for entry in index.find_others(str(tmp_path / "a.xomp"), uuid)
+        ] == [str(tmp_path / "b.xomp")]
+
+        write_material(tmp_path / "b.xomp", "1.0.0", "a longer name")
+        assert index.find_others(str(tmp_path / "a.xomp"), uuid) == []
+    finally:
+        index.close()
+
+
+def test_single_file_run_without_index_is_skipped(monkeypatch) -> None:
+    test_utils.create_test_config("tests/data/reference_graph/positive_material.xomp")
+    test_utils.launch_main(monkeypatch, ["--no_cache"])
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    assert (
+        result.get_checker_status(xom_general_checker.uuid_unique.CHECKER_ID)
+        == StatusType.SKIPPED
+    )
+
+    test_utils.cleanup_files()
@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from qc_openmaterial3d.schemas import schema_files
+from qc_openmaterial3d.schemas.validator_registry import ValidatorRegistry
+
+
+def test_validator_is_compiled_once() -> None:
+    registry = ValidatorRegistry()
+
+    validator = registry.get_validator("1.0.0:xomp")
+    assert registry.get_validator("1.0.0:xomp") is validator
+    assert registry.get_validator("1.0.0:xomp") is validator
+
+    assert (registry.hits, registry.misses) == (2, 1)
+
+
+def test_warm_up_compiles_all_schemas() -> None:
+    registry = ValidatorRegistry()
+    registry.warm_up()
+
+    for schema_key in schema_files.SCHEMA_FILES:
+        registry.get_validator(schema_key)
+
+    assert registry.misses == 0
+    assert registry.hits == len(schema_files.SCHEMA_FILES)
+
+
+def test_unknown_schema_key() -> None:
+    registry = ValidatorRegistry()
+
+    with pytest.raises(ValueError):
+        registry.get_validator("0.1.0:xomp")
+
+
+def test_schema_keys() -> None:
+    assert schema_files.get_schema_key("1.0.0", "dir/a.xoma") == "1.0.0:xoma"
+    assert (
+        schema_files.get_schema_key("1.0.0", "dir/a_camera_brdf.xompt")
+        == "1.0.0:brdf.xompt"
+    )
+
+    with pytest.raises(ValueError):
+        schema_files.get_schema_key("1.0.0", "dir/a.json")
@@ -0,0 +1,161 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import logging
+import os
+import shutil
+
+import test_utils
+from qc_baselib import Result
+from qc_openmaterial3d import batch, watch
+from qc_openmaterial3d.checks import utils
+
+
+def get_reference_graph_issue_count(report_file_path: str) -> int:
+    result = Result()
+    result.load_from_file(report_file_path)
+    return len(
+        result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.reference_graph")
+    )
+
+
+def test_watch_rechecks_changed_and_linking_files(tmp_path) -> None:
+    watch_dir = tmp_path / "library"
+    output_dir = tmp_path / "reports"
+    shutil.copytree("tests/data/reference_graph", watch_dir)
+    test_utils.create_test_config(str(watch_dir / "reference_graph.positive.xoma"))
+
+    watcher = watch.Watcher(
+        test_utils.load_test_config(), str(watch_dir), str(output_dir)
+    )
+
+    assert len(watcher.poll()) == len(os.listdir(watch_dir))
+    assert (
+        get_reference_graph_issue_count(
+            output_dir / "reference_graph.positive.xoma.xqar"
+        )
+        == 0
+    )
+    assert watcher.poll() == []
+
+    material_path = watch_dir / "positive_material.xomp"
+    material = json.loads(material_path.read_text())
+    material["materialProperties"]["brdfUris"] = ["missing_brdf.xompt"]
+    material_path.write_text(json.dumps(material))
+
+    hits = watcher.cache.hits
+    assert [os.path.basename(path) for path in watcher.poll()] == [
+        "cyclic_material.xomp",
+        "negative_mapping.xomm",
+        "positive_mapping.xomm",
+        "positive_material.xomp",
+        "reference_graph.negative.xoma",
+        "reference_graph.positive.xoma",
+    ]
+    # Of the seven checkers executed on each of the five files linking to the material, only reference_graph runs again
+    assert watcher.cache.hits - hits == 5 * 6
+    assert (
+        get_reference_graph_issue_count(
+            output_dir / "reference_graph.positive.xoma.xqar"
+        )
+        == 1
+    )
+
+    os.remove(watch_dir / "cyclic_material.xomp")
+    assert [os.path.basename(path) for path in watcher.poll()] == [
+        "negative_mapping.xomm",
+        "reference_graph.negative.xoma",
+    ]
+    assert not os.path.exists(output_dir / "cyclic_material.xomp.xqar")
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_watch_parses_each_checked_file_once(monkeypatch, tmp_path) -> None:
+    watch_dir = tmp_path / "library"
+    shutil.copytree("tests/data/reference_graph", watch_dir)
+    test_utils.create_test_config(str(watch_dir / "reference_graph.positive.xoma"))
+    watcher = watch.Watcher(
+        test_utils.load_test_config(), str(watch_dir), str(tmp_path / "reports")
+    )
+    watcher.poll()
+
+    parsed = []
+    parse_json_document = utils.parse_json_document
+    monkeypatch.setattr(
+        utils,
+        "parse_json_document",
+        lambda document: parsed.append(document.file_path)
+        or parse_json_document(document),
+    )
+    asset_path = watch_dir / "reference_graph.positive.xoma"
+    asset_path.write_text(asset_path.read_text() + "\n")
+
+    assert watcher.poll() == [str(asset_path)]
+    assert parsed.count(str(asset_path)) == 1
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_watch_rechecks_files_of_changed_dependencies(tmp_path) -> None:
+    watch_dir = tmp_path / "library"
+    shutil.copytree("tests/data/reference_graph", watch_dir)
+    asset_path = watch_dir / "reference_graph.positive.xoma"
+    asset = json.loads(asset_path.read_text())
+    asset["materialTextureAssignment"] = [["Material_0", "textures/assignment.png"]]
+    asset_path.write_text(json.dumps(asset, indent=4))
+    test_utils.create_test_config(str(asset_path))
+    watcher = watch.Watcher(
+        test_utils.load_test_config(), str(watch_dir), str(tmp_path / "reports")
+    )
+    watcher.poll()
+
+    # Textures are not watched files, the asset depends on them through texture_color_coverage
+    texture_path = watch_dir / "textures" / "assignment.png"
+    texture_path.parent.mkdir()
+    texture_path.write_bytes(b"not a png")
+    assert watcher.poll() == [str(asset_path)]
+    assert watcher.poll() == []
+
+    texture_path.write_bytes(b"still not a png")
+    assert watcher.poll() == [str(asset_path)]
+
+    os.remove(texture_path)
+    assert watcher.poll() == [str(asset_path)]
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
+
+
+def test_watch_continues_after_failing_file(monkeypatch, caplog, tmp_path) -> None:
+    watch_dir = tmp_path / "library"
+    output_dir = tmp_path / "reports"
+    shutil.copytree("tests/data/reference_graph", watch_dir)
+    test_utils.create_test_config(str(watch_dir / "reference_graph.positive.xoma"))
+    watcher = watch.Watcher(
+        test_utils.load_test_config(), str(watch_dir), str(output_dir)
+    )
+
+    failing_path = str(watch_dir / "cyclic_material.xomp")
+    check_file = batch.check_file
+
+    def check_file_failing(config, input_file, *args):
+        if input_file == failing_path:
+            raise OSError(f"Cannot read {input_file}")
+        return check_file(config, input_file, *args)
+
+    monkeypatch.setattr(batch, "check_file", check_file_failing)
+    with caplog.at_level(logging.ERROR):
+        assert len(watcher.poll()) == len(os.listdir(watch_dir))
+
+    assert caplog.messages == [f"Cannot check {failing_path}"]
+    assert sorted(os.listdir(output_dir)) == sorted(
+        f"{file_name}.xqar"
+        for file_name in os.listdir(watch_dir)
+        if file_name != "cyclic_material.xomp"
+    )
+
+    os.remove(test_utils.CONFIG_FILE_PATH)
@@ -10,7 +10,9 @@ from qc_baselib import Result, IssueSeverity, StatusType
 from qc_openmaterial3d.checks import xom_general_checker
 
 
-def test_valid_json_document_positive(monkeypatch,) -> None:
+def test_valid_json_document_positive(
+    monkeypatch,
+) -> None:
     base_path = "tests/data/valid_json_document/"
     target_file_name = "json.valid_json_document.positive.xoma"
     target_file_path = os.path.join(base_path, target_file_name)
@@ -23,18 +25,24 @@ def test_valid_json_document_positive(monkeypatch,) -> None:
     result.load_from_file(test_utils.REPORT_FILE_PATH)
 
     assert (
-            result.get_checker_status(xom_general_checker.valid_json_document.CHECKER_ID)
-            == StatusType.COMPLETED
+        result.get_checker_status(xom_general_checker.valid_json_document.CHECKER_ID)
+        == StatusType.COMPLETED
     )
     assert (
-            len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_json_document"))
-            == 0
+        len(
+            result.get_issues_by_rule_uid(
+                "asam.net:xom:1.0.0:general.valid_json_document"
+            )
+        )
+        == 0
     )
 
     test_utils.cleanup_files()
 
 
-def test_valid_json_document_negative(monkeypatch,) -> None:
+def test_valid_json_document_negative(
+    monkeypatch,
+) -> None:
     base_path = "tests/data/valid_json_document/"
     target_file_name = "json.valid_json_document.negative.xoma"
     target_file_path = os.path.join(base_path, target_file_name)
@@ -47,8 +55,8 @@ def test_valid_json_document_negative(monkeypatch,) -> None:
     result.load_from_file(test_utils.REPORT_FILE_PATH)
 
     assert (
-            result.get_checker_status(xom_general_checker.valid_json_document.CHECKER_ID)
-            == StatusType.COMPLETED
+        result.get_checker_status(xom_general_checker.valid_json_document.CHECKER_ID)
+        == StatusType.COMPLETED
     )
 
     json_doc_issues = result.get_issues_by_rule_uid(
@@ -59,7 +67,9 @@ def test_valid_json_document_negative(monkeypatch,) -> None:
     test_utils.cleanup_files()
 
 
-def test_version_is_defined_positive(monkeypatch,) -> None:
+def test_version_is_defined_positive(
+    monkeypatch,
+) -> None:
     base_path = "tests/data/version_is_defined/"
     target_file_name = "version_is_defined.positive.xoma"
     target_file_path = os.path.join(base_path, target_file_name)
@@ -72,19 +82,25 @@ def test_version_is_defined_positive(monkeypatch,) -> None:
     result.load_from_file(test_utils.REPORT_FILE_PATH)
 
     assert (
-            result.get_checker_status(xom_general_checker.version_is_defined.CHECKER_ID)
-            == StatusType.COMPLETED
+        result.get_checker_status(xom_general_checker.version_is_defined.CHECKER_ID)
+        == StatusType.COMPLETED
     )
 
     assert (
-            len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.version_is_defined"))
-            == 0
+        len(
+            result.get_issues_by_rule_uid(
+                "asam.net:xom:1.0.0:general.version_is_defined"
+            )
+        )
+        == 0
     )
 
     test_utils.cleanup_files()
 
 
-def test_version_is_defined_missing_attr(monkeypatch,) -> None:
+def test_version_is_defined_missing_attr(
+    monkeypatch,
+) -> None:
     base_path = "tests/data/version_is_defined/"
     target_file_name = "version_is_defined.negative.xoma"
     target_file_path = os.path.join(base_path, target_file_name)
@@ -97,8 +113,8 @@ def test_version_is_defined_missing_attr(monkeypatch,) -> None:
     result.load_from_file(test_utils.REPORT_FILE_PATH)
 
     assert (
-            result.get_checker_status(xom_general_checker.version_is_defined.CHECKER_ID)
-            == StatusType.COMPLETED
+        result.get_checker_status(xom_general_checker.version_is_defined.CHECKER_ID)
+        == StatusType.COMPLETED
     )
 
     json_doc_issues = result.get_issues_by_rule_uid(
@@ -108,6 +124,7 @@ def test_version_is_defined_missing_attr(monkeypatch,) -> None:
     assert json_doc_issues[0].level == IssueSeverity.ERROR
     test_utils.cleanup_files()
 
+
 def test_valid_schema_positive(
     monkeypatch,
 ) -> None:
@@ -128,7 +145,8 @@ def test_valid_schema_positive(
     )
 
     assert (
-        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema")) == 0
+        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema"))
+        == 0
     )
 
     test_utils.cleanup_files()
@@ -154,7 +172,8 @@ def test_valid_schema_negative(
     )
 
     assert (
-        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema")) == 1
+        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema"))
+        == 1
     )
     test_utils.cleanup_files()
 
@@ -179,7 +198,8 @@ def test_valid_schema_xomp_negative(
     )
 
     assert (
-        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema")) == 1
+        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.valid_schema"))
+        == 1
     )
     test_utils.cleanup_files()
 
@@ -256,4 +276,245 @@ def test_uris_exist_xomp_negative(
     assert (
         len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.uris_exist")) == 5
     )
-    test_utils.cleanup_files()
\ No newline at end of file
+    test_utils.cleanup_files()
+
+
+def test_lookup_table_grid_positive(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/lookup_table_grid/"
+    target_file_name = "lookup_table_grid.positive_brdf.xompt"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.lookup_table_grid.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                "asam.net:xom:1.0.0:general.lookup_table_grid"
+            )
+        )
+        == 0
+    )
+    test_utils.cleanup_files()
+
+
+def test_lookup_table_grid_negative(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/lookup_table_grid/"
+    target_file_name = "lookup_table_grid.negative_brdf.xompt"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.lookup_table_grid.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+
+    issues = result.get_issues_by_rule_uid(
+        "asam.net:xom:1.0.0:general.lookup_table_grid"
+    )
+    assert [issue.description for issue in issues] == [
+        "Row 3 of brdf.lookupTable is not sorted based on the columns starting with the first, "
+        "it must not precede row 2 (1 unsorted row(s) in total).",
+        "brdf.lookupTable is not a full grid, the grid point (1.55e-06, 0.0, 0.5, 0.0) is missing "
+        "(1 of 16 grid points missing in total).",
+        "Wavelength 2e-06 listed in brdf.wavelengths does not occur in brdf.lookupTable.",
+    ]
+    assert [issue.locations[0].file_location[0].row for issue in issues] == [27, 23, 21]
+    test_utils.cleanup_files()
+
+
+def test_lookup_table_grid_skipped_without_table(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/valid_schema/"
+    target_file_name = "json.valid_schema.positive.xoma"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.lookup_table_grid.CHECKER_ID)
+        == StatusType.SKIPPED
+    )
+    test_utils.cleanup_files()
+
+
+def test_brdf_plausibility_positive(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/brdf_plausibility/"
+    target_file_name = "brdf_plausibility.positive_brdf.xompt"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.brdf_plausibility.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                "asam.net:xom:1.0.0:general.brdf_plausibility"
+            )
+        )
+        == 0
+    )
+    test_utils.cleanup_files()
+
+
+def test_brdf_plausibility_negative(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/brdf_plausibility/"
+    target_file_name = "brdf_plausibility.negative_brdf.xompt"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.brdf_plausibility.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+
+    issues = result.get_issues_by_rule_uid(
+        "asam.net:xom:1.0.0:general.brdf_plausibility"
+    )
+    assert len(issues) == 7
+    assert issues[0].description.startswith(
+        "Rows 12 and 48 of brdf.lookupTable violate Helmholtz reciprocity"
+    )
+    assert issues[-1].description.startswith(
+        "The BRDF of brdf.lookupTable reflects 1.175 times the incident energy"
+    )
+    test_utils.cleanup_files()
+
+
+def test_brdf_plausibility_tolerance_param(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/brdf_plausibility/"
+    target_file_name = "brdf_plausibility.negative_brdf.xompt"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+    config = test_utils.load_test_config()
+    config.register_checker(
+        checker_bundle_name="xomBundle",
+        checker_id=xom_general_checker.brdf_plausibility.CHECKER_ID,
+        min_level=IssueSeverity.INFORMATION,
+        max_level=IssueSeverity.ERROR,
+    )
+    config.set_checker_param(
+        checker_bundle_name="xomBundle",
+        checker_id=xom_general_checker.brdf_plausibility.CHECKER_ID,
+        name="energyTolerance",
+        value=0.2,
+    )
+    config.write_to_file(test_utils.CONFIG_FILE_PATH)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                "asam.net:xom:1.0.0:general.brdf_plausibility"
+            )
+        )
+        == 6
+    )
+    test_utils.cleanup_files()
+
+
+def test_reference_graph_positive(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/reference_graph/"
+    target_file_name = "reference_graph.positive.xoma"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.reference_graph.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.reference_graph"))
+        == 0
+    )
+    test_utils.cleanup_files()
+
+
+def test_reference_graph_negative(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/reference_graph/"
+    target_file_name = "reference_graph.negative.xoma"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(xom_general_checker.reference_graph.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+
+    issues = result.get_issues_by_rule_uid("asam.net:xom:1.0.0:general.reference_graph")
+    assert [issue.description for issue in issues] == [
+        "The URI missing_material.xomp set in materialMapping at line 25 of negative_mapping.xomm does not exist.",
+        "The file invalid_material.xomp linked in materialMapping at line 30 of negative_mapping.xomm "
+        "violates its schema with 1 error(s), the first is in materialProperties.surfaceRoughness.surfaceHeightRms: "
+        "'0.8' is not of type 'number'.",
+        "The files link to each other in a cycle: negative_mapping.xomm -> cyclic_material.xomp -> negative_mapping.xomm.",
+    ]
+    test_utils.cleanup_files()